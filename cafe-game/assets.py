@@ -0,0 +1,175 @@
+from collections import OrderedDict
+
+import arcade
+import PIL.Image
+from arcade.texture import ImageData
+
+from atlas import atlas_manifest
+from pack import asset_files
+
+# Всё, что нужно игре с первого кадра; грузится один раз в FastFoodGame.setup.
+TEXTURE_MANIFEST = [
+    "images/main_menu_bg.png",
+    "images/level_bg.png",
+    "images/chef.png",
+    "images/player_idle.png",
+    "images/customer_idle.png",
+    "images/customer_happy.png",
+    "images/customer_angry.png",
+    "images/grill.png",
+    "images/fryer.png",
+    "images/ice_cream_machine.png",
+    "images/soda_tap.png",
+    "images/burger_base.png",
+    "images/burger_patty.png",
+    "images/burger_cheese.png",
+    "images/burger_top.png",
+    "images/burger_complete.png",
+    "images/fries_raw.png",
+    "images/icecream_default.png",
+    "images/cup_cola.png",
+]
+
+DEFAULT_TEXTURE_BUDGET = 128 * 1024 * 1024
+
+
+def _make_placeholder():
+    try:
+        return arcade.make_soft_square_texture(64, arcade.color.MAGENTA, 255, 255)
+    except Exception:
+        return arcade.load_texture(":resources:images/tiles/boxCrate_double.png")
+
+
+def decode_texture(path):
+    # Только CPU (Pillow + хитбокс), без GL — можно звать из рабочего потока.
+    # Спрайт из запечённого атласа (atlas.py), если его исходник не правили после запекания,
+    # иначе файл из рабочей копии или пака (pack.py).
+    image = atlas_manifest.image(path)
+    if image is None:
+        with asset_files.open(path) as f:
+            image = PIL.Image.open(f)
+            image.load()
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    return arcade.Texture(ImageData(image))
+
+
+# Кэш текстур по пути: каждый файл декодируется один раз,
+# при превышении бюджета байт вытесняются давно не использованные.
+class TextureRegistry:
+    def __init__(self, budget_bytes=DEFAULT_TEXTURE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()
+        self._pinned = set()
+        self._exists = {}
+        self._placeholder = None
+        # offline — без диска: все запросы получают плейсхолдер (безоконная симуляция)
+        self.offline = False
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def exists(self, path):
+        found = self._exists.get(path)
+        if found is None:
+            found = path in atlas_manifest or asset_files.exists(path)
+            self._exists[path] = found
+        return found
+
+    def get(self, path):
+        if self.offline:
+            # Плейсхолдер не кэшируется под путём: после безоконного прогона окно получит настоящую текстуру.
+            return self.placeholder()
+        entry = self._entries.get(path)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(path)
+            return entry[0]
+
+        self.misses += 1
+        texture, size = self._decode(path)
+        self._entries[path] = (texture, size)
+        self.bytes_used += size
+        self._evict()
+        return texture
+
+    def preload(self, paths, pin=True):
+        if self.offline:
+            return
+        for path in paths:
+            if not self.exists(path):
+                continue
+            if path not in self._entries:
+                texture, size = self._decode(path)
+                self._entries[path] = (texture, size)
+                self.bytes_used += size
+            if pin:
+                self._pinned.add(path)
+        self._evict()
+
+    def put(self, path, texture, pin=True):
+        # Текстура, декодированная вне реестра (фоновый загрузчик, loader.py).
+        if path in self._entries:
+            self.bytes_used -= self._entries[path][1]
+        size = texture.width * texture.height * 4
+        self._entries[path] = (texture, size)
+        self._exists[path] = True
+        self.bytes_used += size
+        if pin:
+            self._pinned.add(path)
+        self._evict()
+
+    def set_budget(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+        self._pinned.clear()
+        self._exists.clear()
+        self.bytes_used = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.bytes_used,
+            "budget": self.budget_bytes,
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _decode(self, path):
+        if self.exists(path):
+            texture = decode_texture(path)
+            return texture, texture.width * texture.height * 4
+        return self.placeholder(), 0
+
+    def placeholder(self):
+        # Плейсхолдер общий для всех отсутствующих файлов, в бюджет не входит.
+        if self._placeholder is None:
+            self._placeholder = _make_placeholder()
+        return self._placeholder
+
+    def _evict(self):
+        if self.bytes_used <= self.budget_bytes:
+            return
+        for path in list(self._entries):
+            if self.bytes_used <= self.budget_bytes:
+                break
+            if path in self._pinned:
+                continue
+            _, size = self._entries.pop(path)
+            self.bytes_used -= size
+            self.evictions += 1
+
+
+texture_registry = TextureRegistry()
@@ -0,0 +1,207 @@
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+import PIL.Image
+
+from pack import asset_files
+
+ATLAS_DIR = "atlas"
+ATLAS_MANIFEST = f"{ATLAS_DIR}/manifest.json"
+ATLAS_FORMAT = 1
+SOURCE_DIR = "images"
+# Полноэкранные фоны рисуются во весь экран — их не уменьшаем и не пакуем.
+ATLAS_EXCLUDE = ("*_bg.png",)
+# Спрайты на экране не крупнее ~200 px; исходники бывают до 2200 px.
+MAX_SPRITE_EDGE = 256
+MAX_PAGE_SIZE = 2048
+PADDING = 2
+
+
+def _sha1(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _sources(source_dir=SOURCE_DIR, exclude=ATLAS_EXCLUDE):
+    return [
+        f"{source_dir}/{name}" for name in sorted(os.listdir(source_dir))
+        if name.lower().endswith(".png") and not any(fnmatch.fnmatch(name, pattern) for pattern in exclude)
+    ]
+
+
+def _prepare(path, max_edge):
+    image = PIL.Image.open(path).convert("RGBA")
+    source_size = image.size
+    if max(image.size) > max_edge:
+        image.thumbnail((max_edge, max_edge), PIL.Image.LANCZOS)
+    return image, source_size
+
+
+def _extrude(image, pad):
+    # Края спрайта продолжаются в поле отступа, чтобы фильтрация не подмешивала соседей.
+    w, h = image.size
+    padded = PIL.Image.new("RGBA", (w + pad * 2, h + pad * 2))
+    padded.paste(image, (pad, pad))
+    padded.paste(image.crop((0, 0, 1, h)).resize((pad, h)), (0, pad))
+    padded.paste(image.crop((w - 1, 0, w, h)).resize((pad, h)), (w + pad, pad))
+    padded.paste(padded.crop((0, pad, w + pad * 2, pad + 1)).resize((w + pad * 2, pad)), (0, 0))
+    padded.paste(padded.crop((0, pad + h - 1, w + pad * 2, pad + h)).resize((w + pad * 2, pad)), (0, pad + h))
+    return padded
+
+
+def _shelf_pack(sizes, page_size):
+    # Полки: по убыванию высоты слева направо, не влезло в ширину — новая полка.
+    placed, rest = {}, []
+    x = y = shelf_h = 0
+    for key, (w, h) in sizes:
+        if x + w > page_size:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        if y + h > page_size:
+            rest.append((key, (w, h)))
+            continue
+        placed[key] = (x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+    return placed, rest
+
+
+def bake_atlas(output_dir=ATLAS_DIR, source_dir=SOURCE_DIR, exclude=ATLAS_EXCLUDE,
+               max_edge=MAX_SPRITE_EDGE, page_size=MAX_PAGE_SIZE, padding=PADDING):
+    sprites = {}
+    sources = {}
+    for path in _sources(source_dir, exclude):
+        image, source_size = _prepare(path, max_edge)
+        sprites[path] = _extrude(image, padding)
+        sources[path] = {"size": list(source_size), "sha1": _sha1(path)}
+    pending = sorted(((key, img.size) for key, img in sprites.items()), key=lambda item: (-item[1][1], item[0]))
+    for key, (w, h) in pending:
+        if w > page_size or h > page_size:
+            raise ValueError(f"{key}: {w}x{h} does not fit a {page_size}px page")
+
+    os.makedirs(output_dir, exist_ok=True)
+    pages, regions = [], {}
+    while pending:
+        # Страница — наименьшая степень двойки, куда влезает всё оставшееся (или максимум).
+        size = 1 << (max(max(wh) for _, wh in pending) - 1).bit_length()
+        placed, rest = _shelf_pack(pending, size)
+        while rest and size < page_size:
+            size *= 2
+            placed, rest = _shelf_pack(pending, size)
+        used_h = max(y + sprites[key].size[1] for key, (_, y) in placed.items())
+        page = PIL.Image.new("RGBA", (size, used_h))
+        for key, (x, y) in placed.items():
+            page.paste(sprites[key], (x, y))
+            w, h = sprites[key].size
+            regions[key] = {
+                "page": len(pages), "x": x + padding, "y": y + padding,
+                "w": w - padding * 2, "h": h - padding * 2, **sources[key],
+            }
+        page_path = f"{output_dir}/atlas_{len(pages)}.png"
+        page.save(page_path, optimize=True)
+        pages.append(page_path)
+        pending = rest
+
+    manifest = {"format": ATLAS_FORMAT, "padding": padding, "max_edge": max_edge, "pages": pages, "regions": regions}
+    with open(f"{output_dir}/manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return manifest
+
+
+def stale_regions(manifest_path=ATLAS_MANIFEST):
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    stale = [path for path, region in manifest["regions"].items()
+             if not os.path.exists(path) or _sha1(path) != region["sha1"]]
+    baked = set(manifest["regions"])
+    stale += [path for path in _sources() if path not in baked]
+    return stale
+
+
+# Запечённый атлас на стороне игры: манифест читается при первом обращении,
+# страница декодируется один раз, спрайт — вырезка из неё. Нет манифеста —
+# нет и атласа, всё грузится из отдельных PNG, как раньше. Исходник в рабочей
+# копии, изменённый после запекания (SHA-1 не совпал), важнее своего спрайта.
+class AtlasManifest:
+    def __init__(self, path=ATLAS_MANIFEST):
+        self.path = path
+        self._regions = None
+        self._pages = []
+        self._page_images = {}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        regions = {}
+        if asset_files.exists(self.path):
+            with asset_files.open(self.path) as f:
+                manifest = json.load(f)
+            if manifest.get("format") == ATLAS_FORMAT:
+                regions = manifest["regions"]
+                self._pages = manifest["pages"]
+        self._regions = regions
+
+    @property
+    def regions(self):
+        if self._regions is None:
+            self._load()
+        return self._regions
+
+    def __contains__(self, path):
+        return path in self.regions
+
+    def page(self, index):
+        # Страницу могут одновременно запросить несколько потоков загрузчика.
+        with self._lock:
+            image = self._page_images.get(index)
+            if image is None:
+                with asset_files.open(self._pages[index]) as f:
+                    image = PIL.Image.open(f)
+                    image.load()
+                self._page_images[index] = image
+        return image
+
+    def is_current(self, path, region):
+        if not asset_files.is_loose(path):
+            return True
+        return _sha1(path) == region["sha1"]
+
+    def image(self, path):
+        region = self.regions.get(path)
+        if region is None or not self.is_current(path, region):
+            return None
+        x, y = region["x"], region["y"]
+        return self.page(region["page"]).crop((x, y, x + region["w"], y + region["h"]))
+
+    def release_pages(self):
+        self._page_images.clear()
+
+
+atlas_manifest = AtlasManifest()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bake images/*.png into texture atlas pages with a UV manifest")
+    parser.add_argument("--output", default=ATLAS_DIR)
+    parser.add_argument("--max-edge", type=int, default=MAX_SPRITE_EDGE, help="downscale sprites to this size")
+    parser.add_argument("--page-size", type=int, default=MAX_PAGE_SIZE)
+    parser.add_argument("--padding", type=int, default=PADDING)
+    parser.add_argument("--check", action="store_true", help="exit 1 if the baked atlas is out of date")
+    args = parser.parse_args(argv)
+    if args.check:
+        stale = stale_regions(f"{args.output}/manifest.json")
+        for path in stale:
+            print(f"stale: {path}")
+        sys.exit(1 if stale else 0)
+    start = time.perf_counter()
+    manifest = bake_atlas(args.output, max_edge=args.max_edge, page_size=args.page_size, padding=args.padding)
+    pages = ", ".join(f"{p} {PIL.Image.open(p).size[0]}x{PIL.Image.open(p).size[1]}" for p in manifest["pages"])
+    print(f"{len(manifest['regions'])} sprites -> {pages} in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import os
+import time
+
+import arcade
+import pyglet.media
+
+from pack import asset_files
+
+SOUNDS_DIR = "sounds"
+MAX_VOICES_PER_SOUND = 3
+
+
+# arcade.Sound умеет грузиться только по пути к файлу; это тот же звук, целиком
+# декодированный из записи пака.
+class PackedSound(arcade.Sound):
+    def __init__(self, name, file):
+        self.file_name = name
+        self.source = pyglet.media.load(name, file=file, streaming=False)
+        self.min_distance = 100000000
+
+
+# Звуки декодируются один раз (preload при старте или лениво при первом play),
+# одинаковые триггеры в пределах кадра сливаются в один, число голосов ограничено.
+class SoundBank:
+    def __init__(self, directory=SOUNDS_DIR, max_voices=MAX_VOICES_PER_SOUND):
+        self.directory = directory
+        self.max_voices = max_voices
+        self.enabled = True
+        self._sounds = {}
+        self._voices = {}
+        self._played_this_frame = set()
+        self.load_time = 0.0
+        self.loads = 0
+        self.plays = 0
+        self.merged = 0
+        self.stolen = 0
+
+    def names(self):
+        return [
+            os.path.splitext(file_name)[0] for file_name in asset_files.listdir(self.directory)
+            if os.path.splitext(file_name)[1].lower() == ".wav"
+        ]
+
+    def preload(self):
+        for name in self.names():
+            self.get(name)
+
+    def path(self, name):
+        return f"{self.directory}/{name}.wav"
+
+    def decode(self, name):
+        # Без обращения к полям банка — безопасно для рабочего потока (loader.py).
+        path = self.path(name)
+        if not asset_files.exists(path):
+            return None, 0.0
+        start = time.perf_counter()
+        try:
+            if asset_files.is_loose(path):
+                sound = arcade.load_sound(path)
+            else:
+                with asset_files.open(path) as f:
+                    sound = PackedSound(path, f)
+        except Exception:
+            sound = None
+        return sound, time.perf_counter() - start
+
+    def put(self, name, sound, seconds=0.0):
+        self._sounds[name] = sound
+        self.load_time += seconds
+        self.loads += 1
+
+    def get(self, name):
+        if name in self._sounds:
+            return self._sounds[name]
+        if not asset_files.exists(self.path(name)):
+            self._sounds[name] = None
+            return None
+        sound, seconds = self.decode(name)
+        self.put(name, sound, seconds)
+        return sound
+
+    def play(self, name, volume=1.0):
+        if not self.enabled:
+            return None
+        if name in self._played_this_frame:
+            self.merged += 1
+            return None
+        sound = self.get(name)
+        if sound is None:
+            return None
+        self._played_this_frame.add(name)
+
+        voices = [p for p in self._voices.get(name, []) if sound.is_playing(p)]
+        while len(voices) >= self.max_voices:
+            sound.stop(voices.pop(0))
+            self.stolen += 1
+        player = arcade.play_sound(sound, volume=volume)
+        if player is not None:
+            voices.append(player)
+        self._voices[name] = voices
+        self.plays += 1
+        return player
+
+    def new_frame(self):
+        self._played_this_frame.clear()
+
+    def voices_in_use(self, name=None):
+        names = [name] if name is not None else list(self._voices)
+        total = 0
+        for n in names:
+            sound = self._sounds.get(n)
+            if sound is None:
+                continue
+            total += sum(1 for p in self._voices.get(n, []) if sound.is_playing(p))
+        return total
+
+    def stats(self):
+        return {
+            "loaded": sum(1 for s in self._sounds.values() if s is not None),
+            "loads": self.loads,
+            "load_time": self.load_time,
+            "plays": self.plays,
+            "merged": self.merged,
+            "stolen": self.stolen,
+            "voices": self.voices_in_use(),
+        }
+
+
+sound_bank = SoundBank()
@@ -0,0 +1,241 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from headless import HeadlessGame
+from food import FoodManager
+from levels import Level
+from order_system import Order, OrderSystem
+from simulation import LAST_LEVEL
+
+TILE_POSITIONS = dict(FoodManager.COOKING_VIEW_POSITIONS)
+EQUIPMENT_POSITIONS = {aid: (x, y) for x, y, _, _, aid in FoodManager.EQUIPMENT_AREAS}
+
+SWEEP_PARAMS = ("time_scale", "objective_scale", "money_scale", "order_time_scale", "cooldown_base", "cooldown_min")
+
+
+# «Игрок» для прогонов: раз в время реакции делает один клик по кухне или клиенту.
+# scripted собирает текущий заказ (с вероятностью ошибки), random кликает наугад.
+class Policy:
+    def __init__(self, kind, rng, reaction=(0.4, 1.2), error_rate=0.05):
+        self.kind = kind
+        self.rng = rng
+        self.reaction = reaction
+        self.error_rate = error_rate
+        self.cooldown = 0.0
+
+    def __call__(self, game):
+        if self.kind == "idle":
+            return
+        self.cooldown -= game.delta_time
+        if self.cooldown > 0:
+            return
+        action = self.scripted_action(game) if self.kind == "scripted" else self.random_action(game)
+        if action is not None:
+            action()
+            self.cooldown = self.rng.uniform(*self.reaction)
+
+    def scripted_action(self, game):
+        order = game.order_system.get_current_order()
+        if order is None:
+            return None
+        fm = game.food_manager
+        prepared = fm.get_prepared_items()
+        for item in order.items:
+            ready = prepared.get(item.category)
+            if ready is not None and ready.key == item.key:
+                continue
+            if item.category == "burger":
+                return self._burger_step(fm, list(item.variant))
+            if item.category == "fries":
+                if fm.fries.is_prepared or fm.fries.preparation_time == 0:
+                    return lambda: _click(fm, EQUIPMENT_POSITIONS["fryer"])
+                return None
+            if item.category == "drink":
+                return lambda: _click(fm, TILE_POSITIONS[self._maybe_wrong("drink_" + item.variant, "drink_cola", "drink_water")])
+            if item.category == "icecream":
+                return lambda: _click(fm, TILE_POSITIONS[self._maybe_wrong(
+                    "icecream_" + item.variant, "icecream_default", "icecream_chocolate"
+                )])
+        return self._serve(game, order)
+
+    def _burger_step(self, fm, layers):
+        assembly = fm.burger_assembly
+        if assembly == layers or assembly != layers[:len(assembly)]:
+            return lambda: _click(fm, EQUIPMENT_POSITIONS["grill"])
+        layer = layers[len(assembly)]
+        if layer in ("patty", "cheese"):
+            layer = self._maybe_wrong(layer, "patty", "cheese")
+        return lambda: _click(fm, TILE_POSITIONS["burger_" + layer])
+
+    def _maybe_wrong(self, wanted, *options):
+        if self.rng.random() < self.error_rate:
+            return self.rng.choice(options)
+        return wanted
+
+    def _serve(self, game, order=None):
+        if order is not None:
+            customers = [game.customer_manager.find(order.customer_id)]
+        else:
+            customers = game.customer_manager.customers
+        for customer in customers:
+            if customer is not None and customer.state == "waiting" and not customer.order_submitted:
+                return lambda: game.customer_manager.check_customer_click(customer.center_x, customer.center_y)
+        return None
+
+    def random_action(self, game):
+        fm = game.food_manager
+        roll = self.rng.random()
+        if roll < 0.15:
+            return self._serve(game)
+        if roll < 0.6:
+            return lambda: _click(fm, TILE_POSITIONS[self.rng.choice(list(TILE_POSITIONS))])
+        return lambda: _click(fm, EQUIPMENT_POSITIONS[self.rng.choice(list(EQUIPMENT_POSITIONS))])
+
+
+def _click(food_manager, position):
+    food_manager.check_equipment_click(*position)
+
+
+def _apply_params(params):
+    Order.TIME_SCALE = params["order_time_scale"]
+    OrderSystem.COOLDOWN_BASE = params["cooldown_base"]
+    OrderSystem.COOLDOWN_MIN = params["cooldown_min"]
+
+
+def play_level(level_number, policy, params, seed=None):
+    with HeadlessGame(seed=seed) as game:
+        game.start_campaign()
+        game.current_level = level_number
+        game.level_manager.load_level(level_number)
+        level = game.level_manager.current_level
+        level.time_limit *= params["time_scale"]
+        level.objective_score *= params["objective_scale"]
+        level.starting_money = int(level.starting_money * params["money_scale"])
+        game.level_manager.schedule_deadline()
+        game.money = level.starting_money
+        # Счёт в кампании накопительный: считаем, что предыдущий уровень пройден ровно по цели.
+        if level_number > 1:
+            game.score = Level(level_number - 1).objective_score * params["objective_scale"]
+
+        ticks_per_second = max(1, round(1 / game.delta_time))
+        curve = [game.money]
+        while game.game_state == "PLAYING":
+            policy(game)
+            game.simulate(game.delta_time)
+            if game.sim_tick % ticks_per_second == 0:
+                curve.append(game.money)
+
+    orders = game.order_system
+    return level.passed, game.money, orders.orders_succeeded, orders.orders_failed + orders.orders_expired, curve
+
+
+def run_batch(task):
+    level_number, runs, seed_sequence, policy_kind, params = task
+    _apply_params(params)
+    # Своя воспроизводимая последовательность случайных чисел на каждую задачу.
+    seeds = seed_sequence.generate_state(runs)
+    passed = np.zeros(runs, dtype=bool)
+    money = np.zeros(runs, dtype=np.int64)
+    succeeded = np.zeros(runs, dtype=np.int32)
+    failed = np.zeros(runs, dtype=np.int32)
+    curves = []
+    for i, seed in enumerate(seeds):
+        policy = Policy(policy_kind, random.Random(int(seed) ^ 0x5EED))
+        passed[i], money[i], succeeded[i], failed[i], curve = play_level(level_number, policy, params, int(seed))
+        curves.append(curve)
+    width = max(len(c) for c in curves)
+    curve_array = np.array([c + [c[-1]] * (width - len(c)) for c in curves], dtype=np.int64)
+    return level_number, passed, money, succeeded, failed, curve_array
+
+
+def simulate_levels(levels, runs, workers, seed, policy_kind, params, chunk_size=25):
+    root = np.random.SeedSequence(seed)
+    tasks = []
+    for level_number in levels:
+        for start in range(0, runs, chunk_size):
+            tasks.append((level_number, min(chunk_size, runs - start), root.spawn(1)[0], policy_kind, params))
+
+    parts = {level_number: [] for level_number in levels}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(run_batch, tasks):
+            parts[result[0]].append(result[1:])
+
+    report = {}
+    for level_number, chunks in parts.items():
+        passed, money, succeeded, failed, curves = zip(*chunks)
+        passed = np.concatenate(passed)
+        money = np.concatenate(money)
+        succeeded = np.concatenate(succeeded)
+        failed = np.concatenate(failed)
+        width = max(c.shape[1] for c in curves)
+        curves = np.concatenate([np.pad(c, ((0, 0), (0, width - c.shape[1])), mode="edge") for c in curves])
+        total_orders = succeeded + failed
+        ratio = np.divide(succeeded, total_orders, out=np.zeros(len(succeeded)), where=total_orders > 0)
+        report[level_number] = {
+            "runs": int(len(passed)),
+            "pass_rate": float(passed.mean()),
+            "money_mean": float(money.mean()),
+            "money_p10": float(np.percentile(money, 10)),
+            "money_p90": float(np.percentile(money, 90)),
+            "order_success_ratio": float(ratio.mean()),
+            "orders_per_run": float(total_orders.mean()),
+            "money_curve_mean": curves.mean(axis=0).round(1).tolist(),
+        }
+    return report
+
+
+def _float_list(text):
+    return [float(v) for v in text.split(",")]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo balance simulator for all levels")
+    parser.add_argument("--runs", type=int, default=500, help="playthroughs per level")
+    parser.add_argument("--levels", default=",".join(str(n) for n in range(1, LAST_LEVEL + 1)))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", choices=("scripted", "random", "idle"), default="scripted")
+    parser.add_argument("--time-scale", type=_float_list, default=[1.0], help="Level.time_limit multiplier(s)")
+    parser.add_argument("--objective-scale", type=_float_list, default=[1.0], help="Level.objective_score multiplier(s)")
+    parser.add_argument("--money-scale", type=_float_list, default=[1.0], help="Level.starting_money multiplier(s)")
+    parser.add_argument("--order-time-scale", type=_float_list, default=[1.0], help="Order.TIME_SCALE value(s)")
+    parser.add_argument("--cooldown-base", type=_float_list, default=[OrderSystem.COOLDOWN_BASE])
+    parser.add_argument("--cooldown-min", type=_float_list, default=[OrderSystem.COOLDOWN_MIN])
+    parser.add_argument("--json", help="write the full report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    levels = [int(v) for v in args.levels.split(",")]
+    grid = [getattr(args, name) for name in SWEEP_PARAMS]
+    results = []
+    start = time.perf_counter()
+    for combo in itertools.product(*grid):
+        params = dict(zip(SWEEP_PARAMS, combo))
+        report = simulate_levels(levels, args.runs, args.workers, args.seed, args.policy, params)
+        results.append({"params": params, "levels": report})
+        print(", ".join(f"{k}={v:g}" for k, v in params.items()))
+        print(f"{'lvl':>3} {'pass':>6} {'money':>8} {'p10':>7} {'p90':>7} {'ok%':>6} {'orders':>6}")
+        for level_number, row in report.items():
+            print(
+                f"{level_number:>3} {row['pass_rate']:>6.1%} {row['money_mean']:>8.0f} {row['money_p10']:>7.0f} "
+                f"{row['money_p90']:>7.0f} {row['order_success_ratio']:>6.1%} {row['orders_per_run']:>6.1f}"
+            )
+    elapsed = time.perf_counter() - start
+    total_runs = len(results) * len(levels) * args.runs
+    print(f"{total_runs} runs in {elapsed:.2f} s ({total_runs / elapsed:.0f} runs/s, {args.workers} workers)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import arcade
+from render_cache import baked_textures
 from utils import get_texture_display_size
 
 
@@ -24,6 +25,16 @@ class Chef:
             arcade.draw_texture_rect(self.texture, rect)
             return
 
+        baked = self.baked_texture()
+        arcade.draw_texture_rect(baked, arcade.types.XYWH(x, y, baked.width, baked.height))
+
+    def baked_texture(self):
+        key = ("chef", self.body_width, self.body_height, self.head_radius)
+        half_w = self.body_width / 2 + 50
+        half_h = self.body_height / 2 + self.head_radius * 4 + 10
+        return baked_textures.get(key, half_w, half_h, lambda: self.draw_procedural(0, 0))
+
+    def draw_procedural(self, x, y):
         skin = arcade.color.BISQUE
         outline = arcade.color.BLACK
 
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import pickle
+import time
+
+CONTENT_DIR = "content"
+CONTENT_FILES = ("levels.json", "kitchen.json", "menu.json")
+# Меняется вместе с форматом скомпилированных таблиц: старые кэши перестают совпадать по ключу.
+CACHE_FORMAT = 1
+
+
+def _number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _str(value):
+    return isinstance(value, str) and value != ""
+
+
+def _point(value):
+    return isinstance(value, list) and len(value) == 2 and all(_number(v) for v in value)
+
+
+def _rect(value):
+    return isinstance(value, list) and len(value) == 4 and all(_number(v) for v in value)
+
+
+def _str_list(value):
+    return isinstance(value, list) and all(_str(v) for v in value)
+
+
+def _str_map(value):
+    return isinstance(value, dict) and value != {} and all(_str(v) for v in value.values())
+
+
+LEVEL_FIELDS = {
+    "number": _int, "customers_per_hour": _number, "starting_money": _int, "objective_score": _number,
+    "time_limit": _number, "max_orders": _int, "ingredients": _str_list,
+}
+INGREDIENT_FIELDS = {"name": _str, "label": _str, "texture": _str, "inventory": _point, "cooking": _point}
+EQUIPMENT_FIELDS = {"id": _str, "area": _rect, "label": _str, "label_at": _point, "position": _point}
+MENU_FIELDS = {"category": _str, "label": _str, "threshold": _number, "reward": _int, "penalty": _int, "time_bonus": _number}
+
+
+def _check(record, fields, where):
+    if not isinstance(record, dict):
+        raise ValueError(f"{where}: expected an object")
+    for field, valid in fields.items():
+        if field not in record:
+            raise ValueError(f"{where}: missing '{field}'")
+        if not valid(record[field]):
+            raise ValueError(f"{where}.{field}: bad value {record[field]!r} ({valid.__name__.strip('_')} expected)")
+
+
+def _records(data, key, fields, source):
+    records = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(records, list) or not records:
+        raise ValueError(f"{source}: '{key}' must be a non-empty list")
+    for i, record in enumerate(records):
+        _check(record, fields, f"{source}: {key}[{i}]")
+    return records
+
+
+def _unique(records, field, source):
+    seen = set()
+    for record in records:
+        if record[field] in seen:
+            raise ValueError(f"{source}: duplicate {field} {record[field]!r}")
+        seen.add(record[field])
+
+
+def compile_levels(data, source="levels.json"):
+    levels = _records(data, "levels", LEVEL_FIELDS, source)
+    for i, level in enumerate(levels):
+        if level["number"] != i + 1:
+            raise ValueError(f"{source}: levels[{i}].number must be {i + 1}, got {level['number']}")
+        if level["max_orders"] < 1:
+            raise ValueError(f"{source}: levels[{i}].max_orders must be at least 1")
+    return {"levels": tuple({k: v for k, v in level.items() if k != "number"} for level in levels)}
+
+
+def compile_kitchen(data, source="kitchen.json"):
+    ingredients = _records(data, "ingredients", INGREDIENT_FIELDS, source)
+    equipment = _records(data, "equipment", EQUIPMENT_FIELDS, source)
+    _unique(ingredients, "name", source)
+    _unique(equipment, "id", source)
+    return {
+        "ingredient_names": {i["name"]: i["label"] for i in ingredients},
+        "inventory": tuple((i["name"], i["texture"], tuple(i["inventory"])) for i in ingredients),
+        "cooking_view_positions": tuple((i["name"], tuple(i["cooking"])) for i in ingredients),
+        "equipment_areas": tuple((*e["area"], e["id"]) for e in equipment),
+        "equipment_labels": tuple((*e["label_at"], e["label"]) for e in equipment),
+        "equipment_positions": {e["id"]: tuple(e["position"]) for e in equipment},
+    }
+
+
+def compile_menu(data, source="menu.json"):
+    menu = _records(data, "menu", MENU_FIELDS, source)
+    _unique(menu, "category", source)
+    layer_labels = data.get("burger_layers", {})
+    if not isinstance(layer_labels, dict) or not all(_str(v) for v in layer_labels.values()):
+        raise ValueError(f"{source}: 'burger_layers' must map layer names to labels")
+    for i, entry in enumerate(menu):
+        where = f"{source}: menu[{i}]"
+        if ("variants" in entry) == ("layers" in entry):
+            raise ValueError(f"{where}: needs exactly one of 'variants' or 'layers'")
+        if "variants" in entry and not _str_map(entry["variants"]):
+            raise ValueError(f"{where}.variants: expected a non-empty map of variant -> label")
+        if "layers" in entry:
+            layers = entry["layers"]
+            _check(layers, {"required": _str_list, "optional": _str_list, "closing": _str}, f"{where}.layers")
+            unknown = [l for l in layers["required"] + layers["optional"] + [layers["closing"]] if l not in layer_labels]
+            if unknown:
+                raise ValueError(f"{where}.layers: no label for {unknown} in 'burger_layers'")
+        if "min_level" in entry and not _int(entry["min_level"]):
+            raise ValueError(f"{where}.min_level: bad value {entry['min_level']!r}")
+    return {"menu": tuple(menu), "burger_layers": layer_labels}
+
+
+COMPILERS = {"levels.json": compile_levels, "kitchen.json": compile_kitchen, "menu.json": compile_menu}
+
+
+def content_hash(directory=CONTENT_DIR):
+    digest = hashlib.sha256(f"content-cache-{CACHE_FORMAT}".encode())
+    for name in CONTENT_FILES:
+        with open(os.path.join(directory, name), "rb") as f:
+            data = f.read()
+        digest.update(f"{name}:{len(data)}:".encode())
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def compile_content(directory=CONTENT_DIR):
+    tables = {}
+    for name in CONTENT_FILES:
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{name}: {e}") from None
+        tables.update(COMPILERS[name](data, name))
+    return tables
+
+
+def _write_cache(path, tables):
+    cache_dir = os.path.dirname(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        for name in os.listdir(cache_dir):
+            if name.startswith("content.") and name.endswith(".pickle") and os.path.join(cache_dir, name) != path:
+                os.remove(os.path.join(cache_dir, name))
+    except OSError:
+        # Каталог только для чтения — просто компилируем при каждом запуске.
+        pass
+
+
+# Игровые таблицы (уровни, кухня, меню) из JSON в content/. Проверенные и
+# скомпилированные таблицы кэшируются в content/__pycache__ под хешем
+# содержимого файлов: следующий запуск читает один pickle без разбора JSON и
+# проверок, любая правка файла даёт новый ключ и перекомпиляцию.
+class Content:
+    def __init__(self, tables, digest, from_cache, load_ms):
+        self.__dict__.update(tables)
+        self.digest = digest
+        self.from_cache = from_cache
+        self.load_ms = load_ms
+
+    @property
+    def last_level(self):
+        return len(self.levels)
+
+    def level(self, level_number):
+        if not 1 <= level_number <= len(self.levels):
+            raise LookupError(f"no level {level_number} in {CONTENT_FILES[0]} (1..{len(self.levels)})")
+        return self.levels[level_number - 1]
+
+
+def load_content(directory=CONTENT_DIR):
+    start = time.perf_counter()
+    digest = content_hash(directory)
+    cache_path = os.path.join(directory, "__pycache__", f"content.{digest[:16]}.pickle")
+    try:
+        with open(cache_path, "rb") as f:
+            tables = pickle.load(f)
+        from_cache = True
+    except (OSError, EOFError, pickle.UnpicklingError):
+        tables = compile_content(directory)
+        _write_cache(cache_path, tables)
+        from_cache = False
+    return Content(tables, digest, from_cache, (time.perf_counter() - start) * 1000)
+
+
+content = load_content()
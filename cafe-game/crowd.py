@@ -0,0 +1,482 @@
+import arcade
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from audio import sound_bank
+from customer import Customer, CustomerManager, _indicator_texture
+from utils import get_texture_display_size
+
+CROWD_AVAILABLE = np is not None
+
+STATES = ("entering", "waiting", "leaving_happy", "leaving_angry", "completed", "gone")
+ENTERING, WAITING, LEAVING_HAPPY, LEAVING_ANGRY, COMPLETED, GONE = range(len(STATES))
+STATE_CODES = {name: code for code, name in enumerate(STATES)}
+IDLE, HAPPY, ANGRY = range(len(Customer.MOODS))
+# Настроение однозначно следует из состояния (как Customer.update_mood).
+MOOD_OF_STATE = (IDLE, IDLE, HAPPY, ANGRY, HAPPY, IDLE)
+
+CROWD_SPAWN_SECONDS = 2.0
+
+
+# Все клиенты в столбцах NumPy (structure of arrays): позиции, скорости, цели,
+# состояния, ожидание и палитра. Шаг обновляет всех сразу, ушедшие строки
+# удаляются одной компактизацией за тик. ambient — фоновая толпа стресс-уровня:
+# она не делает заказов, а постояв wait_limit секунд, уходит сама.
+class CrowdState:
+    COLUMNS = (
+        ("ids", "i8"), ("center_x", "f4"), ("center_y", "f4"), ("prev_x", "f4"),
+        ("target_x", "f4"), ("speed", "f4"), ("state", "i1"), ("wait_time", "f4"),
+        ("wait_limit", "f4"), ("order_submitted", "?"), ("palette", "i1"), ("ambient", "?"),
+    )
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.regular = 0
+        self.next_id = 0
+        self.compactions = 0
+        for name, dtype in self.COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.mood = np.zeros(capacity, dtype="i1")
+        self._names = [name for name, _ in self.COLUMNS] + ["mood"]
+        self._mood_of_state = np.array(MOOD_OF_STATE, dtype="i1")
+
+    @property
+    def capacity(self):
+        return len(self.ids)
+
+    def _reserve(self, extra):
+        needed = self.count + extra
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, self.capacity * 2)
+        for name in self._names:
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:self.count] = old[:self.count]
+            setattr(self, name, grown)
+
+    def spawn(self, target_x, speed, palette, center_y=350.0, wait_limit=None, ambient=False):
+        # Все аргументы — скаляры или массивы одной длины: n строк добавляются разом.
+        # Без wait_limit клиент ждёт, пока его не обслужат (как Customer).
+        n = max(np.size(target_x), np.size(speed), np.size(palette))
+        self._reserve(n)
+        rows = slice(self.count, self.count + n)
+        self.ids[rows] = np.arange(self.next_id, self.next_id + n)
+        self.center_x[rows] = -100
+        self.prev_x[rows] = -100
+        self.center_y[rows] = center_y
+        self.target_x[rows] = target_x
+        self.speed[rows] = speed
+        self.state[rows] = ENTERING
+        self.wait_time[rows] = 0
+        self.wait_limit[rows] = np.inf if wait_limit is None else wait_limit
+        self.order_submitted[rows] = False
+        self.palette[rows] = palette
+        self.ambient[rows] = ambient
+        self.mood[rows] = IDLE
+        self.next_id += n
+        self.count += n
+        if not ambient:
+            self.regular += n
+        return rows.start
+
+    def step(self, delta_time, rng):
+        n = self.count
+        if not n:
+            return 0
+        x = self.center_x[:n]
+        state = self.state[:n]
+        self.prev_x[:n] = x
+
+        entering = state == ENTERING
+        leaving = (state == LEAVING_HAPPY) | (state == LEAVING_ANGRY)
+        waiting = state == WAITING
+        completed = state == COMPLETED
+
+        x[entering] += self.speed[:n][entering] * delta_time
+        arrived = entering & (x >= self.target_x[:n])
+        x[arrived] = self.target_x[:n][arrived]
+        state[arrived] = WAITING
+        self.wait_time[:n][arrived] = 0
+
+        x[leaving] -= self.speed[:n][leaving] * 1.5 * delta_time
+        state[completed] = LEAVING_HAPPY
+
+        self.wait_time[:n][waiting] += delta_time
+        bored = waiting & (self.wait_time[:n] >= self.wait_limit[:n])
+        if bored.any():
+            state[bored] = np.where(rng.random(np.count_nonzero(bored)) < 0.5, LEAVING_HAPPY, LEAVING_ANGRY)
+
+        state[leaving & (x < -100)] = GONE
+        self.mood[:n] = self._mood_of_state[state]
+        return self.compact()
+
+    def compact(self):
+        n = self.count
+        keep = self.state[:n] != GONE
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return 0
+        self.regular -= int(np.count_nonzero(~keep & ~self.ambient[:n]))
+        for name in self._names:
+            column = getattr(self, name)
+            column[:kept] = column[:n][keep]
+        self.count = kept
+        self.compactions += 1
+        return n - kept
+
+    def row_of(self, customer_id, hint=0):
+        if hint < self.count and self.ids[hint] == customer_id:
+            return hint
+        # ids растут монотонно, а компактизация сохраняет порядок строк.
+        row = int(np.searchsorted(self.ids[:self.count], customer_id))
+        if row < self.count and self.ids[row] == customer_id:
+            return row
+        return -1
+
+    def clear(self):
+        self.count = 0
+        self.regular = 0
+
+
+def _column(name, cast):
+    def fget(self):
+        return cast(getattr(self.crowd, name)[self.row])
+
+    def fset(self, value):
+        getattr(self.crowd, name)[self.row] = value
+
+    return property(fget, fset)
+
+
+# Прежний интерфейс Customer поверх строки CrowdState: order_system, клики и
+# balance_sim работают с ним так же, как с объектом. Строка ищется по id,
+# поэтому представление переживает компактизацию.
+class CrowdCustomer:
+    customer_type = "standard"
+    body_width = 120
+    body_height = 150
+    head_radius = 28
+
+    def __init__(self, crowd, row):
+        self.crowd = crowd
+        self.id = int(crowd.ids[row])
+        self._row = row
+
+    @property
+    def row(self):
+        self._row = self.crowd.row_of(self.id, self._row)
+        if self._row < 0:
+            raise LookupError(f"customer {self.id} has left")
+        return self._row
+
+    @property
+    def present(self):
+        return self.crowd.row_of(self.id, self._row) >= 0
+
+    center_x = _column("center_x", float)
+    center_y = _column("center_y", float)
+    prev_x = _column("prev_x", float)
+    target_x = _column("target_x", float)
+    speed = _column("speed", float)
+    wait_time = _column("wait_time", float)
+    order_submitted = _column("order_submitted", bool)
+
+    @property
+    def state(self):
+        return STATES[self.crowd.state[self.row]]
+
+    @state.setter
+    def state(self, value):
+        code = STATE_CODES[value]
+        self.crowd.state[self.row] = code
+        self.crowd.mood[self.row] = MOOD_OF_STATE[code]
+
+    @property
+    def mood(self):
+        return Customer.MOODS[self.crowd.mood[self.row]]
+
+    def on_order_complete(self, success):
+        self.order_submitted = True
+        self.state = "completed" if success else "leaving_angry"
+
+
+# Последовательность «обычных» клиентов (без фоновой толпы) в виде CrowdCustomer.
+class CrowdCustomers:
+    def __init__(self, manager):
+        self.manager = manager
+
+    def __len__(self):
+        return self.manager.crowd.regular
+
+    def __iter__(self):
+        manager = self.manager
+        crowd = manager.crowd
+        rows = np.flatnonzero(~crowd.ambient[:crowd.count])
+        return iter([manager.view(int(row)) for row in rows])
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+
+# CustomerManager с клиентами в CrowdState. Стресс-уровень держит вокруг
+# обычного потока заказов ещё stress_crowd фоновых посетителей.
+class CrowdCustomerManager(CustomerManager):
+    def __init__(self, game, stress_crowd=0):
+        super().__init__(game)
+        self.crowd = CrowdState()
+        self.customers = CrowdCustomers(self)
+        self.stress_crowd = stress_crowd
+        self.alpha = 1.0
+        self._views = {}
+        self.renderer = CrowdRenderer(self) if game.rendering else None
+
+    @property
+    def rng(self):
+        # Поток толпы пересоздаётся с каждой кампанией (game.rng.reset).
+        return self.game.rng.numpy("crowd")
+
+    def view(self, row):
+        customer_id = int(self.crowd.ids[row])
+        customer = self._views.get(customer_id)
+        if customer is None:
+            customer = self._views[customer_id] = CrowdCustomer(self.crowd, row)
+        return customer
+
+    def setup_customers(self):
+        self.crowd.clear()
+        self._views.clear()
+        self.spawn_timer = 0
+        self.game.hit_grid.clear("customers")
+
+    def update(self, delta_time):
+        self.spawn_ambient(delta_time)
+        self.crowd.step(delta_time, self.rng)
+        # В хит-тесте только обычные клиенты (их единицы), фоновая толпа некликабельна.
+        grid = self.game.hit_grid
+        for customer_id, customer in list(self._views.items()):
+            if customer.present:
+                grid.move(customer, customer.center_x, customer.center_y)
+            else:
+                grid.remove(customer)
+                del self._views[customer_id]
+
+    def spawn_ambient(self, delta_time):
+        missing = self.stress_crowd - (self.crowd.count - self.crowd.regular)
+        if missing <= 0:
+            return
+        # Толпа набирается за CROWD_SPAWN_SECONDS, а не одним кадром.
+        n = min(missing, max(1, int(self.stress_crowd * delta_time / CROWD_SPAWN_SECONDS)))
+        rng = self.rng
+        self.crowd.spawn(
+            target_x=rng.uniform(100, self.game.width - 100, n),
+            speed=30 + rng.random(n) * 30,
+            palette=rng.integers(0, len(Customer.PALETTES), n),
+            center_y=rng.uniform(300, 400, n),
+            wait_limit=rng.uniform(2, 8, n),
+            ambient=True,
+        )
+
+    def spawn_customer(self, offset_x=0):
+        rng = self.game.rng.customers
+        row = self.crowd.spawn(
+            target_x=rng.randint(100, 300) + offset_x,
+            speed=30 + rng.random() * 30,
+            palette=rng.randrange(len(Customer.PALETTES)),
+        )
+        sound_bank.play("order")
+        return self._register(row)
+
+    def add_customer(self, customer):
+        row = self.crowd.spawn(customer.target_x, customer.speed, 0)
+        return self._register(row)
+
+    def _register(self, row):
+        customer = self.view(row)
+        self.register_hit_region(customer)
+        return customer
+
+    def remove_customer(self, customer):
+        self.crowd.state[customer.row] = GONE
+        self.crowd.compact()
+        self._views.pop(customer.id, None)
+        self.game.hit_grid.remove(customer)
+
+    def interpolate(self, alpha):
+        self.alpha = alpha
+
+    def draw(self):
+        if self.renderer is not None:
+            self.renderer.draw(self.alpha)
+
+    def find(self, customer_id):
+        customer = self._views.get(customer_id)
+        if customer is None:
+            row = self.crowd.row_of(customer_id)
+            customer = self.view(row) if row >= 0 else None
+        return customer
+
+    def dismiss_customer(self, customer_id):
+        crowd = self.crowd
+        row = crowd.row_of(customer_id)
+        if row >= 0 and crowd.state[row] in (ENTERING, WAITING) and not crowd.order_submitted[row]:
+            crowd.state[row] = LEAVING_ANGRY
+            crowd.mood[row] = ANGRY
+
+
+CROWD_VERTEX_SHADER = """
+#version 330
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+in vec2 in_corner;
+in vec2 in_pos;
+in vec2 in_size;
+in vec4 in_uv;
+
+out vec2 v_uv;
+
+void main() {
+    vec2 offset = (in_corner - 0.5) * in_size;
+    gl_Position = window.projection * window.view * vec4(in_pos + offset, 0.0, 1.0);
+    v_uv = mix(in_uv.xy, in_uv.zw, in_corner);
+}
+"""
+
+CROWD_FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D atlas_texture;
+
+in vec2 v_uv;
+out vec4 f_color;
+
+void main() {
+    vec4 color = texture(atlas_texture, v_uv);
+    if (color.a == 0.0) {
+        discard;
+    }
+    f_color = color;
+}
+"""
+
+
+# Вся толпа рисуется одним инстансинговым вызовом: на каждого клиента (и на его
+# значок настроения) по строке (x, y, w, h, uv) из таблицы вариантов
+# палитра × настроение. Текстуры вариантов лежат в общем атласе окна.
+class CrowdRenderer:
+    INSTANCE_FLOATS = 8
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.ctx = arcade.get_window().ctx
+        self.program = self.ctx.program(
+            vertex_shader=CROWD_VERTEX_SHADER, fragment_shader=CROWD_FRAGMENT_SHADER
+        )
+        self.corners = self.ctx.buffer(data=np.array([0, 0, 1, 0, 0, 1, 1, 1], dtype="f4").tobytes())
+        self.instances = None
+        self.geometry = None
+        self.body_textures = None
+        self.body_dy = None
+        self.indicator_textures = None
+        self.instances_drawn = 0
+
+    def _build_variants(self):
+        moods = Customer.MOODS
+        pngs = self.manager._customer_textures or {}
+        template = Customer.template(self.manager.game)
+        self.body_textures, sizes, dy = [], [], []
+        for body_color, accent_color in Customer.PALETTES:
+            template._body_color, template._accent_color = body_color, accent_color
+            for mood in moods:
+                texture = pngs.get(mood)
+                if texture is not None:
+                    sizes.append(get_texture_display_size(
+                        texture, template.body_width, template.body_height, fit_inside=True
+                    ))
+                    dy.append(template.body_height / 2 + 20)
+                else:
+                    texture = template.baked_texture(mood)
+                    sizes.append((texture.width, texture.height))
+                    dy.append(template.body_height / 2 + template.head_radius * 2 + 2)
+                self.body_textures.append(texture)
+        self.body_sizes = np.array(sizes, dtype="f4")
+        self.body_dy = np.array(dy, dtype="f4")
+        self.indicator_textures = [_indicator_texture(mood) for mood in moods]
+        self.indicator_sizes = np.array(
+            [(t.width, t.height) if t is not None else (0, 0) for t in self.indicator_textures], dtype="f4"
+        )
+
+    def _uv_table(self, textures):
+        # Атлас может перестроиться (resize/rebuild), поэтому UV читаются каждый кадр:
+        # вариантов всего дюжина.
+        atlas = self.ctx.default_atlas
+        table = np.zeros((len(textures), 4), dtype="f4")
+        for i, texture in enumerate(textures):
+            if texture is None:
+                continue
+            if not atlas.has_texture(texture):
+                atlas.add(texture)
+            coords = atlas.get_texture_region_info(texture.atlas_name).texture_coordinates
+            xs, ys = coords[0::2], coords[1::2]
+            table[i] = (min(xs), max(ys), max(xs), min(ys))
+        return table
+
+    def _reserve(self, count):
+        size = count * self.INSTANCE_FLOATS * 4
+        if self.instances is not None and self.instances.size >= size:
+            return
+        self.instances = self.ctx.buffer(reserve=max(size, 2 * (self.instances.size if self.instances is not None else 0)))
+        self.geometry = self.ctx.geometry(
+            [
+                arcade.gl.BufferDescription(self.corners, "2f", ["in_corner"]),
+                arcade.gl.BufferDescription(
+                    self.instances, "2f 2f 4f", ["in_pos", "in_size", "in_uv"], instanced=True
+                ),
+            ],
+            mode=self.ctx.TRIANGLE_STRIP,
+        )
+
+    def draw(self, alpha):
+        crowd = self.manager.crowd
+        n = crowd.count
+        if not n:
+            self.instances_drawn = 0
+            return
+        if self.body_textures is None:
+            self._build_variants()
+        body_uv = self._uv_table(self.body_textures)
+        indicator_uv = self._uv_table(self.indicator_textures)
+
+        prev_x = crowd.prev_x[:n]
+        x = prev_x + (crowd.center_x[:n] - prev_x) * alpha
+        y = crowd.center_y[:n]
+        mood = crowd.mood[:n]
+        variant = crowd.palette[:n].astype(np.intp) * len(Customer.MOODS) + mood
+        marked = np.flatnonzero(self.indicator_sizes[mood, 0] > 0)
+        total = n + marked.size
+
+        data = np.empty((total, self.INSTANCE_FLOATS), dtype="f4")
+        data[:n, 0] = x
+        data[:n, 1] = y
+        data[:n, 2:4] = self.body_sizes[variant]
+        data[:n, 4:] = body_uv[variant]
+        data[n:, 0] = x[marked]
+        data[n:, 1] = y[marked] + self.body_dy[variant[marked]]
+        data[n:, 2:4] = self.indicator_sizes[mood[marked]]
+        data[n:, 4:] = indicator_uv[mood[marked]]
+
+        self._reserve(total)
+        self.instances.write(data)
+        ctx = self.ctx
+        ctx.enable(ctx.BLEND)
+        ctx.blend_func = ctx.BLEND_DEFAULT
+        ctx.default_atlas.texture.use(0)
+        self.geometry.render(self.program, instances=total)
+        ctx.disable(ctx.BLEND)
+        self.instances_drawn = total
+
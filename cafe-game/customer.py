@@ -1,7 +1,9 @@
 import arcade
+import itertools
 import random
-import os
-from utils import get_texture_display_size
+from audio import sound_bank
+from render_cache import baked_textures
+from utils import load_texture, texture_exists, get_texture_display_size
 
 
 class Customer:
@@ -10,14 +12,29 @@ class Customer:
         "happy": "images/customer_happy.png",
         "angry": "images/customer_angry.png",
     }
-
-    def __init__(self, game, customer_type, textures=None):
+    MOODS = ("idle", "happy", "angry")
+    INDICATORS = {
+        "happy": ("❤", arcade.color.PINK, 14),
+        "angry": ("!", arcade.color.RED, 18),
+    }
+    PALETTES = [
+        (arcade.color.LIGHT_BLUE, arcade.color.BLUE),
+        (arcade.color.LIGHT_GREEN, arcade.color.DARK_GREEN),
+        (arcade.color.SALMON_PINK, arcade.color.DARK_RED),
+        (arcade.color.BEIGE, arcade.color.BROWN),
+    ]
+
+    def __init__(self, game, customer_type, textures=None, rng=None):
         self.game = game
         self.customer_type = customer_type
+        self.id = None
         self.center_x = -100
         self.center_y = 350
-        self.target_x = random.randint(100, 300)
-        self.speed = 0.5 + random.random() * 0.5
+        self.prev_x = self.center_x
+        rng = rng or game.rng.customers
+        self.target_x = rng.randint(100, 300)
+        # пикселей в секунду (раньше 0.5–1.0 пикселя за кадр при 60 FPS)
+        self.speed = 30 + rng.random() * 30
         self.state = "entering"
         self.wait_time = 0
         self.max_wait = self.calculate_max_wait()
@@ -32,35 +49,48 @@ class Customer:
         self._skin_color = arcade.color.BISQUE
         self._outline = arcade.color.BLACK
 
-        palettes = [
-            (arcade.color.LIGHT_BLUE, arcade.color.BLUE),
-            (arcade.color.LIGHT_GREEN, arcade.color.DARK_GREEN),
-            (arcade.color.SALMON_PINK, arcade.color.DARK_RED),
-            (arcade.color.BEIGE, arcade.color.BROWN),
-        ]
-        self._body_color, self._accent_color = random.choice(palettes)
+        self._body_color, self._accent_color = rng.choice(self.PALETTES)
+
+        self.sprite = None
+        self.indicator = None
+        self._sprite_mood = None
+        self._indicator_dy = 0
+        if game.rendering:
+            self.sprite = arcade.Sprite()
+            self.indicator = arcade.Sprite()
+            self.indicator.visible = False
+
+    @classmethod
+    def template(cls, game):
+        # Образец для запекания текстур: свой генератор, иначе запекание сдвигало бы
+        # игровой поток клиентов в зависимости от того, когда оно случилось.
+        return cls(game, "standard", rng=random.Random(0))
 
     def calculate_max_wait(self):
         base_wait = 45
         return base_wait
 
     def update(self, delta_time):
+        self.prev_x = self.center_x
         if self.state == "entering":
-            self.center_x += self.speed
+            self.center_x += self.speed * delta_time
             if self.center_x >= self.target_x:
                 self.center_x = self.target_x
                 self.state = "waiting"
                 self.wait_time = 0
 
         elif self.state == "leaving_happy" or self.state == "leaving_angry":
-            self.center_x -= self.speed * 1.5
+            self.center_x -= self.speed * 1.5 * delta_time
             if self.center_x < -100:
-                self.game.customer_manager.customers.remove(self)
+                self.game.customer_manager.remove_customer(self)
+                return
 
         elif self.state == "completed":
             self.state = "leaving_happy"
 
         self.update_mood()
+        if self.sprite is not None:
+            self.sync_sprite()
 
     def update_mood(self):
         if self.state in ("leaving_angry",):
@@ -73,25 +103,45 @@ class Customer:
 
         self.mood = "idle"
 
-    def draw(self):
-        x = self.center_x
-        y = self.center_y
-
-        tex = self._textures.get(self.mood)
-        if tex is not None:
-            dw, dh = get_texture_display_size(
-                tex, self.body_width, self.body_height, fit_inside=True
-            )
-            rect = arcade.types.XYWH(x, y, dw, dh)
-            arcade.draw_texture_rect(tex, rect)
-            head_y = y + self.body_height / 2 + 8
-            indicator_y = head_y + 12
-            if self.mood == "happy":
-                arcade.draw_text("❤", x, indicator_y, arcade.color.PINK, 14, anchor_x="center")
-            elif self.mood == "angry":
-                arcade.draw_text("!", x, indicator_y, arcade.color.RED, 18, anchor_x="center")
-            return
-
+    def sync_sprite(self):
+        if self._sprite_mood != self.mood:
+            self._sprite_mood = self.mood
+            tex = self._textures.get(self.mood)
+            if tex is not None:
+                self.sprite.texture = tex
+                self.sprite.size = get_texture_display_size(
+                    tex, self.body_width, self.body_height, fit_inside=True
+                )
+                self._indicator_dy = self.body_height / 2 + 20
+            else:
+                baked = self.baked_texture()
+                self.sprite.texture = baked
+                self.sprite.size = (baked.width, baked.height)
+                self._indicator_dy = self.body_height / 2 + self.head_radius * 2 + 2
+
+            indicator = _indicator_texture(self.mood)
+            if indicator is not None:
+                self.indicator.texture = indicator
+                self.indicator.size = (indicator.width, indicator.height)
+            self.indicator.visible = indicator is not None
+
+        self.place_sprite(self.center_x)
+
+    def place_sprite(self, x):
+        self.sprite.position = (x, self.center_y)
+        self.indicator.position = (x, self.center_y + self._indicator_dy)
+
+    def baked_texture(self, mood=None):
+        mood = mood or self.mood
+        key = (
+            "customer", self._body_color, self._accent_color, mood,
+            self.body_width, self.body_height, self.head_radius,
+        )
+        half_w = self.body_width / 2 + 20
+        half_h = self.body_height / 2 + self.head_radius * 2 + 10
+        return baked_textures.get(key, half_w, half_h, lambda: self.draw_procedural(0, 0, mood))
+
+    def draw_procedural(self, x, y, mood):
         arcade.draw_ellipse_filled(x, y - self.body_height / 2 - 8, self.body_width * 0.9, 12, (0, 0, 0, 80))
 
         leg_h = 28
@@ -123,21 +173,15 @@ class Customer:
         arcade.draw_circle_filled(x - eye_dx, eye_y, 2.2, self._outline)
         arcade.draw_circle_filled(x + eye_dx, eye_y, 2.2, self._outline)
 
-        if self.mood == "happy":
+        if mood == "happy":
             arcade.draw_arc_outline(x, head_y - 5, 16, 10, self._outline, 200, 340, 2)
-        elif self.mood == "angry":
+        elif mood == "angry":
             arcade.draw_arc_outline(x, head_y - 3, 16, 10, self._outline, 20, 160, 2)
             arcade.draw_line(x - 10, head_y + 8, x - 2, head_y + 6, self._outline, 2)
             arcade.draw_line(x + 10, head_y + 8, x + 2, head_y + 6, self._outline, 2)
         else:
             arcade.draw_line(x - 6, head_y - 6, x + 6, head_y - 6, self._outline, 2)
 
-        indicator_y = head_y + self.head_radius + 8
-        if self.mood == "happy":
-            arcade.draw_text("❤", x, indicator_y, arcade.color.PINK, 14, anchor_x="center")
-        elif self.mood == "angry":
-            arcade.draw_text("!", x, indicator_y, arcade.color.RED, 18, anchor_x="center")
-
     def on_order_complete(self, success):
         self.order_submitted = True
         if success:
@@ -148,11 +192,22 @@ class Customer:
             self.mood = "angry"
 
 
+def _indicator_texture(mood):
+    spec = Customer.INDICATORS.get(mood)
+    if spec is None:
+        return None
+    text, color, size = spec
+
+    def draw():
+        arcade.Text(text, 0, 0, color, size, anchor_x="center", anchor_y="center").draw()
+
+    return baked_textures.get(("indicator", mood), size, size, draw)
+
+
 def _load_customer_textures():
-    from utils import load_texture
     textures = {}
     for mood, path in Customer.TEXTURE_PATHS.items():
-        if os.path.exists(path):
+        if texture_exists(path):
             try:
                 textures[mood] = load_texture(path)
             except Exception:
@@ -164,38 +219,106 @@ class CustomerManager:
     def __init__(self, game):
         self.game = game
         self.customers = []
+        self.by_id = {}
+        self._ids = itertools.count(1)
         self.spawn_timer = 0
-        self._customer_textures = _load_customer_textures()
+        self._customer_textures = _load_customer_textures() if game.rendering else None
+        self.sprite_list = arcade.SpriteList()
+        self.indicator_list = arcade.SpriteList()
+
+    def bake_procedural_textures(self):
+        textures = self._customer_textures or {}
+        if all(mood in textures for mood in Customer.MOODS):
+            return
+        template = Customer.template(self.game)
+        for body_color, accent_color in Customer.PALETTES:
+            template._body_color, template._accent_color = body_color, accent_color
+            for mood in Customer.MOODS:
+                template.baked_texture(mood)
+
+    HIT_WIDTH = 100
+    HIT_HEIGHT = 200
 
     def setup_customers(self):
         self.customers = []
+        self.by_id = {}
         self.spawn_timer = 0
+        self.game.hit_grid.clear("customers")
+        self.sprite_list.clear()
+        self.indicator_list.clear()
 
     def update(self, delta_time):
+        grid = self.game.hit_grid
         for customer in self.customers[:]:
             customer.update(delta_time)
+            grid.move(customer, customer.center_x, customer.center_y)
 
-    def spawn_customer(self):
+    def spawn_customer(self, offset_x=0):
         customer_type = "standard"
         customer = Customer(self.game, customer_type, textures=self._customer_textures)
+        # offset_x — место у стойки, когда заказов несколько.
+        customer.target_x += offset_x
+        self.add_customer(customer)
+        sound_bank.play("order")
+        return customer
+
+    def place_customer(self, target_x, center_x, state):
+        # Клиент из сохранения: сразу на своём месте, без звука прихода.
+        customer = Customer(self.game, "standard", textures=self._customer_textures)
+        customer.target_x = target_x
+        customer.center_x = customer.prev_x = center_x
+        customer.state = state
+        self.add_customer(customer)
+        return customer
+
+    def add_customer(self, customer):
+        customer.id = next(self._ids)
         self.customers.append(customer)
-        arcade.play_sound(arcade.load_sound("sounds/order.wav"))
+        self.by_id[customer.id] = customer
+        self.register_hit_region(customer)
+        if customer.sprite is not None:
+            customer.sync_sprite()
+            self.sprite_list.append(customer.sprite)
+            self.indicator_list.append(customer.indicator)
+
+    def remove_customer(self, customer):
+        self.customers.remove(customer)
+        self.by_id.pop(customer.id, None)
+        self.game.hit_grid.remove(customer)
+        if customer.sprite is not None:
+            self.sprite_list.remove(customer.sprite)
+            self.indicator_list.remove(customer.indicator)
+
+    def interpolate(self, alpha):
+        for customer in self.customers:
+            if customer.sprite is not None and customer.prev_x != customer.center_x:
+                customer.place_sprite(customer.prev_x + (customer.center_x - customer.prev_x) * alpha)
 
     def draw(self):
-        for customer in self.customers:
-            customer.draw()
+        self.sprite_list.draw()
+        self.indicator_list.draw()
+
+    def register_hit_region(self, customer):
+        self.game.hit_grid.add(
+            customer, "customers", customer.center_x, customer.center_y,
+            self.HIT_WIDTH, self.HIT_HEIGHT, lambda: self.serve_customer(customer)
+        )
+
+    def serve_customer(self, customer):
+        if customer.state != "waiting" or customer.order_submitted:
+            return False
+        success = self.game.order_system.submit_order(self.game.food_manager.get_prepared_items(), customer)
+        customer.on_order_complete(success)
+        return True
 
     def check_customer_click(self, x, y):
-        for customer in self.customers:
-            if (abs(x - customer.center_x) < 50 and
-                    abs(y - customer.center_y) < 100 and
-                    customer.state == "waiting" and
-                    not customer.order_submitted):
-                success = self.game.order_system.submit_order(self.game.food_manager.get_prepared_items())
-                customer.on_order_complete(success)
-                return
+        return self.game.hit_grid.dispatch(x, y, ("customers",)) is not None
 
-    def remove_angry_customers(self):
-        for customer in self.customers[:]:
-            if customer.state == "waiting" and not customer.order_submitted:
-                customer.state = "leaving_angry"
\ No newline at end of file
+    def find(self, customer_id):
+        return self.by_id.get(customer_id)
+
+    def dismiss_customer(self, customer_id):
+        # Срок заказа вышел — уходит только его клиент, остальные ждут дальше.
+        customer = self.find(customer_id)
+        if customer is not None and customer.state in ("entering", "waiting") and not customer.order_submitted:
+            customer.state = "leaving_angry"
@@ -1,18 +1,23 @@
-import os
 import arcade
-from utils import load_texture, get_texture_display_size
-
-INGREDIENT_NAMES_RU = {
-    "burger_base": "Низ булки",
-    "burger_patty": "Котлета",
-    "burger_cheese": "Сыр",
-    "burger_top": "Верх булки",
-    "fries": "Картошка",
-    "icecream_default": "Мороженое ваниль",
-    "icecream_chocolate": "Мороженое шоколад",
-    "drink_cola": "Кола",
-    "drink_water": "Вода",
-}
+import pyglet
+from audio import sound_bank
+from content import content
+from labels import draw_text, draw_dynamic_text
+from recipes import recipes
+from render_cache import stacked_textures
+from utils import load_texture, texture_exists, get_texture_display_size
+
+INGREDIENT_NAMES_RU = content.ingredient_names
+
+
+def burger_layer_path(layer):
+    return f"images/burger_{layer}.png"
+
+
+def ingredient_label(name):
+    return INGREDIENT_NAMES_RU.get(name, name.replace("_", " ").title())
+
+
 class FoodItem:
     DEFAULT_DISPLAY_SIZE = 64
 
@@ -28,63 +33,117 @@ class FoodItem:
             self.height = max(1, int(self.height * scale))
         self.is_prepared = False
         self.preparation_time = 0
-        self.preparation_progress = 0
+        self._scheduler = None
+        self._timer = None
 
-    def start_preparing(self, time_required):
+    def start_preparing(self, time_required, scheduler, elapsed=0.0):
+        self.cancel_preparing()
         self.is_prepared = False
         self.preparation_time = time_required
-        self.preparation_progress = 0
+        self._scheduler = scheduler
+        self._timer = scheduler.call_later(time_required - elapsed, self.finish_preparing, f"food.{self.name}")
 
-    def update(self, delta_time):
-        if not self.is_prepared and self.preparation_time > 0:
-            self.preparation_progress += delta_time
-            if self.preparation_progress >= self.preparation_time:
-                self.is_prepared = True
-                arcade.play_sound(arcade.load_sound("sounds/cooking.wav"))
+    def finish_preparing(self):
+        self.is_prepared = True
+        sound_bank.play("cooking")
+
+    def cancel_preparing(self):
+        if self._scheduler is not None:
+            self._scheduler.cancel(self._timer)
+
+    @property
+    def preparation_progress(self):
+        if self.is_prepared:
+            return self.preparation_time
+        if self._timer is None:
+            return 0
+        return self.preparation_time - self._scheduler.remaining(self._timer)
 
     def draw(self):
-        bg_rect = arcade.types.XYWH(self.center_x, self.center_y, self.width + 20, self.height + 20)
+        self.draw_at(self.center_x, self.center_y)
+
+    def draw_at(self, x, y):
+        bg_rect = arcade.types.XYWH(x, y, self.width + 20, self.height + 20)
         arcade.draw_rect_filled(bg_rect, arcade.color.LIGHT_BLUE)
         arcade.draw_rect_outline(bg_rect, arcade.color.DARK_BLUE, 3)
         
-        rect = arcade.types.XYWH(self.center_x, self.center_y, self.width, self.height)
+        rect = arcade.types.XYWH(x, y, self.width, self.height)
         arcade.draw_texture_rect(self.texture, rect)
         
-        label = INGREDIENT_NAMES_RU.get(self.name, self.name.replace("_", " ").title())
-        arcade.draw_text(
-            label,
-            self.center_x, self.center_y - self.height / 2 - 20,
+        draw_text(
+            ingredient_label(self.name),
+            x, y - self.height / 2 - 20,
             arcade.color.DARK_BLUE, 14, anchor_x="center", anchor_y="top", bold=True
         )
         
         if not self.is_prepared and self.preparation_time > 0:
             progress = self.preparation_progress / self.preparation_time
             width = self.width * progress
-            bar_x = self.center_x - self.width / 2 + width / 2
-            bar_y = self.center_y - self.height / 2 - 30
+            bar_x = x - self.width / 2 + width / 2
+            bar_y = y - self.height / 2 - 30
             filled_rect = arcade.types.XYWH(bar_x, bar_y, width, 8)
-            outline_rect = arcade.types.XYWH(self.center_x, bar_y, self.width, 8)
+            outline_rect = arcade.types.XYWH(x, bar_y, self.width, 8)
             arcade.draw_rect_filled(filled_rect, arcade.color.GREEN)
             arcade.draw_rect_outline(outline_rect, arcade.color.BLACK)
+
+
+# Заранее расставленные плитки одного экрана: подложки и иконки в SpriteList,
+# подписи в одном pyglet-батче. Переключение экрана — выбор другого макета.
+class IngredientLayout:
+    def __init__(self):
+        self.panels = arcade.SpriteList()
+        self.icons = arcade.SpriteList()
+        self.batch = pyglet.graphics.Batch()
+        self._labels = []
+
+    def add_panel(self, x, y, width, height, fill, outline=None, border=0):
+        self.panels.append(arcade.SpriteSolidColor(width, height, x, y, fill))
+        if outline is not None and border:
+            # Рамка поверх заливки, четырьмя полосами по краям (как draw_rect_outline),
+            # чтобы полупрозрачная заливка просвечивала фон, а не цвет рамки.
+            half_w, half_h = width / 2, height / 2
+            for w, h, ex, ey in (
+                (width + border, border, x, y + half_h),
+                (width + border, border, x, y - half_h),
+                (border, height - border, x - half_w, y),
+                (border, height - border, x + half_w, y),
+            ):
+                self.panels.append(arcade.SpriteSolidColor(w, h, ex, ey, outline))
+
+    def add_text(self, text, x, y, color, font_size, anchor_x="left", anchor_y="baseline", bold=False):
+        self._labels.append(arcade.Text(
+            text, x, y, color, font_size,
+            anchor_x=anchor_x, anchor_y=anchor_y, bold=bold, batch=self.batch
+        ))
+
+    def add_item(self, item, x, y):
+        self.add_panel(x, y, item.width + 20, item.height + 20, arcade.color.LIGHT_BLUE, arcade.color.DARK_BLUE, 3)
+        icon = arcade.Sprite(item.texture, center_x=x, center_y=y)
+        icon.size = (item.width, item.height)
+        self.icons.append(icon)
+        self.add_text(
+            ingredient_label(item.name), x, y - item.height / 2 - 20,
+            arcade.color.DARK_BLUE, 14, anchor_x="center", anchor_y="top", bold=True
+        )
+
+    def draw(self):
+        self.panels.draw()
+        self.icons.draw()
+        self.batch.draw()
+
+
 class FoodManager:
-    COOKING_VIEW_POSITIONS = [
-        ("burger_base", (120, 520)),
-        ("burger_patty", (240, 520)),
-        ("burger_cheese", (360, 520)),
-        ("burger_top", (480, 520)),
-        ("fries", (120, 400)),
-        ("icecream_default", (240, 400)),
-        ("icecream_chocolate", (360, 400)),
-        ("drink_cola", (480, 400)),
-        ("drink_water", (600, 400)),
-    ]
+    # Раскладка кухни — content/kitchen.json.
+    COOKING_VIEW_POSITIONS = content.cooking_view_positions
     INGREDIENT_CLICK_RADIUS = 50
 
-    EQUIPMENT_AREAS = [
-        (400, 280, 140, 140, "grill"),
-        (560, 280, 140, 140, "fryer"),
-        (720, 280, 140, 140, "ice_cream_machine"),
-        (880, 280, 140, 140, "soda_tap"),
+    EQUIPMENT_AREAS = content.equipment_areas
+    EQUIPMENT_LABELS = content.equipment_labels
+    COOKING_ZONE_Y = 280
+    COOKING_ZONES = [
+        (560, (100, 100, 100, 220), arcade.color.ORANGE),
+        (720, (200, 200, 255, 200), arcade.color.BLUE),
+        (880, (200, 255, 200, 200), arcade.color.GREEN),
     ]
     PREPARED_PANEL_CX = 1200
     PREPARED_PANEL_TOP = 520
@@ -101,28 +160,45 @@ class FoodManager:
         self.icecream = None
         self.drink = None
         self.equipped_items = {}
+        self.layouts = {}
         self.setup_inventory()
+        self.register_hit_regions()
 
     def setup_inventory(self):
-        ingredients = [
-            ("burger_base", "images/burger_base.png", (70, 140)),
-            ("burger_patty", "images/burger_patty.png", (140, 140)),
-            ("burger_cheese", "images/burger_cheese.png", (210, 140)),
-            ("burger_top", "images/burger_top.png", (280, 140)),
-            ("fries", "images/fries_raw.png", (70, 80)),
-            ("icecream_default", "images/icecream_default.png", (140, 80)),
-            ("icecream_chocolate", "images/icecream_default.png", (210, 80)),
-            ("drink_cola", "images/cup_cola.png", (280, 80)),
-            ("drink_water", "images/cup_cola.png", (350, 80)),
-        ]
-
-        for name, path, position in ingredients:
+        for name, path, position in content.inventory:
             item = FoodItem(name, path, position, 0.6)
             item.center_x = position[0]
             item.center_y = position[1]
             self.inventory[name] = item
+        if self.game.rendering:
+            self.build_layouts()
+
+    def build_layouts(self):
+        main = IngredientLayout()
+        main.add_panel(200, 110, 360, 90, (200, 200, 200, 240), arcade.color.BLACK, 3)
+        main.add_text(
+            "ИНГРЕДИЕНТЫ (нажмите для использования)", 200, 180,
+            arcade.color.BLACK, 15, anchor_x="center", bold=True
+        )
+        for item in self.inventory.values():
+            main.add_item(item, item.center_x, item.center_y)
+        for x, y, label in self.EQUIPMENT_LABELS:
+            main.add_panel(x, y, 110, 35, (0, 0, 0, 200), arcade.color.YELLOW, 2)
+            for i, line in enumerate(label.split("\n")):
+                main.add_text(line, x, y + 10 - i * 15, arcade.color.YELLOW, 13, anchor_x="center", bold=True)
+
+        cooking = IngredientLayout()
+        cooking.add_panel(380, 460, 520, 160, (200, 200, 200, 250), arcade.color.BLACK, 3)
+        cooking.add_text("ИНГРЕДИЕНТЫ", 380, 540, arcade.color.BLACK, 20, anchor_x="center", bold=True)
+        cooking.add_text("(нажмите для использования)", 380, 515, arcade.color.DARK_GRAY, 14, anchor_x="center")
+        for name, (x, y) in self.COOKING_VIEW_POSITIONS:
+            if name in self.inventory:
+                cooking.add_item(self.inventory[name], x, y)
+
+        self.layouts = {"main": main, "cooking": cooking}
 
     def reset_inventory(self):
+        self.fries.cancel_preparing()
         self.burger_assembly = []
         self.fries = FoodItem("fries", "images/fries_raw.png", (540, 400))
         self.icecream = None
@@ -141,8 +217,9 @@ class FoodManager:
             self.selected_ingredient = "drink_cola"
 
     def start_cooking_fries(self):
+        self.fries.cancel_preparing()
         self.fries = FoodItem("fries", "images/fries_raw.png", (540, 400))
-        self.fries.start_preparing(3.0)
+        self.fries.start_preparing(3.0, self.game.scheduler)
         self.game.show_cooking_frame = True
 
     def add_burger_ingredient(self, ingredient):
@@ -164,104 +241,100 @@ class FoodManager:
         self.drink = FoodItem(drink_type, "images/cup_cola.png", (860, 400))
         self.drink.is_prepared = True
 
-    def check_prepared_panel_click(self, x, y):
-        lst = self.get_prepared_list()
-        if not lst:
-            return False
+    PREPARED_MAX_ROWS = 4
+    HIT_Z_PREPARED = 20
+    HIT_Z_INGREDIENTS = 10
+
+    def register_hit_regions(self):
+        # Кухня статична: плитки, оборудование и слоты кнопок [X] регистрируются
+        # один раз, пустой слот просто пропускает клик.
+        grid = self.game.hit_grid
+        grid.clear("kitchen")
         cx, top, width, row_h, rh = (
             self.PREPARED_PANEL_CX, self.PREPARED_PANEL_TOP, self.PREPARED_PANEL_WIDTH,
             self.PREPARED_ROW_HEIGHT, self.PREPARED_REMOVE_BUTTON_HALF
         )
         remove_center_x = cx + width // 2 - rh - 8
-        for i, (key, _) in enumerate(lst):
-            row_y = top - 70 - i * row_h
-            if (remove_center_x - rh <= x <= remove_center_x + rh and
-                    row_y - rh <= y <= row_y + rh):
-                self.remove_from_prepared(key)
-                return True
-        return False
+        for i in range(self.PREPARED_MAX_ROWS):
+            grid.add(
+                ("prepared", i), "kitchen", remove_center_x, top - 70 - i * row_h, rh * 2, rh * 2,
+                lambda i=i: self.remove_prepared_row(i), z=self.HIT_Z_PREPARED
+            )
+        r = self.INGREDIENT_CLICK_RADIUS
+        for name, (x, y) in self.COOKING_VIEW_POSITIONS:
+            grid.add(
+                ("ingredient", name), "kitchen", x, y, r * 2, r * 2,
+                lambda name=name: self.use_ingredient(name), z=self.HIT_Z_INGREDIENTS
+            )
+        for x, y, w, h, aid in self.EQUIPMENT_AREAS:
+            grid.add(("equipment", aid), "kitchen", x, y, w, h, lambda aid=aid: self.use_equipment(aid))
+
+    def remove_prepared_row(self, index):
+        lst = self.get_prepared_list()
+        if index >= len(lst):
+            return False
+        self.remove_from_prepared(lst[index][0])
 
     def _draw_complete_burger(self, center_x, center_y, size=70, assembly=None):
         complete_path = "images/burger_complete.png"
-        if os.path.exists(complete_path):
+        if texture_exists(complete_path):
             tex = load_texture(complete_path)
             rect = arcade.types.XYWH(center_x, center_y, size, size)
             arcade.draw_texture_rect(tex, rect)
             return
         layers = assembly if assembly is not None else ["base", "patty", "cheese", "top"]
-        y_off = size * 0.12
-        for i, layer in enumerate(layers):
-            path = "images/burger_base.png" if layer == "base" else "images/burger_top.png" if layer == "top" else f"images/burger_{layer}.png"
-            tex = load_texture(path)
-            y = center_y - i * y_off
-            rect = arcade.types.XYWH(center_x, y, size, size)
-            arcade.draw_texture_rect(tex, rect)
+        self._draw_burger_stack(layers, center_x, center_y, size, size * 0.12)
+
+    def _draw_burger_stack(self, layers, center_x, top_y, size, step):
+        stacked_textures.draw([burger_layer_path(layer) for layer in layers], center_x, top_y, size, step)
 
     def check_equipment_click(self, x, y):
-        if self.check_prepared_panel_click(x, y):
-            return
-        r = self.INGREDIENT_CLICK_RADIUS
-        for name, (cx, cy) in self.COOKING_VIEW_POSITIONS:
-            if name not in self.inventory:
-                continue
-            if abs(x - cx) <= r and abs(y - cy) <= r:
-                item = self.inventory[name]
-                if "burger" in item.name:
-                    self.add_burger_ingredient(item.name)
-                elif "fries" in item.name:
-                    self.start_cooking_fries()
-                elif "icecream" in item.name:
-                    flavor = "chocolate" if "chocolate" in item.name else "default"
-                    self.prepare_icecream(flavor)
-                elif "drink" in item.name:
-                    drink_type = "water" if "water" in item.name else "cola"
-                    self.prepare_drink(drink_type)
-                return
-
-        for area in self.EQUIPMENT_AREAS:
-            ax, ay, aw, ah, aid = area
-            if (ax - aw / 2 <= x <= ax + aw / 2 and
-                    ay - ah / 2 <= y <= ay + ah / 2):
-                if aid == "grill" and self.burger_assembly:
-                    self.equipped_items["burger"] = self.burger_assembly.copy()
-                    self.burger_assembly = []
-                elif aid == "fryer":
-                    if self.fries.is_prepared:
-                        self.equipped_items["fries"] = "cooked"
-                        self.fries = FoodItem("fries", "images/fries_raw.png", (540, 400))
-                    elif self.fries.preparation_time == 0:
-                        self.start_cooking_fries()
-                elif aid == "ice_cream_machine":
-                    self.prepare_icecream("default")
-                elif aid == "soda_tap":
-                    self.prepare_drink("cola")
-                return
+        return self.game.hit_grid.dispatch(x, y, ("kitchen",)) is not None
+
+    def use_ingredient(self, name):
+        if name not in self.inventory:
+            return False
+        item = self.inventory[name]
+        if "burger" in item.name:
+            self.add_burger_ingredient(item.name)
+        elif "fries" in item.name:
+            self.start_cooking_fries()
+        elif "icecream" in item.name:
+            flavor = "chocolate" if "chocolate" in item.name else "default"
+            self.prepare_icecream(flavor)
+        elif "drink" in item.name:
+            drink_type = "water" if "water" in item.name else "cola"
+            self.prepare_drink(drink_type)
+
+    def use_equipment(self, aid):
+        if aid == "grill" and self.burger_assembly:
+            self.equipped_items["burger"] = self.burger_assembly.copy()
+            self.burger_assembly = []
+        elif aid == "fryer":
+            if self.fries.is_prepared:
+                self.equipped_items["fries"] = "cooked"
+                self.fries = FoodItem("fries", "images/fries_raw.png", (540, 400))
+            elif self.fries.preparation_time == 0:
+                self.start_cooking_fries()
+        elif aid == "ice_cream_machine":
+            self.prepare_icecream("default")
+        elif aid == "soda_tap":
+            self.prepare_drink("cola")
 
     def get_prepared_items(self):
         items = {}
         if "burger" in self.equipped_items:
-            items["burger"] = self.equipped_items["burger"]
+            items["burger"] = recipes.item("burger", self.equipped_items["burger"])
         if "fries" in self.equipped_items:
-            items["fries"] = True
+            items["fries"] = recipes.item("fries", "fries")
         if self.icecream and self.icecream.is_prepared:
-            items["icecream"] = self.icecream.name
+            items["icecream"] = recipes.item("icecream", self.icecream.name)
         if self.drink and self.drink.is_prepared:
-            items["drink"] = self.drink.name
+            items["drink"] = recipes.item("drink", self.drink.name)
         return items
 
     def get_prepared_list(self):
-        result = []
-        if "burger" in self.equipped_items:
-            result.append(("burger", "Бургер"))
-        if "fries" in self.equipped_items:
-            result.append(("fries", "Картошка"))
-        if self.icecream and self.icecream.is_prepared:
-            ice_label = "Мороженое шоколад" if self.icecream.name == "chocolate" else "Мороженое ваниль"
-            result.append(("icecream", ice_label))
-        if self.drink and self.drink.is_prepared:
-            drink_label = "Вода" if self.drink.name == "water" else "Кола"
-            result.append(("drink", drink_label))
-        return result
+        return [(category, item.tray_label) for category, item in self.get_prepared_items().items()]
 
     def remove_from_prepared(self, key):
         if key == "burger" and "burger" in self.equipped_items:
@@ -277,46 +350,8 @@ class FoodManager:
         a = self.burger_assembly
         return len(a) >= 2 and a[0] == "base" and a[-1] == "top"
 
-    def update(self, delta_time):
-        self.fries.update(delta_time)
-        if self.icecream:
-            self.icecream.update(delta_time)
-        if self.drink:
-            self.drink.update(delta_time)
-
     def draw(self):
-        inventory_bg = arcade.types.XYWH(200, 110, 360, 90)
-        arcade.draw_rect_filled(inventory_bg, (200, 200, 200, 240))
-        arcade.draw_rect_outline(inventory_bg, arcade.color.BLACK, 3)
-        
-        arcade.draw_text(
-            "ИНГРЕДИЕНТЫ (нажмите для использования)",
-            200, 180,
-            arcade.color.BLACK, 15, anchor_x="center", bold=True
-        )
-        
-        for item in self.inventory.values():
-            item.draw()
-
-        equipment_labels = [
-            (400, 200, "ГРИЛЬ\n(Бургер)"),
-            (560, 200, "ФРИТЮР\n(Картошка)"),
-            (720, 200, "МОРОЖЕНОЕ"),
-            (880, 200, "НАПИТКИ")
-        ]
-        for x, y, label in equipment_labels:
-            text_bg = arcade.types.XYWH(x, y, 110, 35)
-            arcade.draw_rect_filled(text_bg, (0, 0, 0, 200))
-            arcade.draw_rect_outline(text_bg, arcade.color.YELLOW, 2)
-            
-            lines = label.split('\n')
-            for i, line in enumerate(lines):
-                arcade.draw_text(
-                    line,
-                    x, y + 10 - i * 15,
-                    arcade.color.YELLOW, 13, anchor_x="center",
-                    bold=True
-                )
+        self.layouts["main"].draw()
 
         self.fries.draw()
         if self.icecream:
@@ -329,7 +364,7 @@ class FoodManager:
             arcade.draw_rect_filled(assembly_bg, (255, 255, 200, 200))
             arcade.draw_rect_outline(assembly_bg, arcade.color.BROWN, 2)
             
-            arcade.draw_text(
+            draw_text(
                 "БУРГЕР:",
                 400, 630,
                 arcade.color.BLACK, 14, anchor_x="center", bold=True
@@ -337,106 +372,53 @@ class FoodManager:
             if self._is_burger_complete():
                 self._draw_complete_burger(400, 550, 70)
             else:
-                y_pos = 600
-                for ingredient in self.burger_assembly:
-                    texture_path = f"images/burger_{ingredient}.png"
-                    if ingredient == "base":
-                        texture_path = "images/burger_base.png"
-                    elif ingredient == "top":
-                        texture_path = "images/burger_top.png"
-                    texture = load_texture(texture_path)
-                    rect = arcade.types.XYWH(400, y_pos, 60, 60)
-                    arcade.draw_texture_rect(texture, rect)
-                    y_pos -= 30
+                self._draw_burger_stack(self.burger_assembly, 400, 600, 60, 30)
+
+    def draw_cooking_static(self):
+        self.layouts["cooking"].draw()
+        zone_y = self.COOKING_ZONE_Y
+        for x, fill, outline in self.COOKING_ZONES:
+            zone_bg = arcade.types.XYWH(x, zone_y - 20, 140, 100)
+            arcade.draw_rect_filled(zone_bg, fill)
+            arcade.draw_rect_outline(zone_bg, outline, 2)
 
     def draw_cooking_view(self):
-        inventory_bg = arcade.types.XYWH(380, 460, 520, 160)
-        arcade.draw_rect_filled(inventory_bg, (200, 200, 200, 250))
-        arcade.draw_rect_outline(inventory_bg, arcade.color.BLACK, 3)
-        
-        arcade.draw_text(
-            "ИНГРЕДИЕНТЫ",
-            380, 540,
-            arcade.color.BLACK, 20, anchor_x="center", bold=True
-        )
-        arcade.draw_text(
-            "(нажмите для использования)",
-            380, 515,
-            arcade.color.DARK_GRAY, 14, anchor_x="center"
-        )
-        
-        for name, pos in self.COOKING_VIEW_POSITIONS:
-            if name in self.inventory:
-                item = self.inventory[name]
-                orig_x, orig_y = item.center_x, item.center_y
-                item.center_x, item.center_y = pos
-                item.draw()
-                item.center_x, item.center_y = orig_x, orig_y
-
-        fryer_x, ice_x, drink_x = 560, 720, 880
-        zone_y, zone_h = 280, 80
-
-        fries_bg = arcade.types.XYWH(fryer_x, zone_y - 20, 140, 100)
-        arcade.draw_rect_filled(fries_bg, (100, 100, 100, 220))
-        arcade.draw_rect_outline(fries_bg, arcade.color.ORANGE, 2)
-        orig_fries_x, orig_fries_y = self.fries.center_x, self.fries.center_y
-        self.fries.center_x, self.fries.center_y = fryer_x, zone_y
-        self.fries.draw()
-        self.fries.center_x, self.fries.center_y = orig_fries_x, orig_fries_y
+        fryer_x, ice_x, drink_x = (x for x, _, _ in self.COOKING_ZONES)
+        zone_y = self.COOKING_ZONE_Y
+
+        self.fries.draw_at(fryer_x, zone_y)
         if self.fries.preparation_time > 0:
             progress = min(1.0, self.fries.preparation_progress / self.fries.preparation_time)
-            arcade.draw_text(f"Картошка: {int(progress * 100)}%", fryer_x, zone_y - 60, arcade.color.YELLOW, 16, anchor_x="center", bold=True)
+            draw_dynamic_text("cooking.fries_progress", f"Картошка: {int(progress * 100)}%", fryer_x, zone_y - 60, arcade.color.YELLOW, 16, anchor_x="center", bold=True)
         elif self.fries.is_prepared:
-            arcade.draw_text("Картошка: готово!", fryer_x, zone_y - 60, arcade.color.GREEN, 16, anchor_x="center", bold=True)
+            draw_text("Картошка: готово!", fryer_x, zone_y - 60, arcade.color.GREEN, 16, anchor_x="center", bold=True)
         else:
-            arcade.draw_text("Нажмите фритюр для старта", fryer_x, zone_y - 60, arcade.color.WHITE, 14, anchor_x="center")
+            draw_text("Нажмите фритюр для старта", fryer_x, zone_y - 60, arcade.color.WHITE, 14, anchor_x="center")
 
-        icecream_bg = arcade.types.XYWH(ice_x, zone_y - 20, 140, 100)
-        arcade.draw_rect_filled(icecream_bg, (200, 200, 255, 200))
-        arcade.draw_rect_outline(icecream_bg, arcade.color.BLUE, 2)
         if self.icecream:
-            orig_ice_x, orig_ice_y = self.icecream.center_x, self.icecream.center_y
-            self.icecream.center_x, self.icecream.center_y = ice_x, zone_y
-            self.icecream.draw()
-            self.icecream.center_x, self.icecream.center_y = orig_ice_x, orig_ice_y
-            arcade.draw_text("Готово", ice_x, zone_y - 60, arcade.color.GREEN, 14, anchor_x="center", bold=True)
+            self.icecream.draw_at(ice_x, zone_y)
+            draw_text("Готово", ice_x, zone_y - 60, arcade.color.GREEN, 14, anchor_x="center", bold=True)
         else:
-            arcade.draw_text("Нажмите мороженое", ice_x, zone_y - 30, arcade.color.BLUE, 14, anchor_x="center")
-            arcade.draw_text("для приготовления", ice_x, zone_y - 48, arcade.color.BLUE, 12, anchor_x="center")
+            draw_text("Нажмите мороженое", ice_x, zone_y - 30, arcade.color.BLUE, 14, anchor_x="center")
+            draw_text("для приготовления", ice_x, zone_y - 48, arcade.color.BLUE, 12, anchor_x="center")
 
-        drink_bg = arcade.types.XYWH(drink_x, zone_y - 20, 140, 100)
-        arcade.draw_rect_filled(drink_bg, (200, 255, 200, 200))
-        arcade.draw_rect_outline(drink_bg, arcade.color.GREEN, 2)
         if self.drink:
-            orig_drink_x, orig_drink_y = self.drink.center_x, self.drink.center_y
-            self.drink.center_x, self.drink.center_y = drink_x, zone_y
-            self.drink.draw()
-            self.drink.center_x, self.drink.center_y = orig_drink_x, orig_drink_y
-            arcade.draw_text("Готово", drink_x, zone_y - 60, arcade.color.GREEN, 14, anchor_x="center", bold=True)
+            self.drink.draw_at(drink_x, zone_y)
+            draw_text("Готово", drink_x, zone_y - 60, arcade.color.GREEN, 14, anchor_x="center", bold=True)
         else:
-            arcade.draw_text("Нажмите напиток", drink_x, zone_y - 30, arcade.color.GREEN, 14, anchor_x="center")
-            arcade.draw_text("для приготовления", drink_x, zone_y - 48, arcade.color.GREEN, 12, anchor_x="center")
+            draw_text("Нажмите напиток", drink_x, zone_y - 30, arcade.color.GREEN, 14, anchor_x="center")
+            draw_text("для приготовления", drink_x, zone_y - 48, arcade.color.GREEN, 12, anchor_x="center")
 
         grill_x = 400
         if self.burger_assembly:
             assembly_bg = arcade.types.XYWH(grill_x, 580, 150, 150)
             arcade.draw_rect_filled(assembly_bg, (255, 255, 200, 220))
             arcade.draw_rect_outline(assembly_bg, arcade.color.BROWN, 3)
-            arcade.draw_text("СБОРКА БУРГЕРА:", grill_x, 640, arcade.color.BLACK, 16, anchor_x="center", bold=True)
+            draw_text("СБОРКА БУРГЕРА:", grill_x, 640, arcade.color.BLACK, 16, anchor_x="center", bold=True)
             if self._is_burger_complete():
                 self._draw_complete_burger(grill_x, 560, 80)
             else:
-                y_pos = 610
-                for ingredient in self.burger_assembly:
-                    texture_path = f"images/burger_{ingredient}.png"
-                    if ingredient == "base":
-                        texture_path = "images/burger_base.png"
-                    elif ingredient == "top":
-                        texture_path = "images/burger_top.png"
-                    texture = load_texture(texture_path)
-                    rect = arcade.types.XYWH(grill_x, y_pos, 70, 70)
-                    arcade.draw_texture_rect(texture, rect)
-                    y_pos -= 35
+                self._draw_burger_stack(self.burger_assembly, grill_x, 610, 70, 35)
 
         cx, top, width, row_h = self.PREPARED_PANEL_CX, self.PREPARED_PANEL_TOP, self.PREPARED_PANEL_WIDTH, self.PREPARED_ROW_HEIGHT
         lst = self.get_prepared_list()
@@ -444,31 +426,25 @@ class FoodManager:
         panel_rect = arcade.types.XYWH(cx, top - panel_h // 2, width, panel_h)
         arcade.draw_rect_filled(panel_rect, (60, 80, 60, 240))
         arcade.draw_rect_outline(panel_rect, arcade.color.GREEN, 2)
-        arcade.draw_text("ГОТОВО К ПОДАЧЕ", cx, top - 28, arcade.color.WHITE, 18, anchor_x="center", bold=True)
-        arcade.draw_text("(нажмите [X] чтобы убрать)", cx, top - 50, arcade.color.LIGHT_GRAY, 12, anchor_x="center")
+        draw_text("ГОТОВО К ПОДАЧЕ", cx, top - 28, arcade.color.WHITE, 18, anchor_x="center", bold=True)
+        draw_text("(нажмите [X] чтобы убрать)", cx, top - 50, arcade.color.LIGHT_GRAY, 12, anchor_x="center")
         remove_cx = cx + width // 2 - self.PREPARED_REMOVE_BUTTON_HALF - 8
         rh = self.PREPARED_REMOVE_BUTTON_HALF
         for i, (key, label) in enumerate(lst):
             row_y = top - 70 - i * row_h
-            arcade.draw_text(label, cx - width // 2 + 40, row_y, arcade.color.WHITE, 16, anchor_x="left", anchor_y="center")
+            draw_text(label, cx - width // 2 + 40, row_y, arcade.color.WHITE, 16, anchor_x="left", anchor_y="center")
             if key == "burger":
                 self._draw_complete_burger(cx - width // 2 + 25, row_y, 36, assembly=self.equipped_items.get("burger"))
             elif key == "fries":
                 tex = load_texture("images/fries_raw.png")
                 arcade.draw_texture_rect(tex, arcade.types.XYWH(cx - width // 2 + 25, row_y, 36, 36))
             elif key == "icecream" and self.icecream:
-                orig_x, orig_y = self.icecream.center_x, self.icecream.center_y
-                self.icecream.center_x, self.icecream.center_y = cx - width // 2 + 25, row_y
-                r2 = arcade.types.XYWH(self.icecream.center_x, self.icecream.center_y, 32, 32)
+                r2 = arcade.types.XYWH(cx - width // 2 + 25, row_y, 32, 32)
                 arcade.draw_texture_rect(self.icecream.texture, r2)
-                self.icecream.center_x, self.icecream.center_y = orig_x, orig_y
             elif key == "drink" and self.drink:
-                orig_x, orig_y = self.drink.center_x, self.drink.center_y
-                self.drink.center_x, self.drink.center_y = cx - width // 2 + 25, row_y
-                r2 = arcade.types.XYWH(self.drink.center_x, self.drink.center_y, 32, 32)
+                r2 = arcade.types.XYWH(cx - width // 2 + 25, row_y, 32, 32)
                 arcade.draw_texture_rect(self.drink.texture, r2)
-                self.drink.center_x, self.drink.center_y = orig_x, orig_y
             remove_rect = arcade.types.XYWH(remove_cx, row_y, rh * 2, rh * 2)
             arcade.draw_rect_filled(remove_rect, arcade.color.DARK_RED)
             arcade.draw_rect_outline(remove_rect, arcade.color.WHITE, 2)
-            arcade.draw_text("X", remove_cx, row_y, arcade.color.WHITE, 14, anchor_x="center", anchor_y="center", bold=True)
\ No newline at end of file
+            draw_text("X", remove_cx, row_y, arcade.color.WHITE, 14, anchor_x="center", anchor_y="center", bold=True)
\ No newline at end of file
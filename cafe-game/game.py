@@ -1,50 +1,130 @@
+import time
+from collections import deque
+
 import arcade
-import os
-from levels import LevelManager
-from customer import CustomerManager
-from food import FoodManager
+from assets import TEXTURE_MANIFEST
+from atlas import atlas_manifest
+from audio import sound_bank
+from labels import draw_text, draw_dynamic_text
+from loader import AssetLoader
+from perf_overlay import PerfOverlay
 from ui import UIManager
-from order_system import OrderSystem, Order
-from utils import load_texture, get_texture_display_size
+from render_cache import render_to_texture, release_texture
+from replay import InputRecorder, InputReplayer
+from save import AutoSaver, load_snapshot
+from simulation import SimulationRules
+from startup_trace import startup_trace
+from utils import load_texture, texture_exists, get_texture_display_size
 from chef import Chef
 
 
-class FastFoodGame(arcade.Window):
-    def __init__(self, width, height, title):
-        super().__init__(width, height, title)
+class FastFoodGame(SimulationRules, arcade.Window):
+    # Без этих текстур меню не показать; остальное догружается, пока открыто меню.
+    MENU_TEXTURES = ("images/main_menu_bg.png",)
+    # Секунды игры между автосохранениями; ещё сохраняемся на паузе, в начале уровня и при выходе.
+    AUTOSAVE_INTERVAL = 15.0
+
+    def __init__(self, width, height, title, launch_time=None):
+        self.launch_time = launch_time if launch_time is not None else time.perf_counter()
+        with startup_trace.span("arcade.Window"):
+            super().__init__(width, height, title)
         arcade.set_background_color(arcade.color.DARK_BLUE_GRAY)
-        self.game_state = "MENU"
-        self.show_cooking_frame = False
-        self.level_complete_timer = 0.0
-        self.current_level = 1
-        self.money = 500
-        self.score = 0
-        self.level_manager = None
-        self.customer_manager = None
-        self.food_manager = None
-        self.ui_manager = None
-        self.order_system = None
+        self.init_simulation_state()
+        self.game_state = "LOADING"
+        self.sim_accumulator = 0.0
+        self.sim_alpha = 0.0
         self.background = None
         self.chef = None
         self.equipment_sprites = None
-        self.setup_managers()
-
-    def setup_managers(self):
-        self.level_manager = LevelManager(self)
-        self.customer_manager = CustomerManager(self)
-        self.food_manager = FoodManager(self)
-        self.ui_manager = UIManager(self)
-        self.order_system = OrderSystem(self)
+        self._kitchen_layer = None
+        self._kitchen_layer_key = None
+        self.loader = None
+        self.start_requested = False
+        self.first_frame_ms = None
+        self.menu_ready_ms = None
+        # None — ресурсы ещё грузятся; дальше — очередь шагов прогрева (warmup_steps).
+        self._warmup = None
+        self.autosaver = AutoSaver()
+        self.autosave_timer = 0.0
+        self.save_available = self.autosaver.exists()
+        self.record_path = None
+        self.recorder = None
+        self.replay_log = None
+        self.replayer = None
+        with startup_trace.span("UIManager"):
+            self.ui_manager = UIManager(self)
+        self.perf_overlay = PerfOverlay(self)
 
     def setup(self):
-        self.background = load_texture("images/main_menu_bg.png")
+        # Ресурсы грузятся в фоне (loader.py). Игровые менеджеры меню не нужны:
+        # они собираются по шагу за кадр, пока открыто меню, или сразу в start_game.
+        textures = list(self.MENU_TEXTURES) + [p for p in TEXTURE_MANIFEST if p not in self.MENU_TEXTURES]
+        self.loader = AssetLoader(self.ctx.default_atlas)
+        self.loader.start(textures, sound_bank.names())
+
+    def update_loading(self):
+        loader = self.loader
+        if loader is None:
+            return
+        if self._warmup is None:
+            loader.pump()
+            if self.background is None and loader.ready(self.MENU_TEXTURES):
+                self.background = load_texture("images/main_menu_bg.png")
+                if not self.start_requested:
+                    self.game_state = "MENU"
+            if loader.done:
+                self.on_assets_loaded()
+        elif self._warmup and self.game_state == "MENU":
+            self.warm_up()
+
+    def on_assets_loaded(self):
+        loader = self.loader
+        startup_trace.mark("assets loaded")
+        print(
+            f"assets: {loader.total} files in {loader.elapsed_ms:.0f} ms "
+            f"({loader.workers} threads, {loader.failed} failed)"
+        )
+        # Все спрайты уже вырезаны из страниц атласа — страницы больше не нужны.
+        atlas_manifest.release_pages()
+        self._warmup = deque(self.warmup_steps())
+        if self.start_requested or self.replay_log is not None:
+            self.start_requested = False
+            self.start_game()
+
+    def warmup_steps(self):
+        steps = [
+            (name, lambda name=name, factory=factory: setattr(self, name, factory()))
+            for name, factory in self.manager_factories()
+        ]
+        steps += [
+            ("chef", self.setup_chef),
+            ("procedural textures", lambda: self.customer_manager.bake_procedural_textures()),
+            ("equipment", self.setup_equipment),
+        ]
+        return steps
+
+    def warm_up(self, finish=False):
+        # В меню — один шаг за кадр, из start_game — всё, что осталось.
+        while self._warmup:
+            name, step = self._warmup.popleft()
+            with startup_trace.span(name):
+                step()
+            if not finish:
+                break
+        if not self._warmup and startup_trace.enabled and self.chef is not None:
+            startup_trace.mark("warm-up done")
+            print(startup_trace.report())
+            startup_trace.disable()
+
+    def setup_chef(self):
         chef_tex = None
         for path in ("images/chef.png", "images/player_idle.png"):
-            if os.path.exists(path):
+            if texture_exists(path):
                 chef_tex = load_texture(path)
                 break
         self.chef = Chef(center_x=300, center_y=250, texture=chef_tex)
-        self.setup_equipment()
+        if chef_tex is None:
+            self.chef.baked_texture()
 
     EQUIPMENT_DISPLAY_SIZE = 140
 
@@ -64,31 +144,111 @@ class FastFoodGame(arcade.Window):
             self.equipment_sprites.append(sprite)
 
     def start_game(self):
-        self.game_state = "PLAYING"
-        self.current_level = 1
-        self.money = 500
-        self.score = 0
-        self.level_manager.load_level(self.current_level)
-        self.customer_manager.setup_customers()
-        self.food_manager.reset_inventory()
-        self.order_system.reset_orders()
+        if self._warmup is None:
+            # Нажали «начать» раньше, чем догрузились ресурсы: ждём на экране загрузки.
+            self.start_requested = True
+            self.game_state = "LOADING"
+            return
+        self.warm_up(finish=True)
+        self.start_campaign()
+        self.autosave_timer = 0.0
         self.background = load_texture("images/level_bg.png")
+        if self.replay_log is not None:
+            self.replayer = InputReplayer(self.replay_log, self)
+            self.replay_log = None
+        elif self.record_path is not None:
+            self.stop_recording()
+            self.recorder = InputRecorder(self)
 
-    def next_level(self):
-        self.current_level += 1
-        if self.current_level > 7:
-            self.game_state = "GAME_OVER"
+    def record_to(self, path):
+        # Ввод каждой новой кампании пишется в path (replay.py); продолжение из сохранения не пишется.
+        self.record_path = path
+
+    def replay(self, log):
+        # Кампания стартует сама после загрузки, с сидом записи; ввод игрока не принимается.
+        self.replay_log = log
+        self.seed = log.seed
+        self.stress_crowd = log.stress_crowd
+
+    def stop_recording(self):
+        if self.recorder is None:
+            return
+        log = self.recorder.finish()
+        self.recorder = None
+        log.save(self.record_path)
+        print(f"recorded {len(log.events)} events over {log.end_tick} ticks to {self.record_path}")
+
+    def update_replay(self):
+        # Перед каждым шагом симуляции — ввод, пришедший на этом тике.
+        self.replayer.feed()
+        if self.replayer.done:
+            print(self.replayer.report())
+            self.replayer = None
+
+    def can_continue(self):
+        return self.save_available and self._warmup is not None and not self.stress_crowd
+
+    def continue_game(self):
+        if not self.can_continue():
             return
-        self.level_manager.load_level(self.current_level)
-        self.customer_manager.setup_customers()
+        try:
+            snapshot = load_snapshot(self.autosaver.path)
+        except ValueError as e:
+            print(f"save ignored: {e}")
+            snapshot = None
+        if snapshot is None:
+            self.save_available = False
+            return
+        self.warm_up(finish=True)
+        self.stop_recording()
+        snapshot.restore(self)
+        self.autosave_timer = 0.0
         self.background = load_texture("images/level_bg.png")
+        # Продолжаем с паузы: игрок сам снимает её по ESC.
+        self.set_paused(True)
+
+    def autosave(self):
+        # Только посреди уровня: снимок заставки или стресс-уровня не восстанавливается.
+        self.autosave_timer = 0.0
+        if self.stress_crowd or self.replayer is not None or self.game_state not in ("PLAYING", "PAUSED"):
+            return
+        if self.level_manager.is_level_complete():
+            return
+        self.autosaver.save(self)
+        self.save_available = True
+
+    def set_paused(self, paused):
+        super().set_paused(paused)
+        if paused:
+            self.autosave()
+
+    def next_level(self):
+        super().next_level()
+        if self.game_state == "GAME_OVER":
+            self.autosaver.discard()
+            self.save_available = False
+            self.stop_recording()
+        else:
+            self.background = load_texture("images/level_bg.png")
+            # Новый уровень сохраняется в первом же кадре игры после заставки.
+            self.autosave_timer = self.AUTOSAVE_INTERVAL
 
     def game_over(self):
         self.game_state = "GAME_OVER"
 
+    def close(self):
+        if self.loader is not None:
+            self.loader.shutdown()
+        self.autosave()
+        self.autosaver.close()
+        self.stop_recording()
+        super().close()
+
     def on_draw(self):
         self.clear()
-        if self.game_state == "MENU":
+        if self.game_state == "LOADING":
+            self.draw_loading()
+        elif self.game_state == "MENU":
             self.draw_menu()
         elif self.game_state == "PLAYING":
             if self.show_cooking_frame:
@@ -103,45 +263,78 @@ class FastFoodGame(arcade.Window):
             self.draw_pause_overlay()
         elif self.game_state == "GAME_OVER":
             self.draw_game_over()
+        if self.first_frame_ms is None:
+            self.first_frame_ms = (time.perf_counter() - self.launch_time) * 1000
+            startup_trace.mark("first frame")
+            print(f"first frame: {self.first_frame_ms:.0f} ms after launch")
+        if self.menu_ready_ms is None and self.game_state == "MENU":
+            self.menu_ready_ms = (time.perf_counter() - self.launch_time) * 1000
+            startup_trace.mark("menu interactive")
+            print(f"interactive menu: {self.menu_ready_ms:.0f} ms after launch")
+
+    def draw_progress_bar(self, y, width, height):
+        progress = self.loader.progress if self.loader is not None else 0.0
+        x = self.width // 2
+        arcade.draw_rect_filled(arcade.types.XYWH(x, y, width, height), (0, 0, 0, 200))
+        filled = width * progress
+        if filled > 0:
+            arcade.draw_rect_filled(arcade.types.XYWH(x - width / 2 + filled / 2, y, filled, height), arcade.color.GOLD)
+        arcade.draw_rect_outline(arcade.types.XYWH(x, y, width, height), arcade.color.WHITE, 2)
+        return progress
+
+    def draw_loading(self):
+        draw_text(
+            "ЗАГРУЗКА...",
+            self.width // 2, self.height // 2 + 40,
+            arcade.color.WHITE, 40, anchor_x="center", bold=True
+        )
+        progress = self.draw_progress_bar(self.height // 2 - 20, 400, 24)
+        draw_dynamic_text(
+            "loading.progress", f"{int(progress * 100)}%",
+            self.width // 2, self.height // 2 - 60,
+            arcade.color.LIGHT_GRAY, 18, anchor_x="center"
+        )
 
     def draw_menu(self):
         rect = arcade.types.XYWH(self.width // 2, self.height // 2, 1920, 1080)
         arcade.draw_texture_rect(self.background, rect)
         self.ui_manager.draw_menu_buttons()
+        if self._warmup is None:
+            self.draw_progress_bar(30, 300, 10)
 
-    def draw_game(self):
+    def draw_background(self):
         rect = arcade.types.XYWH(self.width // 2, self.height // 2, 1280, 720)
         arcade.draw_texture_rect(self.background, rect)
+
+    def draw_game(self):
+        self.draw_background()
         self.customer_manager.draw()
         if self.chef:
             self.chef.draw()
         self.order_system.draw_orders()
         self.ui_manager.draw_hud()
 
-    def draw_cooking_frame(self):
-        rect = arcade.types.XYWH(self.width // 2, self.height // 2, 1280, 720)
-        arcade.draw_texture_rect(self.background, rect)
-
-        overlay_rect = arcade.types.XYWH(self.width // 2, self.height // 2, self.width, self.height)
-        arcade.draw_rect_filled(overlay_rect, (0, 0, 0, 100))
-
-        title_bg = arcade.types.XYWH(self.width // 2, self.height - 50, 400, 80)
-        arcade.draw_rect_filled(title_bg, (50, 50, 50, 220))
-        arcade.draw_rect_outline(title_bg, arcade.color.GOLD, 3)
-        
-        arcade.draw_text(
-            "КУХНЯ — РЕЖИМ ГОТОВКИ",
-            self.width // 2, self.height - 50,
-            arcade.color.WHITE, 32, anchor_x="center", bold=True
-        )
+    def _kitchen_static_layer(self):
+        # Неизменная часть кухни запекается в текстуру; пересборка — при смене размера окна или уровня.
+        key = (self.width, self.height, self.current_level, id(self.background))
+        if self._kitchen_layer is None or self._kitchen_layer_key != key:
+            release_texture(self._kitchen_layer)
+            self._kitchen_layer = render_to_texture(
+                f"kitchen_layer:{key}", self.width, self.height, self.draw_cooking_static
+            )
+            self._kitchen_layer_key = key
+        return self._kitchen_layer
 
-        self.equipment_sprites.draw()
+    def draw_cooking_frame(self):
+        layer = self._kitchen_static_layer()
+        rect = arcade.types.XYWH(self.width / 2, self.height / 2, self.width, self.height)
+        arcade.draw_texture_rect(layer, rect)
 
         self.food_manager.draw_cooking_view()
 
         # Draw current order info (if any) — правый верхний угол
-        if self.order_system.active_orders:
-            order = self.order_system.active_orders[0]
+        order = self.order_system.get_current_order()
+        if order is not None:
             panel_w, panel_h = 280, 200
             margin_r, margin_t = 24, 90
             cx = self.width - margin_r - panel_w // 2
@@ -150,7 +343,7 @@ class FastFoodGame(arcade.Window):
             arcade.draw_rect_filled(order_bg, (50, 50, 50, 240))
             arcade.draw_rect_outline(order_bg, arcade.color.BLUE, 3)
             
-            arcade.draw_text(
+            draw_text(
                 "ТЕКУЩИЙ ЗАКАЗ:",
                 cx, cy + 80,
                 arcade.color.WHITE, 18, anchor_x="center", bold=True
@@ -159,36 +352,49 @@ class FastFoodGame(arcade.Window):
             y_offset = cy + 50
             for item in order.items:
                 y_offset -= 25
-                if isinstance(item, list):
-                    arcade.draw_text(
-                        Order.format_burger_layers(item),
-                        cx, y_offset,
-                        arcade.color.WHITE, 14, anchor_x="center"
-                    )
-                else:
-                    arcade.draw_text(
-                        Order._item_label_ru(item),
-                        cx, y_offset,
-                        arcade.color.WHITE, 16, anchor_x="center"
-                    )
+                draw_text(
+                    item.label,
+                    cx, y_offset,
+                    arcade.color.WHITE, 14 if item.layered else 16, anchor_x="center"
+                )
             
-            time_left = max(0, order.max_time - order.elapsed_time)
-            arcade.draw_text(
-                f"Время: {int(time_left)}с",
+            time_left = order.time_left()
+            draw_dynamic_text(
+                "cooking.order_time", f"Время: {int(time_left)}с",
                 cx, cy - 80,
                 arcade.color.RED, 18, anchor_x="center", bold=True
             )
 
+    def draw_cooking_static(self):
+        rect = arcade.types.XYWH(self.width // 2, self.height // 2, 1280, 720)
+        arcade.draw_texture_rect(self.background, rect)
+
+        overlay_rect = arcade.types.XYWH(self.width // 2, self.height // 2, self.width, self.height)
+        arcade.draw_rect_filled(overlay_rect, (0, 0, 0, 100))
+
+        title_bg = arcade.types.XYWH(self.width // 2, self.height - 50, 400, 80)
+        arcade.draw_rect_filled(title_bg, (50, 50, 50, 220))
+        arcade.draw_rect_outline(title_bg, arcade.color.GOLD, 3)
+        
+        draw_text(
+            "КУХНЯ — РЕЖИМ ГОТОВКИ",
+            self.width // 2, self.height - 50,
+            arcade.color.WHITE, 32, anchor_x="center", bold=True
+        )
+
+        self.equipment_sprites.draw()
+        self.food_manager.draw_cooking_static()
+
         instruction_bg = arcade.types.XYWH(self.width // 2, 50, 800, 70)
         arcade.draw_rect_filled(instruction_bg, (0, 0, 0, 220))
         arcade.draw_rect_outline(instruction_bg, arcade.color.GREEN, 2)
         
-        arcade.draw_text(
+        draw_text(
             "Кликайте по ингредиентам и оборудованию | K или ESC — вернуться",
             self.width // 2, 65,
             arcade.color.WHITE, 16, anchor_x="center", anchor_y="center", bold=True
         )
-        arcade.draw_text(
+        draw_text(
             "Бургер: добавляйте только слои из ТЕКУЩЕГО ЗАКАЗА, затем нажмите ГРИЛЬ.",
             self.width // 2, 40,
             arcade.color.LIGHT_GRAY, 12, anchor_x="center", anchor_y="center"
@@ -196,13 +402,13 @@ class FastFoodGame(arcade.Window):
 
     def draw_pause_overlay(self):
         rect = arcade.types.XYWH(self.width // 2, self.height // 2, self.width, self.height)
-        arcade.draw_rect_filled(rect, arcade.color.BLACK_TRANSLUCENT)
-        arcade.draw_text(
+        arcade.draw_rect_filled(rect, (0, 0, 0, 160))
+        draw_text(
             "ПАУЗА",
             self.width // 2, self.height // 2,
             arcade.color.WHITE, 64, anchor_x="center"
         )
-        arcade.draw_text(
+        draw_text(
             "Нажмите ESC для продолжения",
             self.width // 2, self.height // 2 - 80,
             arcade.color.GRAY, 24, anchor_x="center"
@@ -211,12 +417,12 @@ class FastFoodGame(arcade.Window):
     def draw_level_complete_overlay(self):
         rect = arcade.types.XYWH(self.width // 2, self.height // 2, self.width, self.height)
         arcade.draw_rect_filled(rect, (0, 0, 0, 160))
-        arcade.draw_text(
+        draw_text(
             "УРОВЕНЬ ЗАВЕРШЁН",
             self.width // 2, self.height // 2 + 40,
             arcade.color.GOLD, 56, anchor_x="center"
         )
-        arcade.draw_text(
+        draw_text(
             "Подождите, загружается следующий уровень...",
             self.width // 2, self.height // 2 - 20,
             arcade.color.WHITE, 24, anchor_x="center"
@@ -225,76 +431,73 @@ class FastFoodGame(arcade.Window):
     def draw_game_over(self):
         rect = arcade.types.XYWH(self.width // 2, self.height // 2, 1280, 720)
         arcade.draw_texture_rect(self.background, rect)
-        arcade.draw_text(
+        draw_text(
             "КАМПАНИЯ ПРОЙДЕНА!",
             self.width // 2, self.height - 150,
             arcade.color.GOLD, 54, anchor_x="center"
         )
-        arcade.draw_text(
-            f"Итоговый счёт: {self.score}",
+        draw_dynamic_text(
+            "game_over.score", f"Итоговый счёт: {self.score}",
             self.width // 2, self.height - 250,
             arcade.color.WHITE, 36, anchor_x="center"
         )
-        arcade.draw_text(
-            f"Всего денег: ${self.money}",
+        draw_dynamic_text(
+            "game_over.money", f"Всего денег: ${self.money}",
             self.width // 2, self.height - 300,
             arcade.color.WHITE, 36, anchor_x="center"
         )
         self.ui_manager.draw_menu_buttons(game_over=True)
 
     def on_update(self, delta_time):
+        self.update_loading()
+        sound_bank.new_frame()
+        self.sim_accumulator += delta_time
+        steps = 0
+        while self.sim_accumulator >= self.SIM_DT and steps < self.MAX_SIM_STEPS:
+            if self.replayer is not None:
+                self.update_replay()
+            self.simulate(self.SIM_DT)
+            self.sim_accumulator -= self.SIM_DT
+            steps += 1
+        if self.sim_accumulator >= self.SIM_DT:
+            # Слишком долгий кадр: не догоняем бесконечно, лишнее время отбрасываем.
+            self.sim_accumulator %= self.SIM_DT
+        self.sim_alpha = self.sim_accumulator / self.SIM_DT
         if self.game_state == "PLAYING":
-            self.customer_manager.update(delta_time)
-            self.food_manager.update(delta_time)
-            self.order_system.update(delta_time)
-            self.level_manager.update(delta_time)
-            if self.level_manager.is_level_complete():
-                self.game_state = "LEVEL_COMPLETE"
-                self.level_complete_timer = 0.0
-        elif self.game_state == "LEVEL_COMPLETE":
-            self.level_complete_timer += delta_time
-            if self.level_complete_timer >= 3.0:
-                self.next_level()
-                if self.game_state != "GAME_OVER":
-                    self.game_state = "PLAYING"
+            self.autosave_timer += delta_time
+            if self.autosave_timer >= self.AUTOSAVE_INTERVAL:
+                self.autosave()
+        if self.customer_manager is not None:
+            self.customer_manager.interpolate(self.sim_alpha)
 
     def on_key_press(self, key, modifiers):
-        if key == arcade.key.ESCAPE:
-            if self.game_state == "PLAYING" and self.show_cooking_frame:
-                self.show_cooking_frame = False
-                return
-
-            if self.game_state == "PLAYING":
-                self.game_state = "PAUSED" if self.game_state != "PAUSED" else "PLAYING"
-            elif self.game_state == "PAUSED":
-                self.game_state = "PLAYING"
-            elif self.game_state == "MENU":
+        if key == arcade.key.F9:
+            print(self.scheduler.dump())
+            return
+        if key == arcade.key.F3:
+            self.perf_overlay.toggle()
+            return
+        if self.game_state == "MENU":
+            if key == arcade.key.ESCAPE:
                 self.close()
-
-        if self.game_state == "PLAYING":
-            if key == arcade.key.K:
-                self.show_cooking_frame = not self.show_cooking_frame
-            elif self.show_cooking_frame:
-                if key == arcade.key.NUM_1:
-                    self.food_manager.select_ingredient("burger")
-                elif key == arcade.key.NUM_2:
-                    self.food_manager.select_ingredient("fries")
-                elif key == arcade.key.NUM_3:
-                    self.food_manager.select_ingredient("icecream")
-                elif key == arcade.key.NUM_4:
-                    self.food_manager.select_ingredient("drink")
+            return
+        if self.replayer is not None:
+            return
+        if self.recorder is not None:
+            self.recorder.key(key, modifiers)
+        self.handle_key(key)
 
     def on_mouse_press(self, x, y, button, modifiers):
         if self.game_state == "MENU":
             self.ui_manager.check_menu_click(x, y)
         elif self.game_state == "GAME_OVER":
             self.ui_manager.check_menu_click(x, y, game_over=True)
-        elif self.game_state == "PLAYING":
-            self.ui_manager.check_hud_click(x, y)
-            if self.show_cooking_frame:
-                self.food_manager.check_equipment_click(x, y)
-            else:
-                self.customer_manager.check_customer_click(x, y)
+        elif self.replayer is None:
+            # Запись хранит целые координаты — в игру уходят ровно они, иначе повтор кликнет в другую точку.
+            x, y = int(x), int(y)
+            if self.recorder is not None:
+                self.recorder.click(x, y, button, modifiers)
+            self.handle_click(x, y)
 
     def on_mouse_motion(self, x, y, dx, dy):
         if self.game_state == "MENU":
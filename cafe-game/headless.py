@@ -0,0 +1,127 @@
+import argparse
+import time
+
+import pyglet
+
+# Без окна arcade должен импортироваться без теневого GL-окна.
+pyglet.options["shadow_window"] = False
+
+from assets import texture_registry
+from audio import sound_bank
+from levels import Level
+from simulation import SimulationRules, LAST_LEVEL
+
+
+# Те же правила (уровни, клиенты, заказы, кухня) на простом объекте состояния:
+# без окна, GL-контекста и звука. Шаги симуляции идут так быстро, как позволяет CPU.
+# Текстуры и звук выключаются на уровне процесса только пока открыта хоть одна
+# безоконная игра: close() (или выход из with) возвращает прежние настройки.
+class HeadlessGame(SimulationRules):
+    rendering = False
+    _open = 0
+    _saved_switches = None
+
+    def __init__(self, width=1280, height=720, delta_time=SimulationRules.SIM_DT, stress_crowd=0, seed=None):
+        self.width = width
+        self.height = height
+        self.delta_time = delta_time
+        self.stress_crowd = stress_crowd
+        self.seed = seed
+        self.closed = False
+        HeadlessGame._acquire_offline()
+        self.init_simulation_state()
+        self.setup_simulation_managers()
+
+    @classmethod
+    def _acquire_offline(cls):
+        if cls._open == 0:
+            cls._saved_switches = (texture_registry.offline, sound_bank.enabled)
+            texture_registry.offline = True
+            sound_bank.enabled = False
+        cls._open += 1
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        HeadlessGame._open -= 1
+        if HeadlessGame._open == 0:
+            texture_registry.offline, sound_bank.enabled = HeadlessGame._saved_switches
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def step(self, ticks=1):
+        for _ in range(ticks):
+            self.simulate(self.delta_time)
+        return self.sim_tick
+
+    def run_until(self, predicate, max_ticks):
+        start = self.sim_tick
+        while not predicate(self) and self.sim_tick - start < max_ticks:
+            self.simulate(self.delta_time)
+        return self.sim_tick - start
+
+    def campaign_tick_budget(self):
+        total = sum(Level(n).time_limit + self.LEVEL_COMPLETE_DELAY for n in range(1, LAST_LEVEL + 1))
+        return int(total / self.delta_time) + LAST_LEVEL * 2
+
+    def run_campaign(self, policy=None, max_ticks=None):
+        # policy(game) вызывается перед каждым шагом — место для скриптового «игрока».
+        if max_ticks is None:
+            max_ticks = self.campaign_tick_budget()
+        self.start_campaign()
+        start = self.sim_tick
+        while self.game_state != "GAME_OVER" and self.sim_tick - start < max_ticks:
+            if policy is not None:
+                policy(self)
+            self.simulate(self.delta_time)
+        return self.summary()
+
+    def summary(self):
+        return {
+            "ticks": self.sim_tick,
+            "level": min(self.current_level, LAST_LEVEL),
+            "finished": self.game_state == "GAME_OVER",
+            "money": self.money,
+            "score": self.score,
+            "seed": self.rng.seed,
+        }
+
+
+def stress_benchmark(customers, ticks, seed=None):
+    with HeadlessGame(stress_crowd=customers, seed=seed) as game:
+        game.start_campaign()
+        # Сначала даём толпе набраться, замеряем уже установившийся поток.
+        game.run_until(lambda g: g.customer_manager.crowd.count >= customers, ticks)
+        start = time.perf_counter()
+        game.step(ticks)
+        elapsed = time.perf_counter() - start
+    crowd = game.customer_manager.crowd
+    print(
+        f"{ticks} ticks with ~{crowd.count} customers: "
+        f"{elapsed / ticks * 1000:.3f} ms/tick, {crowd.compactions} compactions"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game rules without a window")
+    parser.add_argument("--stress", type=int, default=0, help="background crowd size (NumPy backend)")
+    parser.add_argument("--ticks", type=int, default=1200)
+    parser.add_argument("--seed", type=int, default=None, help="campaign seed (random if omitted)")
+    args = parser.parse_args()
+    if args.stress:
+        stress_benchmark(args.stress, args.ticks, args.seed)
+        return
+    with HeadlessGame(seed=args.seed) as game:
+        start = time.perf_counter()
+        result = game.run_campaign()
+        elapsed = time.perf_counter() - start
+    print(f"{result['ticks']} ticks in {elapsed * 1000:.1f} ms: {result}")
+
+
+if __name__ == "__main__":
+    main()
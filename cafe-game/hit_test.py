@@ -0,0 +1,113 @@
+from collections import defaultdict
+
+HIT_CELL_SIZE = 64
+
+
+class HitRegion:
+    def __init__(self, key, layer, z, order, callback):
+        self.key = key
+        self.layer = layer
+        self.z = z
+        self.order = order
+        self.callback = callback
+        self.left = self.right = self.bottom = self.top = 0
+        self.half_width = self.half_height = 0
+        self.cells = ()
+        self.bounds = None
+
+    def set_rect(self, x, y, width, height):
+        self.half_width, self.half_height = width / 2, height / 2
+        self.set_center(x, y)
+
+    def set_center(self, x, y):
+        self.left, self.right = x - self.half_width, x + self.half_width
+        self.bottom, self.top = y - self.half_height, y + self.half_height
+
+    def contains(self, x, y):
+        return self.left <= x <= self.right and self.bottom <= y <= self.top
+
+
+# Единый хит-тест для кнопок, кухни и клиентов: равномерная сетка, каждая
+# область записана во все ячейки, которые задевает. Клик или движение мыши
+# проверяет одну ячейку, сколько бы целей ни было на экране. Слой (layer) —
+# экран или подсистема ("menu", "hud", "kitchen", "customers"); запрос смотрит
+# только активные слои. Попадания упорядочены по z сверху вниз, при равном z
+# первой идёт позже зарегистрированная область (она и нарисована поверх).
+class HitGrid:
+    def __init__(self, cell_size=HIT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = defaultdict(list)
+        self._regions = {}
+        self._next_order = 0
+        self.queries = 0
+        self.candidates = 0
+
+    def add(self, key, layer, x, y, width, height, callback, z=0):
+        self.remove(key)
+        region = HitRegion(key, layer, z, self._next_order, callback)
+        self._next_order += 1
+        region.set_rect(x, y, width, height)
+        self._regions[key] = region
+        self._place(region)
+        return region
+
+    def move(self, key, x, y):
+        region = self._regions.get(key)
+        if region is not None:
+            region.set_center(x, y)
+            self._place(region)
+
+    def _place(self, region):
+        s = self.cell_size
+        bounds = (int(region.left // s), int(region.right // s), int(region.bottom // s), int(region.top // s))
+        if bounds == region.bounds:
+            return
+        self._unlink(region)
+        c0, c1, r0, r1 = bounds
+        region.bounds = bounds
+        region.cells = tuple((cx, cy) for cx in range(c0, c1 + 1) for cy in range(r0, r1 + 1))
+        for cell in region.cells:
+            self._cells[cell].append(region)
+
+    def _unlink(self, region):
+        for cell in region.cells:
+            bucket = self._cells[cell]
+            bucket.remove(region)
+            if not bucket:
+                del self._cells[cell]
+        region.cells = ()
+        region.bounds = None
+
+    def remove(self, key):
+        region = self._regions.pop(key, None)
+        if region is not None:
+            self._unlink(region)
+
+    def clear(self, layer=None):
+        for key in [k for k, r in self._regions.items() if layer is None or r.layer == layer]:
+            self.remove(key)
+
+    def hits(self, x, y, layers=None):
+        self.queries += 1
+        s = self.cell_size
+        bucket = self._cells.get((int(x // s), int(y // s)))
+        if not bucket:
+            return []
+        self.candidates += len(bucket)
+        found = [r for r in bucket if (layers is None or r.layer in layers) and r.contains(x, y)]
+        found.sort(key=lambda r: (-r.z, -r.order))
+        return found
+
+    def top(self, x, y, layers=None):
+        found = self.hits(x, y, layers)
+        return found[0] if found else None
+
+    def dispatch(self, x, y, layers=None):
+        # Колбэк, вернувший False, пропускает клик к следующей области ниже по z.
+        for region in self.hits(x, y, layers):
+            if region.callback() is not False:
+                return region
+        return None
+
+    def __len__(self):
+        return len(self._regions)
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+
+import arcade
+
+MAX_CACHED_LABELS = 384
+
+
+# Кэш готовых arcade.Text. Статические надписи ищутся по (текст, размер, цвет,
+# якоря, жирность) и только переставляются; динамические (деньги, счёт, таймеры)
+# живут в именованных слотах и перестраиваются, только когда текст изменился.
+class LabelCache:
+    def __init__(self, max_labels=MAX_CACHED_LABELS):
+        self.max_labels = max_labels
+        self._labels = OrderedDict()
+        self._slots = {}
+        self.hits = 0
+        self.misses = 0
+        self.text_updates = 0
+        self.evictions = 0
+        self.drawn = 0
+
+    def draw_text(self, text, x, y, color=arcade.color.WHITE, font_size=12,
+                  anchor_x="left", anchor_y="baseline", bold=False):
+        key = (text, font_size, tuple(color), anchor_x, anchor_y, bold)
+        label = self._labels.get(key)
+        if label is None:
+            self.misses += 1
+            label = arcade.Text(
+                text, x, y, color, font_size,
+                anchor_x=anchor_x, anchor_y=anchor_y, bold=bold
+            )
+            self._labels[key] = label
+            if len(self._labels) > self.max_labels:
+                self._labels.popitem(last=False)
+                self.evictions += 1
+        else:
+            self.hits += 1
+            self._labels.move_to_end(key)
+        self._draw_at(label, x, y)
+
+    def draw_dynamic_text(self, slot, text, x, y, color=arcade.color.WHITE, font_size=12,
+                          anchor_x="left", anchor_y="baseline", bold=False):
+        label = self._slots.get(slot)
+        if label is None:
+            self.misses += 1
+            label = arcade.Text(
+                text, x, y, color, font_size,
+                anchor_x=anchor_x, anchor_y=anchor_y, bold=bold
+            )
+            self._slots[slot] = label
+        else:
+            self.hits += 1
+            if label.text != text:
+                label.text = text
+                self.text_updates += 1
+        self._draw_at(label, x, y)
+
+    def _draw_at(self, label, x, y):
+        if label.x != x or label.y != y:
+            label.position = (x, y)
+        label.draw()
+        self.drawn += 1
+
+    def clear(self):
+        self._labels.clear()
+        self._slots.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "text_updates": self.text_updates,
+            "evictions": self.evictions,
+            "labels": len(self._labels),
+            "slots": len(self._slots),
+            "drawn": self.drawn,
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.text_updates = 0
+        self.evictions = 0
+        self.drawn = 0
+
+
+label_cache = LabelCache()
+draw_text = label_cache.draw_text
+draw_dynamic_text = label_cache.draw_dynamic_text
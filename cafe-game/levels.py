@@ -1,48 +1,50 @@
-import arcade
+from content import content
 
 
 class Level:
     def __init__(self, level_number):
         self.level_number = level_number
-        self.customers_per_hour = 10 + level_number * 2
-        self.starting_money = 500 + level_number * 200
-        self.objective_score = 1000 * level_number
+        # Параметры уровня — строка таблицы content/levels.json.
+        spec = content.level(level_number)
+        self.customers_per_hour = spec["customers_per_hour"]
+        self.starting_money = spec["starting_money"]
+        self.objective_score = spec["objective_score"]
         self.available_ingredients = self.get_available_ingredients()
-        self.time_limit = 180 - level_number * 10
+        self.time_limit = spec["time_limit"]
+        # Сколько заказов (и клиентов у стойки) может быть одновременно.
+        self.max_orders = spec["max_orders"]
         self.completed = False
         self.passed = False
 
     def get_available_ingredients(self):
-        ingredients = {
-            1: ["burger", "fries", "cola"],
-            2: ["burger", "fries", "cola", "icecream"],
-            3: ["burger", "fries", "cheese", "cola", "icecream"],
-            4: ["burger", "fries", "cheese", "cola", "icecream"],
-            5: ["burger", "fries", "cheese", "cola", "icecream"],
-            6: ["burger", "fries", "cheese", "cola", "icecream"],
-            7: ["burger", "fries", "cheese", "cola", "icecream"]
-        }
-        return ingredients.get(self.level_number, [])
+        return list(content.level(self.level_number)["ingredients"])
 
 
 class LevelManager:
     def __init__(self, game):
         self.game = game
         self.current_level = None
-        self.elapsed_time = 0.0
+        self.deadline = None
 
-    def load_level(self, level_number):
+    def load_level(self, level_number, elapsed=0.0):
+        # elapsed > 0 — уровень продолжается из сохранения (save.py).
         self.current_level = Level(level_number)
-        self.elapsed_time = 0.0
+        self.schedule_deadline(elapsed)
         self.game.money = self.current_level.starting_money
 
-    def update(self, delta_time):
-        if not self.current_level:
-            return
+    def schedule_deadline(self, elapsed=0.0):
+        # Повторный вызов после правки time_limit переставляет таймер уровня.
+        scheduler = self.game.scheduler
+        scheduler.cancel(self.deadline)
+        self.deadline = scheduler.call_later(
+            self.current_level.time_limit - elapsed, self.check_level_completion, "level.time_limit"
+        )
 
-        self.elapsed_time += delta_time
-        if self.elapsed_time >= self.current_level.time_limit:
-            self.check_level_completion()
+    @property
+    def elapsed_time(self):
+        if not self.current_level:
+            return 0.0
+        return self.current_level.time_limit - self.game.scheduler.remaining(self.deadline)
 
     def check_level_completion(self):
         if self.game.score >= self.current_level.objective_score:
@@ -0,0 +1,105 @@
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from assets import decode_texture, texture_registry
+from audio import sound_bank
+
+LOADER_WORKERS = min(4, os.cpu_count() or 1)
+
+
+# Фоновая загрузка ресурсов при старте окна. Рабочие потоки декодируют PNG
+# (Pillow) и WAV, главный поток в pump() забирает готовое и выгружает текстуры
+# в атлас GPU не больше UPLOADS_PER_FRAME за кадр, чтобы экран загрузки не
+# подтормаживал. Загруженное кладётся в обычные texture_registry и sound_bank.
+class AssetLoader:
+    UPLOADS_PER_FRAME = 4
+
+    def __init__(self, atlas=None, workers=LOADER_WORKERS):
+        self.atlas = atlas
+        self.workers = workers
+        self._pool = None
+        self._finished = queue.SimpleQueue()
+        self._pending = set()
+        self.total = 0
+        self.loaded = 0
+        self.failed = 0
+        self.uploads = 0
+        self.started_at = None
+        self.finished_at = None
+
+    def start(self, textures, sounds=()):
+        # Порядок постановки — порядок приоритета: первыми идут текстуры первого экрана.
+        jobs = [("texture", path) for path in textures if texture_registry.exists(path)]
+        jobs += [("sound", name) for name in sounds]
+        self.total = len(jobs)
+        self.started_at = time.perf_counter()
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="assets")
+        for job in jobs:
+            self._pending.add(job)
+            future = self._pool.submit(self._decode, *job)
+            future.add_done_callback(lambda f, job=job: self._finished.put((job, f)))
+        if not jobs:
+            self._finish()
+
+    @staticmethod
+    def _decode(kind, name):
+        if kind == "texture":
+            return decode_texture(name)
+        return sound_bank.decode(name)
+
+    def pump(self, max_uploads=UPLOADS_PER_FRAME):
+        uploads = 0
+        while uploads < max_uploads:
+            try:
+                job, future = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            kind, name = job
+            self._pending.discard(job)
+            self.loaded += 1
+            try:
+                result = future.result()
+            except Exception:
+                # Реестр сам попробует ещё раз при первом обращении и отдаст плейсхолдер.
+                self.failed += 1
+                continue
+            if kind == "texture":
+                if self.atlas is not None:
+                    self.atlas.add(result)
+                texture_registry.put(name, result)
+                uploads += 1
+            else:
+                sound_bank.put(name, *result)
+        self.uploads += uploads
+        if self.started_at is not None and not self._pending and self.finished_at is None:
+            self._finish()
+        return uploads
+
+    def _finish(self):
+        self.finished_at = time.perf_counter()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    def ready(self, textures):
+        return self.started_at is not None and all(("texture", path) not in self._pending for path in textures)
+
+    @property
+    def done(self):
+        return self.finished_at is not None
+
+    @property
+    def progress(self):
+        return self.loaded / self.total if self.total else 1.0
+
+    @property
+    def elapsed_ms(self):
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return (end - self.started_at) * 1000
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
@@ -1,9 +1,37 @@
+import argparse
+import sys
+import time
+
+LAUNCH_TIME = time.perf_counter()
+
+from startup_trace import startup_trace
+
+# Трассировка включается до остальных импортов, чтобы засечь и их.
+if "--trace-startup" in sys.argv:
+    startup_trace.enable(LAUNCH_TIME)
+
 import arcade
 from game import FastFoodGame
+from replay import InputLog
 
 def main():
-    window = FastFoodGame(1280, 720, "MAK")
-    window.setup()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stress", type=int, default=0, help="stress level: background crowd size")
+    parser.add_argument("--trace-startup", action="store_true", help="print import and constructor timings")
+    parser.add_argument("--seed", type=int, default=None, help="campaign seed (random if omitted)")
+    parser.add_argument("--record", metavar="PATH", help="record keyboard and mouse input of each new campaign")
+    parser.add_argument("--replay", metavar="PATH", help="play back a recording in real time (python replay.py PATH for max speed)")
+    args = parser.parse_args()
+    FastFoodGame.stress_crowd = args.stress
+    FastFoodGame.seed = args.seed
+    with startup_trace.span("FastFoodGame"):
+        window = FastFoodGame(1280, 720, "MAK", launch_time=LAUNCH_TIME)
+    if args.record:
+        window.record_to(args.record)
+    if args.replay:
+        window.replay(InputLog.load(args.replay))
+    with startup_trace.span("FastFoodGame.setup"):
+        window.setup()
     arcade.run()
 
 if __name__ == "__main__":
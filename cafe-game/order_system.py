@@ -1,14 +1,25 @@
+import heapq
+
 import arcade
-import random
+from audio import sound_bank
+from labels import draw_text, draw_dynamic_text
+from recipes import recipes
 from utils import format_time
 
 
 class Order:
-    def __init__(self, game, customer_type):
+    # Множитель времени на заказ (подбирается balance_sim.py).
+    TIME_SCALE = 1.0
+
+    def __init__(self, game, customer_type, customer_id=None, ticket=0, recipe=None):
         self.game = game
         self.customer_type = customer_type
-        self.items = self.generate_order()
-        self.elapsed_time = 0.0
+        self.customer_id = customer_id
+        self.ticket = ticket
+        # recipe передаётся при загрузке сохранения, иначе заказ генерируется.
+        self.recipe = recipe
+        self.items = self.generate_order() if recipe is None else recipe.items
+        self.deadline = None
         self.max_time = self.calculate_max_time()
         self.completed = False
         self.success = False
@@ -16,86 +27,40 @@ class Order:
         margin_right, margin_top = 24, 90
         self.x = game.width - margin_right - card_width // 2
         self.y = game.height - margin_top - card_height // 2
+        self.home_y = self.y
+        self.slot = 0
 
     def generate_order(self):
-        items = []
-        if random.random() > 0.3:
-            items.append(self.generate_burger())
-        if random.random() > 0.5:
-            items.append("fries")
-        if random.random() > 0.4:
-            items.append(self.generate_drink())
-        if random.random() > 0.7 and self.game.current_level > 3:
-            items.append(self.generate_icecream())
-        return items
-
-    def generate_burger(self):
-        ingredients = ["patty", "cheese"]
-        burger = ["base"]
-        for ingredient in ingredients:
-            if random.random() > 0.5 or len(burger) == 1:
-                burger.append(ingredient)
-        burger.append("top")
-        return burger
-
-    def generate_drink(self):
-        drinks = ["cola", "water"]
-        return random.choice(drinks)
-
-    def generate_icecream(self):
-        flavors = ["default", "chocolate"]
-        return random.choice(flavors)
+        self.recipe = recipes.generate(self.game.current_level, self.game.rng.orders)
+        return self.recipe.items
 
     def calculate_max_time(self):
-        base_time = 30
-        if any(isinstance(item, list) for item in self.items):
-            base_time += 15
-        if "fries" in self.items:
-            base_time += 10
-        if any(item in ["default", "chocolate"] for item in self.items):
-            base_time += 5
-        return base_time * (1.5 - self.game.current_level * 0.1)
+        base_time = 30 + self.recipe.time_bonus
+        return base_time * (1.5 - self.game.current_level * 0.1) * self.TIME_SCALE
 
-    def update(self, delta_time):
+    def time_left(self):
+        if self.deadline is None:
+            return self.max_time
+        return self.game.scheduler.remaining(self.deadline)
+
+    @property
+    def elapsed_time(self):
+        return self.max_time - self.time_left()
+
+    def expire(self):
         if self.completed:
             return
-
-        self.elapsed_time += delta_time
-        if self.elapsed_time > self.max_time:
-            self.success = False
-            self.completed = True
-            self.game.money -= 15
-            self.game.customer_manager.remove_angry_customers()
+        self.success = False
+        self.completed = True
+        self.game.money -= 15
 
     def complete_order(self, prepared_items):
         if self.completed:
             return False
 
         self.completed = True
-        score = 0
-        penalty = 0
-
-        for item in self.items:
-            if isinstance(item, list):
-                if not prepared_items.get("burger") or not self.validate_burger(item, prepared_items["burger"]):
-                    penalty += 30
-                else:
-                    score += 50
-            elif item == "fries":
-                if not prepared_items.get("fries"):
-                    penalty += 20
-                else:
-                    score += 30
-            elif item in ["cola", "water"]:
-                if not prepared_items.get("drink") or prepared_items["drink"] != item:
-                    penalty += 15
-                else:
-                    score += 25
-            elif item in ["default", "chocolate"]:
-                if not prepared_items.get("icecream") or prepared_items["icecream"] != item:
-                    penalty += 15
-                else:
-                    score += 25
+        self.game.scheduler.cancel(self.deadline)
+        score, penalty = self.recipe.score(recipes.tray(prepared_items))
 
         self.success = score > penalty
         if self.success:
@@ -104,141 +69,241 @@ class Order:
             self.game.score += reward
         else:
             self.game.money -= penalty // 2
-            self.game.customer_manager.remove_angry_customers()
 
         return self.success
 
-    def validate_burger(self, required, prepared):
-        if len(required) != len(prepared):
-            return False
-        for i in range(len(required)):
-            if required[i] != prepared[i]:
-                return False
-        return True
-
-    @staticmethod
-    def _item_label_ru(item):
-        if item == "fries":
-            return "Картошка"
-        if item == "cola":
-            return "Кола"
-        if item == "water":
-            return "Вода"
-        if item == "default":
-            return "Мороженое ваниль"
-        if item == "chocolate":
-            return "Мороженое шоколад"
-        return item.capitalize()
-
-    @staticmethod
-    def format_burger_layers(burger_list):
-        if not burger_list or not isinstance(burger_list, list):
-            return "Custom Burger"
-        names = []
-        for layer in burger_list:
-            if layer == "base":
-                names.append("низ булки")
-            elif layer == "top":
-                names.append("верх булки")
-            elif layer == "patty":
-                names.append("котлета")
-            elif layer == "cheese":
-                names.append("сыр")
-            else:
-                names.append(layer)
-        return "Бургер: " + ", ".join(names)
-
     def draw(self):
         rect = arcade.types.XYWH(self.x, self.y, 280, 130)
         arcade.draw_rect_filled(rect, arcade.color.LIGHT_BROWN)
         arcade.draw_rect_outline(rect, arcade.color.DARK_BROWN)
 
         y_offset = self.y + 40
-        arcade.draw_text(
+        draw_text(
             f"УРОВЕНЬ {self.game.current_level}",
             self.x - 130, y_offset,
             arcade.color.RED, 18
         )
 
-        time_left = max(0, self.max_time - self.elapsed_time)
-        arcade.draw_text(
-            f"ВРЕМЯ: {format_time(time_left)}",
+        time_left = self.time_left()
+        draw_dynamic_text(
+            ("order.time", self.x, self.y), f"ВРЕМЯ: {format_time(time_left)}",
             self.x + 20, y_offset,
             arcade.color.BLUE, 18,
             anchor_x="right"
         )
 
         y_offset -= 30
-        arcade.draw_text(
-            "ЗАКАЗ:",
+        draw_text(
+            f"ЗАКАЗ #{self.ticket}:" if self.ticket else "ЗАКАЗ:",
             self.x - 130, y_offset,
             arcade.color.BLACK, 20
         )
 
         for item in self.items:
             y_offset -= 25
-            if isinstance(item, list):
-                arcade.draw_text(
-                    Order.format_burger_layers(item),
-                    self.x - 110, y_offset,
-                    arcade.color.DARK_BROWN, 16
-                )
+            if item.layered:
+                draw_text(item.label, self.x - 110, y_offset, arcade.color.DARK_BROWN, 16)
             else:
-                label = self._item_label_ru(item)
-                arcade.draw_text(
-                    label,
-                    self.x - 110, y_offset,
-                    arcade.color.BLACK, 18
-                )
+                draw_text(item.label, self.x - 110, y_offset, arcade.color.BLACK, 18)
+
+
+# Доска заказов: по тикету на клиента (ключ — id клиента) и куча сроков,
+# из которой самый срочный заказ берётся без обхода всей доски. Закрытые
+# тикеты выбрасываются из кучи лениво. Список по срокам для отрисовки
+# пересобирается только после изменения доски, а не каждый кадр.
+class OrderBoard:
+    def __init__(self):
+        self._tickets = {}
+        self._deadlines = []
+        self._seq = 0
+        self._ordered = None
+
+    def add(self, customer_id, order, due):
+        # У клиента один тикет: повторный add оставил бы в куче срок заменённого заказа.
+        if customer_id in self._tickets:
+            raise ValueError(f"customer {customer_id} already has an order on the board")
+        self._tickets[customer_id] = order
+        self._ordered = None
+        heapq.heappush(self._deadlines, (due, self._seq, customer_id))
+        self._seq += 1
+        if len(self._deadlines) > 2 * len(self._tickets) + 16:
+            self._deadlines = [e for e in self._deadlines if e[2] in self._tickets]
+            heapq.heapify(self._deadlines)
+
+    def get(self, customer_id):
+        return self._tickets.get(customer_id)
+
+    def pop(self, customer_id):
+        order = self._tickets.pop(customer_id, None)
+        if order is not None:
+            self._ordered = None
+        return order
+
+    def most_urgent(self):
+        heap = self._deadlines
+        while heap and heap[0][2] not in self._tickets:
+            heapq.heappop(heap)
+        return self._tickets[heap[0][2]] if heap else None
+
+    def by_deadline(self):
+        # Общий список, не для изменения вызывающим.
+        if self._ordered is None:
+            live = [entry for entry in self._deadlines if entry[2] in self._tickets]
+            live.sort()
+            self._ordered = [self._tickets[cid] for _, _, cid in live]
+        return self._ordered
+
+    def clear(self):
+        self._tickets.clear()
+        self._deadlines = []
+        self._ordered = None
+
+    def __len__(self):
+        return len(self._tickets)
+
+    def __iter__(self):
+        return iter(list(self._tickets.values()))
+
+    def __contains__(self, customer_id):
+        return customer_id in self._tickets
 
 
 class OrderSystem:
+    COOLDOWN_BASE = 8
+    COOLDOWN_MIN = 2
+    # Стресс-уровень (stress_crowd) играется как час пик.
+    RUSH_HOUR_ORDERS = 12
+    MAX_CARDS = 3
+    CARD_SPACING = 140
+    CUSTOMER_SLOT_SPACING = 80
+
     def __init__(self, game):
         self.game = game
-        self.active_orders = []
-        self.order_cooldown = 0
-        self.max_orders = 1
+        self.board = OrderBoard()
+        self.cooldown_timer = None
+        self.cooldown_ready = True
+        self.next_ticket = 1
+        self.orders_succeeded = 0
+        self.orders_failed = 0
+        self.orders_expired = 0
+
+    @property
+    def max_orders(self):
+        if self.game.stress_crowd:
+            return self.RUSH_HOUR_ORDERS
+        level = self.game.level_manager.current_level
+        return level.max_orders if level else 1
+
+    @property
+    def active_orders(self):
+        return self.board.by_deadline()
+
+    def clear_tickets(self):
+        scheduler = self.game.scheduler
+        for order in self.board:
+            scheduler.cancel(order.deadline)
+        self.board.clear()
+        self.next_ticket = 1
 
     def reset_orders(self):
-        self.active_orders = []
-        self.order_cooldown = 0
+        self.clear_tickets()
+        self.game.scheduler.cancel(self.cooldown_timer)
+        self.cooldown_timer = None
+        self.cooldown_ready = True
+        self.orders_succeeded = 0
+        self.orders_failed = 0
+        self.orders_expired = 0
+
+    def cooldown_for_level(self, level):
+        return max(self.COOLDOWN_BASE - level, self.COOLDOWN_MIN)
+
+    @property
+    def order_cooldown(self):
+        return self.game.scheduler.remaining(self.cooldown_timer)
 
     def update(self, delta_time):
-        self.order_cooldown -= delta_time
+        # Таймеры (кулдаун, сроки заказов) срабатывают в планировщике; здесь
+        # только ждём, пока освободится место у стойки. Уходящие клиенты
+        # ещё занимают место, как и раньше при одном заказе.
         if (
-            self.order_cooldown <= 0
-            and len(self.active_orders) < self.max_orders
-            and not self.game.customer_manager.customers
+            self.cooldown_ready
+            and len(self.board) < self.max_orders
+            and len(self.game.customer_manager.customers) < self.max_orders
         ):
             self.spawn_order()
-            self.game.customer_manager.spawn_customer()
-            self.order_cooldown = max(8 - self.game.current_level, 2)
+            self.start_cooldown()
+
+    def start_cooldown(self, delay=None):
+        if delay is None:
+            delay = self.cooldown_for_level(self.game.current_level)
+        self.cooldown_ready = False
+        self.cooldown_timer = self.game.scheduler.call_later(delay, self._end_cooldown, "orders.cooldown")
+
+    def _end_cooldown(self):
+        self.cooldown_ready = True
 
-        for order in self.active_orders[:]:
-            order.update(delta_time)
-            if order.completed:
-                self.active_orders.remove(order)
+    def _free_slot(self):
+        taken = {order.slot for order in self.board}
+        return next(slot for slot in range(len(taken) + 1) if slot not in taken)
 
     def spawn_order(self):
         customer_types = ["standard"]
-        customer_type = random.choice(customer_types)
-        self.active_orders.append(Order(self.game, customer_type))
+        customer_type = self.game.rng.orders.choice(customer_types)
+        order = Order(self.game, customer_type, ticket=self.next_ticket)
+        self.next_ticket += 1
+        order.slot = self._free_slot()
+        customer = self.game.customer_manager.spawn_customer(order.slot * self.CUSTOMER_SLOT_SPACING)
+        self.place_order(order, customer.id, order.max_time)
+        return order
+
+    def place_order(self, order, customer_id, time_left):
+        order.customer_id = customer_id
+        scheduler = self.game.scheduler
+        self.board.add(customer_id, order, scheduler.now + time_left)
+        order.deadline = scheduler.call_later(time_left, lambda: self.expire_order(order), "order.expire")
+
+    def expire_order(self, order):
+        if self.board.pop(order.customer_id) is None:
+            return
+        order.expire()
+        self.orders_expired += 1
+        self.game.customer_manager.dismiss_customer(order.customer_id)
 
-    def submit_order(self, prepared_items):
-        if not self.active_orders:
+    def submit_order(self, prepared_items, customer):
+        order = self.board.pop(customer.id)
+        if order is None:
             return False
 
-        success = self.active_orders[0].complete_order(prepared_items)
+        success = order.complete_order(prepared_items)
         if success:
-            arcade.play_sound(arcade.load_sound("sounds/success.wav"))
+            self.orders_succeeded += 1
+            sound_bank.play("success")
         else:
-            arcade.play_sound(arcade.load_sound("sounds/fail.wav"))
-        self.active_orders.pop(0)
+            self.orders_failed += 1
+            sound_bank.play("fail")
         return success
 
     def draw_orders(self):
-        for order in self.active_orders:
+        orders = self.active_orders
+        for i, order in enumerate(orders):
+            if i == self.MAX_CARDS:
+                break
+            order.y = order.home_y - i * self.CARD_SPACING
             order.draw()
+        if len(orders) > self.MAX_CARDS:
+            last = orders[self.MAX_CARDS - 1]
+            draw_dynamic_text(
+                "orders.more", f"+ ещё {len(orders) - self.MAX_CARDS}",
+                last.x, last.y - 80, arcade.color.WHITE, 16, anchor_x="center", bold=True
+            )
+        customers = self.game.customer_manager
+        for order in orders:
+            customer = customers.find(order.customer_id)
+            if customer is not None and customer.state == "waiting":
+                draw_text(
+                    f"#{order.ticket}", customer.center_x, customer.center_y + 150,
+                    arcade.color.YELLOW, 18, anchor_x="center", bold=True
+                )
 
     def get_current_order(self):
-        return self.active_orders[0] if self.active_orders else None
\ No newline at end of file
+        return self.board.most_urgent()
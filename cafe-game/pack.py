@@ -0,0 +1,177 @@
+import argparse
+import io
+import mmap
+import os
+import struct
+import time
+
+PACK_PATH = "assets.pak"
+ASSET_DIRS = ("images", "sounds", "atlas")
+PACK_MAGIC = b"CAFEPAK1"
+# magic, смещение индекса, число записей
+HEADER = struct.Struct("<8sQI4x")
+# смещение данных, размер, длина имени (имя в UTF-8 идёт следом)
+INDEX_ENTRY = struct.Struct("<QQH")
+ALIGN = 16
+
+
+def build_pack(output=PACK_PATH, directories=ASSET_DIRS):
+    # Все файлы из directories в один архив: данные подряд (с выравниванием), индекс в конце.
+    names = []
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        for file_name in sorted(os.listdir(directory)):
+            if os.path.isfile(os.path.join(directory, file_name)):
+                names.append(f"{directory}/{file_name}")
+    index = []
+    tmp_path = f"{output}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(PACK_MAGIC, 0, 0))
+        for name in names:
+            f.write(b"\0" * (-f.tell() % ALIGN))
+            with open(name, "rb") as src:
+                data = src.read()
+            index.append((name, f.tell(), len(data)))
+            f.write(data)
+        index_offset = f.tell()
+        for name, offset, size in index:
+            encoded = name.encode("utf-8")
+            f.write(INDEX_ENTRY.pack(offset, size, len(encoded)))
+            f.write(encoded)
+        f.seek(0)
+        f.write(HEADER.pack(PACK_MAGIC, index_offset, len(index)))
+    os.replace(tmp_path, output)
+    return index
+
+
+# Чтение записи пака без копирования: декодер читает прямо из отображённого файла.
+class PackReader(io.RawIOBase):
+    def __init__(self, view):
+        self._view = view
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = max(0, min(len(buffer), len(self._view) - self._pos))
+        buffer[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+# Пак, отображённый в память целиком (mmap): индекс читается один раз при
+# открытии, view(name) — срез memoryview без копирования данных.
+class AssetPack:
+    def __init__(self, path=PACK_PATH):
+        self.path = path
+        self._file = None
+        self._map = None
+        self._index = {}
+        if os.path.exists(path):
+            self._open()
+
+    def _open(self):
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, count = HEADER.unpack_from(self._map, 0)
+        if magic != PACK_MAGIC:
+            raise ValueError(f"{self.path}: not an asset pack")
+        pos = index_offset
+        for _ in range(count):
+            offset, size, name_len = INDEX_ENTRY.unpack_from(self._map, pos)
+            pos += INDEX_ENTRY.size
+            self._index[self._map[pos:pos + name_len].decode("utf-8")] = (offset, size)
+            pos += name_len
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def names(self):
+        return list(self._index)
+
+    def view(self, name):
+        offset, size = self._index[name]
+        return memoryview(self._map)[offset:offset + size]
+
+    def close(self):
+        self._index = {}
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+
+# Откуда брать файл ресурса. Рабочая копия (loose-файлы в images/, sounds/)
+# всегда важнее пака, но вместо stat на каждый файл каталоги читаются одним
+# listdir при первом обращении. На киоске без каталогов всё берётся из пака.
+class AssetFiles:
+    def __init__(self, pack_path=PACK_PATH):
+        self.pack = AssetPack(pack_path)
+        self._loose = {}
+
+    def _loose_names(self, directory):
+        names = self._loose.get(directory)
+        if names is None:
+            try:
+                names = set(os.listdir(directory))
+            except OSError:
+                names = set()
+            self._loose[directory] = names
+        return names
+
+    def is_loose(self, path):
+        directory, file_name = os.path.split(path)
+        return file_name in self._loose_names(directory)
+
+    def exists(self, path):
+        return self.is_loose(path) or path in self.pack
+
+    def listdir(self, directory):
+        prefix = directory + "/"
+        packed = {name[len(prefix):] for name in self.pack.names() if name.startswith(prefix)}
+        return sorted(packed | self._loose_names(directory))
+
+    def open(self, path):
+        if self.is_loose(path) or path not in self.pack:
+            return open(path, "rb")
+        return io.BufferedReader(PackReader(self.pack.view(path)))
+
+    def refresh(self):
+        self._loose.clear()
+
+
+asset_files = AssetFiles()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the single-file asset pack")
+    parser.add_argument("--output", default=PACK_PATH)
+    parser.add_argument("directories", nargs="*", default=list(ASSET_DIRS))
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    index = build_pack(args.output, args.directories)
+    total = sum(size for _, _, size in index)
+    print(f"{args.output}: {len(index)} files, {total / 1024:.0f} KiB in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import time
+from collections import deque
+
+import arcade
+from arcade.gl.vertex_array import VertexArray
+from pyglet.graphics import vertexdomain
+from labels import label_cache, draw_dynamic_text
+
+# Что замеряется: (строка в оверлее, атрибут окна с объектом или None — само окно, метод).
+# У кухни и уровня своего update нет — их работа идёт в таймерах планировщика.
+UPDATE_SECTIONS = (
+    ("customers", "customer_manager", "update"),
+    ("timers (food, level)", "scheduler", "advance"),
+    ("orders", "order_system", "update"),
+    ("level check", "level_manager", "is_level_complete"),
+)
+DRAW_SECTIONS = (
+    ("background", None, "draw_background"),
+    ("customers", "customer_manager", "draw"),
+    ("chef", "chef", "draw"),
+    ("orders", "order_system", "draw_orders"),
+    ("hud", "ui_manager", "draw_hud"),
+    ("cooking view", None, "draw_cooking_frame"),
+)
+# Все места, где arcade и pyglet (текст) отдают вызов отрисовки в GL.
+DRAW_CALL_METHODS = (
+    (VertexArray, "render"),
+    (vertexdomain.VertexDomain, "draw"),
+    (vertexdomain.VertexDomain, "draw_subset"),
+    (vertexdomain.InstancedVertexDomain, "draw"),
+    (vertexdomain.InstancedVertexDomain, "draw_subset"),
+    (vertexdomain.IndexedVertexDomain, "draw"),
+    (vertexdomain.IndexedVertexDomain, "draw_subset"),
+    (vertexdomain.InstancedIndexedVertexDomain, "draw"),
+    (vertexdomain.InstancedIndexedVertexDomain, "draw_subset"),
+)
+
+
+# Оверлей производительности (F3): FPS и график времени кадра, стоимость
+# update менеджеров и секций отрисовки, число вызовов отрисовки и надписей,
+# число клиентов. Пока он скрыт, ничего не обёрнуто: замеры ставятся обёртками
+# методов на экземплярах (и счётчиком на методах отрисовки arcade/pyglet)
+# только в show() и снимаются в hide(), так что скрытый оверлей ничего не стоит.
+class PerfOverlay:
+    GRAPH_FRAMES = 120
+    GRAPH_MAX_MS = 50.0
+    TEXT_REFRESH = 0.25
+    SMOOTHING = 0.1
+    PANEL = (640, 560, 440, 300)
+
+    def __init__(self, game):
+        self.game = game
+        self.visible = False
+        self.frame_times = deque(maxlen=self.GRAPH_FRAMES)
+        self.averages = {}
+        self.draw_calls = 0
+        self._frame = {}
+        self._wrapped = []
+        self._missing = []
+        self._class_patches = []
+        self._last_frame = None
+        self._labels_before = 0
+        self._lines = []
+        self._text_at = 0.0
+
+    def toggle(self):
+        if self.visible:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        self.visible = True
+        self.frame_times.clear()
+        self.averages.clear()
+        self._last_frame = None
+        game = self.game
+        self._wrap(game, "on_update", "update", self._update_hook)
+        self._wrap(game, "on_draw", "draw", self._draw_hook)
+        self._missing = [("update", s) for s in UPDATE_SECTIONS] + [("draw", s) for s in DRAW_SECTIONS]
+        self._wrap_sections()
+        for cls, name in DRAW_CALL_METHODS:
+            original = cls.__dict__.get(name)
+            if original is not None:
+                setattr(cls, name, self._counted(original))
+                self._class_patches.append((cls, name, original))
+
+    def hide(self):
+        self.visible = False
+        for owner, name in self._wrapped:
+            owner.__dict__.pop(name, None)
+        for cls, name, original in self._class_patches:
+            setattr(cls, name, original)
+        self._wrapped = []
+        self._missing = []
+        self._class_patches = []
+
+    def _wrap(self, owner, name, key, hook=None):
+        original = getattr(owner, name)
+        frame = self._frame
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                frame[key] = frame.get(key, 0.0) + (time.perf_counter() - start) * 1000
+
+        setattr(owner, name, hook(original) if hook is not None else timed)
+        self._wrapped.append((owner, name))
+
+    def _wrap_sections(self):
+        # Менеджеры появляются после прогрева — то, чего ещё нет, оборачивается позже.
+        missing = []
+        for kind, (label, attr, method) in self._missing:
+            owner = self.game if attr is None else getattr(self.game, attr, None)
+            if owner is None:
+                missing.append((kind, (label, attr, method)))
+            else:
+                self._wrap(owner, method, (kind, label))
+        self._missing = missing
+
+    def _counted(self, method):
+        def counted(*args, **kwargs):
+            self.draw_calls += 1
+            return method(*args, **kwargs)
+        return counted
+
+    def _update_hook(self, original):
+        def on_update(delta_time):
+            if self._missing:
+                self._wrap_sections()
+            start = time.perf_counter()
+            original(delta_time)
+            self._frame["update"] = self._frame.get("update", 0.0) + (time.perf_counter() - start) * 1000
+        return on_update
+
+    def _draw_hook(self, original):
+        def on_draw():
+            now = time.perf_counter()
+            if self._last_frame is not None:
+                self.frame_times.append((now - self._last_frame) * 1000)
+            self._last_frame = now
+            self.draw_calls = 0
+            self._labels_before = label_cache.drawn
+            original()
+            self._frame["draw"] = (time.perf_counter() - now) * 1000
+            self._frame["draw calls"] = self.draw_calls
+            self._frame["text labels"] = label_cache.drawn - self._labels_before
+            self._end_frame()
+            self.draw()
+        return on_draw
+
+    def _end_frame(self):
+        # Скользящее среднее по кадрам; секция, не вызванная в кадре, считается за ноль.
+        frame = self._frame
+        for key in set(self.averages) | set(frame):
+            value = frame.get(key, 0.0)
+            average = self.averages.get(key)
+            self.averages[key] = value if average is None else average + (value - average) * self.SMOOTHING
+        frame.clear()
+
+    def customer_count(self):
+        manager = self.game.customer_manager
+        if manager is None:
+            return 0
+        crowd = getattr(manager, "crowd", None)
+        return crowd.count if crowd is not None else len(manager.customers)
+
+    def text_lines(self):
+        avg = self.averages.get
+        frames = self.frame_times
+        frame_ms = sum(frames) / len(frames) if frames else 0.0
+        fps = 1000 / frame_ms if frame_ms else 0.0
+        lines = [
+            f"FPS {fps:5.1f}   frame {frame_ms:5.1f} ms   worst {max(frames, default=0.0):5.1f} ms",
+            f"update {avg('update', 0.0):6.2f} ms   draw {avg('draw', 0.0):6.2f} ms",
+        ]
+        for kind, sections in (("update", UPDATE_SECTIONS), ("draw", DRAW_SECTIONS)):
+            lines.append(f"{kind}:")
+            for label, _, _ in sections:
+                lines.append(f"  {label}\t{avg((kind, label), 0.0):.3f} ms")
+        lines.append(
+            f"draw calls {avg('draw calls', 0.0):5.0f}   text labels {avg('text labels', 0.0):4.0f}"
+            f"   customers {self.customer_count()}"
+        )
+        return lines
+
+    def draw(self):
+        x, y, w, h = self.PANEL
+        left, top = x - w / 2, y + h / 2
+        arcade.draw_rect_filled(arcade.types.XYWH(x, y, w, h), (0, 0, 0, 190))
+
+        # Текст обновляется несколько раз в секунду, иначе подписи перестраивались бы каждый кадр.
+        now = time.perf_counter()
+        if now - self._text_at >= self.TEXT_REFRESH:
+            self._text_at = now
+            self._lines = self.text_lines()
+        # Значения секций — отдельной колонкой после табуляции: шрифт не моноширинный.
+        for i, line in enumerate(self._lines):
+            label, _, value = line.partition("\t")
+            line_y = top - 18 - i * 14
+            draw_dynamic_text(f"perf.line{i}", label, left + 10, line_y, arcade.color.WHITE, 9)
+            if value:
+                draw_dynamic_text(f"perf.value{i}", value, left + 170, line_y, arcade.color.WHITE, 9)
+
+        graph_bottom = y - h / 2 + 8
+        graph_h = 50
+        scale = graph_h / self.GRAPH_MAX_MS
+        step = (w - 20) / self.GRAPH_FRAMES
+        points = []
+        for i, ms in enumerate(self.frame_times):
+            bx = left + 10 + i * step
+            points += [(bx, graph_bottom), (bx, graph_bottom + min(ms, self.GRAPH_MAX_MS) * scale)]
+        if points:
+            arcade.draw_lines(points, arcade.color.LIME_GREEN, max(1.0, step - 1))
+        budget_y = graph_bottom + 1000 / 60 * scale
+        arcade.draw_line(left + 10, budget_y, left + w - 10, budget_y, arcade.color.YELLOW, 1)
@@ -0,0 +1,102 @@
+import random
+from collections import Counter
+
+from content import content
+
+# Меню как данные (content/menu.json). Категория — это слот подноса: в заказе
+# и на подносе её позиция встречается не больше одного раза. Позиция попадает
+# в заказ, если random() > threshold (и уровень не ниже min_level).
+# reward/penalty — очки за верную и неверную позицию, time_bonus — добавка к
+# сроку заказа.
+MENU = content.menu
+BURGER_LAYER_LABELS = content.burger_layers
+
+
+# Скомпилированная позиция меню. key = (категория, вариант) — каноническая
+# хешируемая подпись; для бургера вариант — кортеж слоёв.
+class MenuItem:
+    def __init__(self, category, variant, label, tray_label, reward, penalty):
+        self.category = category
+        self.variant = variant
+        self.key = (category, variant)
+        self.label = label
+        self.tray_label = tray_label
+        self.reward = reward
+        self.penalty = penalty
+        self.layered = isinstance(variant, tuple)
+
+
+# Заказ, сведённый к мультимножеству подписей: проверка подноса — пересечение
+# двух Counter, награда, штраф и добавка ко времени посчитаны заранее.
+class Recipe:
+    def __init__(self, items, time_bonus):
+        self.items = items
+        self.signature = Counter(item.key for item in items)
+        self.time_bonus = time_bonus
+        self.full_reward = sum(item.reward for item in items)
+        self._by_key = {item.key: item for item in items}
+
+    def score(self, tray):
+        matched = self.signature & tray
+        if matched == self.signature:
+            return self.full_reward, 0
+        score = sum(self._by_key[key].reward * n for key, n in matched.items())
+        penalty = sum(self._by_key[key].penalty * n for key, n in (self.signature - matched).items())
+        return score, penalty
+
+
+class RecipeRegistry:
+    def __init__(self, menu=MENU):
+        self.categories = {}
+        self._items = {}
+        for entry in menu:
+            self.categories[entry["category"]] = entry
+            for variant, label in entry.get("variants", {}).items():
+                self._compile(entry, variant, label)
+
+    def _compile(self, entry, variant, label):
+        category = entry["category"]
+        tray_label = entry["label"] if "layers" in entry else label
+        item = MenuItem(category, variant, label, tray_label, entry["reward"], entry["penalty"])
+        self._items[item.key] = item
+        return item
+
+    def item(self, category, variant):
+        # Бургеры компилируются лениво: комбинаций слоёв немного, но заранее их не перечисляем.
+        if isinstance(variant, list):
+            variant = tuple(variant)
+        item = self._items.get((category, variant))
+        if item is None:
+            entry = self.categories[category]
+            label = entry["label"] + ": " + ", ".join(BURGER_LAYER_LABELS.get(l, l) for l in variant)
+            item = self._compile(entry, variant, label)
+        return item
+
+    def generate(self, level, rng=random):
+        items = []
+        for category, entry in self.categories.items():
+            if rng.random() > entry["threshold"] and level >= entry.get("min_level", 1):
+                items.append(self.item(category, self._random_variant(entry, rng)))
+        return self.recipe(items)
+
+    def _random_variant(self, entry, rng):
+        layers = entry.get("layers")
+        if layers is None:
+            variants = list(entry["variants"])
+            return variants[0] if len(variants) == 1 else rng.choice(variants)
+        stack = list(layers["required"])
+        for layer in layers["optional"]:
+            if rng.random() > 0.5 or len(stack) == 1:
+                stack.append(layer)
+        stack.append(layers["closing"])
+        return tuple(stack)
+
+    def recipe(self, items):
+        return Recipe(items, sum(self.categories[item.category]["time_bonus"] for item in items))
+
+    def tray(self, prepared):
+        # Поднос {категория: MenuItem} -> та же подпись, что и у заказа.
+        return Counter(item.key for item in prepared.values())
+
+
+recipes = RecipeRegistry()
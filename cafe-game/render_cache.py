@@ -0,0 +1,103 @@
+import arcade
+import PIL.Image
+from utils import load_texture
+
+
+def render_to_texture(name, width, height, draw, projection=None):
+    # Рисует draw() один раз в область атласа; дальше это обычная текстура.
+    width, height = max(1, int(width)), max(1, int(height))
+    texture = arcade.Texture.create_empty(name, (width, height))
+    arcade.get_window().ctx.default_atlas.add(texture)
+    redraw_texture(texture, draw, projection, clear=False)
+    return texture
+
+
+def redraw_texture(texture, draw, projection=None, clear=True):
+    ctx = arcade.get_window().ctx
+    prev_blend = ctx.blend_func
+    # Альфа копится отдельно от цвета, иначе полупрозрачные слои
+    # делают запечённую текстуру «дырявой».
+    ctx.blend_func = (ctx.SRC_ALPHA, ctx.ONE_MINUS_SRC_ALPHA, ctx.ONE, ctx.ONE_MINUS_SRC_ALPHA)
+    try:
+        with ctx.default_atlas.render_into(texture, projection=projection) as fbo:
+            if clear:
+                fbo.clear(color=(0, 0, 0, 0), viewport=fbo.viewport)
+            draw()
+    finally:
+        ctx.blend_func = prev_blend
+
+
+def release_texture(texture):
+    if texture is None:
+        return
+    atlas = arcade.get_window().ctx.default_atlas
+    if atlas.has_texture(texture):
+        atlas.remove(texture)
+
+
+# Кэш «запечённых» процедурных рисунков. Ключ включает размеры, поэтому
+# изменение body_width/head_radius и т.п. автоматически даёт новую текстуру.
+class BakedTextureCache:
+    def __init__(self):
+        self._textures = {}
+        self.bakes = 0
+
+    def get(self, key, half_width, half_height, draw):
+        texture = self._textures.get(key)
+        if texture is None:
+            texture = render_to_texture(
+                "baked:" + repr(key),
+                half_width * 2, half_height * 2, draw,
+                projection=(-half_width, half_width, -half_height, half_height),
+            )
+            self._textures[key] = texture
+            self.bakes += 1
+        return texture
+
+    def invalidate(self, predicate=None):
+        for key in [k for k in self._textures if predicate is None or predicate(k)]:
+            release_texture(self._textures.pop(key))
+
+    def __len__(self):
+        return len(self._textures)
+
+
+
+# Стопка слоёв (например, бургер) сводится в одну текстуру под конкретный
+# размер отображения; варианты собираются лениво при первом появлении.
+class StackedTextureCache:
+    def __init__(self):
+        self._textures = {}
+        self.builds = 0
+
+    def get(self, paths, size, step):
+        size = max(1, int(size))
+        key = (tuple(paths), size, step)
+        texture = self._textures.get(key)
+        if texture is None:
+            texture = self._build(key)
+            self._textures[key] = texture
+            self.builds += 1
+        return texture
+
+    def _build(self, key):
+        paths, size, step = key
+        height = size + round(step * (len(paths) - 1))
+        canvas = PIL.Image.new("RGBA", (size, max(size, height)), (0, 0, 0, 0))
+        for i, path in enumerate(paths):
+            layer = load_texture(path).image.convert("RGBA").resize((size, size), PIL.Image.LANCZOS)
+            canvas.alpha_composite(layer, (0, round(i * step)))
+        return arcade.Texture(canvas, hash=f"stack:{key}")
+
+    def draw(self, paths, center_x, top_center_y, size, step):
+        # top_center_y — центр первого слоя, каждый следующий ниже на step.
+        texture = self.get(paths, size, step)
+        center_y = top_center_y - step * (len(paths) - 1) / 2
+        arcade.draw_texture_rect(texture, arcade.types.XYWH(center_x, center_y, texture.width, texture.height))
+
+    def __len__(self):
+        return len(self._textures)
+
+
+baked_textures = BakedTextureCache()
+stacked_textures = StackedTextureCache()
@@ -0,0 +1,188 @@
+import argparse
+import hashlib
+import struct
+import time
+
+from save import write_atomic
+
+REPLAY_MAGIC = b"CAFEREC1"
+REPLAY_VERSION = 2
+# magic, версия, сид кампании, ширина и высота окна, фоновая толпа, последний тик,
+# итоговые деньги и счёт, отпечаток состояния (для сверки при воспроизведении), число событий
+HEADER = struct.Struct("<8sHxxQHHIIqq16sI")
+# тик от начала кампании, вид события, клавиша или x, y, кнопка мыши, модификаторы
+EVENT = struct.Struct("<IBiiBH")
+KEY = 0
+CLICK = 1
+
+
+def state_digest(game, tick):
+    # Отпечаток симуляции: одних денег и счёта мало — у разошедшихся прогонов они
+    # часто совпадают (например, оба по нулям). Сюда входят состояния потоков
+    # случайных чисел, тикеты заказов и клиенты с их целями.
+    orders = [
+        (order.customer_id, order.ticket, tuple(item.key for item in order.items))
+        for order in game.order_system.board
+    ]
+    customers = [
+        (customer.id, round(float(customer.target_x), 3), customer.state)
+        for customer in game.customer_manager.customers
+    ]
+    state = (tick, game.money, int(game.score), game.rng.states(), orders, customers)
+    return hashlib.blake2b(repr(state).encode(), digest_size=16).digest()
+
+
+# Запись ввода одной кампании: сид и размеры окна плюс клавиши и клики с тиком
+# симуляции, на котором они пришли. Ввод применяется между шагами, поэтому
+# тик однозначно задаёт, что он застал, и прогон повторяется точь-в-точь.
+class InputLog:
+    def __init__(self, seed, width, height, stress_crowd=0):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.stress_crowd = stress_crowd
+        self.events = []
+        self.end_tick = 0
+        self.money = 0
+        self.score = 0
+        self.digest = bytes(16)
+
+    def to_bytes(self):
+        parts = [HEADER.pack(
+            REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.width, self.height, self.stress_crowd,
+            self.end_tick, self.money, int(self.score), self.digest, len(self.events),
+        )]
+        parts += [EVENT.pack(*event) for event in self.events]
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data, source="replay"):
+        if len(data) < HEADER.size:
+            raise ValueError(f"{source}: truncated recording")
+        magic, version, seed, width, height, stress, end_tick, money, score, digest, count = HEADER.unpack_from(data, 0)
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"{source}: not an input recording")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"{source}: recording version {version} is not supported (expected {REPLAY_VERSION})")
+        if len(data) != HEADER.size + count * EVENT.size:
+            raise ValueError(f"{source}: truncated recording")
+        log = cls(seed, width, height, stress)
+        log.end_tick, log.money, log.score, log.digest = end_tick, money, score, digest
+        log.events = list(EVENT.iter_unpack(memoryview(data)[HEADER.size:]))
+        return log
+
+    def save(self, path):
+        write_atomic(path, self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read(), path)
+
+
+class InputRecorder:
+    def __init__(self, game):
+        self.game = game
+        self.origin = game.sim_tick
+        self.log = InputLog(game.rng.seed, game.width, game.height, game.stress_crowd)
+
+    @property
+    def tick(self):
+        return self.game.sim_tick - self.origin
+
+    def key(self, key, modifiers=0):
+        self.log.events.append((self.tick, KEY, key, 0, 0, modifiers))
+
+    def click(self, x, y, button=0, modifiers=0):
+        self.log.events.append((self.tick, CLICK, int(x), int(y), button, modifiers))
+
+    def finish(self):
+        log = self.log
+        log.end_tick = self.tick
+        log.money = self.game.money
+        log.score = self.game.score
+        log.digest = state_digest(self.game, log.end_tick)
+        return log
+
+
+# Подаёт записанный ввод в игру: feed() перед каждым шагом симуляции
+# применяет события, пришедшие на текущем тике. Игра должна быть запущена
+# с сидом записи (start_campaign после game.seed = log.seed).
+class InputReplayer:
+    def __init__(self, log, game):
+        self.log = log
+        self.game = game
+        self.origin = game.sim_tick
+        self._next = 0
+
+    @property
+    def tick(self):
+        return self.game.sim_tick - self.origin
+
+    @property
+    def done(self):
+        return self.tick >= self.log.end_tick
+
+    def feed(self):
+        events = self.log.events
+        tick = self.tick
+        while self._next < len(events) and events[self._next][0] <= tick:
+            _, kind, a, b, _, _ = events[self._next]
+            self._next += 1
+            if kind == KEY:
+                self.game.handle_key(a)
+            else:
+                self.game.handle_click(a, b)
+
+    def matches(self):
+        return state_digest(self.game, self.tick) == self.log.digest
+
+    def report(self):
+        verdict = "reproduced" if self.matches() else "DIVERGED"
+        return (
+            f"replay {verdict}: money {self.game.money} (recorded {self.log.money}), "
+            f"score {self.game.score} (recorded {self.log.score}), "
+            f"state {state_digest(self.game, self.tick).hex()[:12]} (recorded {self.log.digest.hex()[:12]}) "
+            f"after {self.tick} ticks"
+        )
+
+
+def replay_headless(log):
+    # Без окна и с максимальной скоростью: те же правила, что и в окне.
+    from headless import HeadlessGame
+
+    with HeadlessGame(log.width, log.height, stress_crowd=log.stress_crowd, seed=log.seed) as game:
+        game.start_campaign()
+        replayer = InputReplayer(log, game)
+        start = time.perf_counter()
+        while True:
+            # Ввод последнего тика (пришедший уже после последнего шага) тоже применяется.
+            replayer.feed()
+            if replayer.done:
+                break
+            game.simulate(game.delta_time)
+    return replayer, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay an input recording (python main.py --record) without a window")
+    parser.add_argument("recording")
+    parser.add_argument("--repeat", type=int, default=1, help="replay several times and report the best run")
+    args = parser.parse_args(argv)
+    log = InputLog.load(args.recording)
+    print(
+        f"{args.recording}: seed {log.seed}, {len(log.events)} events over {log.end_tick} ticks"
+        + (f", crowd {log.stress_crowd}" if log.stress_crowd else "")
+    )
+    best = None
+    for _ in range(args.repeat):
+        replayer, elapsed = replay_headless(log)
+        best = elapsed if best is None else min(best, elapsed)
+    ticks = max(1, log.end_tick)
+    print(replayer.report())
+    print(f"{ticks} ticks in {best * 1000:.1f} ms ({best / ticks * 1e6:.1f} us/tick)")
+    raise SystemExit(0 if replayer.matches() else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+import argparse
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+from recipes import recipes
+
+SAVE_PATH = "savegame.bin"
+SAVE_MAGIC = b"CAFESAVE"
+# Меняется при любом изменении раскладки ниже; чужую версию from_bytes отвергает.
+SAVE_VERSION = 1
+# magic, версия, CRC32 тела
+HEADER = struct.Struct("<8sHxxI")
+# уровень, деньги, счёт, тик симуляции, прошло секунд уровня
+GAME = struct.Struct("<Hqqqd")
+# кулдаун готов, остаток кулдауна, следующий тикет, выполнено, провалено, просрочено, число заказов
+ORDERS = struct.Struct("<?dIIIIH")
+# тикет, место у стойки, срок, осталось; клиент: x, целевой x, ждёт ли у стойки
+ORDER = struct.Struct("<IHddff?")
+# картошка: время готовки, прошло, готова, лежит на подносе
+FRIES = struct.Struct("<dd??")
+U8 = struct.Struct("<B")
+
+
+class SaveWriter:
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def pack(self, fmt, *values):
+        self.buffer += fmt.pack(*values)
+
+    def string(self, value):
+        data = value.encode("utf-8")
+        self.buffer += U8.pack(len(data))
+        self.buffer += data
+
+    def strings(self, values):
+        self.buffer += U8.pack(len(values))
+        for value in values:
+            self.string(value)
+
+
+class SaveReader:
+    def __init__(self, data, pos=0):
+        self.data = data
+        self.pos = pos
+
+    def unpack(self, fmt):
+        values = fmt.unpack_from(self.data, self.pos)
+        self.pos += fmt.size
+        return values
+
+    def string(self):
+        (n,) = self.unpack(U8)
+        if self.pos + n > len(self.data):
+            raise struct.error(f"string of {n} bytes runs past the end of the data")
+        value = bytes(self.data[self.pos:self.pos + n]).decode("utf-8")
+        self.pos += n
+        return value
+
+    def strings(self):
+        (n,) = self.unpack(U8)
+        return [self.string() for _ in range(n)]
+
+
+# Снимок партии: уровень, деньги и счёт, время уровня, заказы на доске (с их
+# клиентами у стойки) и поднос на кухне. Двоичный формат на struct: заголовок
+# с версией и CRC32, дальше поля фиксированной раскладки и строки с длиной.
+# Позиция заказа хранится как (категория, вариант) и компилируется заново
+# через recipes.item, так что снимок не зависит от объектов MenuItem.
+class Snapshot:
+    def __init__(self):
+        self.level = 1
+        self.money = 0
+        self.score = 0
+        self.sim_tick = 0
+        self.level_elapsed = 0.0
+        self.cooldown_ready = True
+        self.cooldown_left = 0.0
+        self.next_ticket = 1
+        self.orders_succeeded = 0
+        self.orders_failed = 0
+        self.orders_expired = 0
+        # (тикет, место, тип клиента, срок, осталось, (x, целевой x, ждёт), [(категория, вариант)])
+        self.orders = []
+        self.burger_assembly = []
+        self.tray_burger = None
+        self.fries = (0.0, 0.0, False, False)
+        self.icecream = ""
+        self.drink = ""
+
+    @classmethod
+    def capture(cls, game):
+        snap = cls()
+        snap.level = game.current_level
+        snap.money = game.money
+        snap.score = game.score
+        snap.sim_tick = game.sim_tick
+        snap.level_elapsed = game.level_manager.elapsed_time
+
+        orders = game.order_system
+        snap.cooldown_ready = orders.cooldown_ready
+        snap.cooldown_left = orders.order_cooldown
+        snap.next_ticket = orders.next_ticket
+        snap.orders_succeeded = orders.orders_succeeded
+        snap.orders_failed = orders.orders_failed
+        snap.orders_expired = orders.orders_expired
+        for order in orders.active_orders:
+            customer = game.customer_manager.find(order.customer_id)
+            if customer is None:
+                continue
+            snap.orders.append((
+                order.ticket, order.slot, order.customer_type, order.max_time, order.time_left(),
+                (customer.center_x, customer.target_x, customer.state == "waiting"),
+                [item.key for item in order.items],
+            ))
+
+        food = game.food_manager
+        snap.burger_assembly = list(food.burger_assembly)
+        burger = food.equipped_items.get("burger")
+        snap.tray_burger = list(burger) if burger is not None else None
+        fries = food.fries
+        snap.fries = (
+            fries.preparation_time, fries.preparation_progress, fries.is_prepared,
+            "fries" in food.equipped_items,
+        )
+        snap.icecream = food.icecream.name if food.icecream else ""
+        snap.drink = food.drink.name if food.drink else ""
+        return snap
+
+    def restore(self, game):
+        # Как start_campaign, только состояние берётся из снимка.
+        game.scheduler.clear()
+        game.game_state = "PLAYING"
+        game.level_complete_timer = None
+        game.current_level = self.level
+        game.sim_tick = self.sim_tick
+        game.level_manager.load_level(self.level, self.level_elapsed)
+        game.money = self.money
+        game.score = self.score
+        game.customer_manager.setup_customers()
+
+        food = game.food_manager
+        food.reset_inventory()
+        food.burger_assembly = list(self.burger_assembly)
+        if self.tray_burger is not None:
+            food.equipped_items["burger"] = list(self.tray_burger)
+        prep_time, prep_elapsed, fries_ready, fries_on_tray = self.fries
+        if fries_on_tray:
+            food.equipped_items["fries"] = "cooked"
+        if fries_ready:
+            food.fries.preparation_time = prep_time
+            food.fries.is_prepared = True
+        elif prep_time > 0:
+            food.fries.start_preparing(prep_time, game.scheduler, prep_elapsed)
+        if self.icecream:
+            food.prepare_icecream(self.icecream)
+        if self.drink:
+            food.prepare_drink(self.drink)
+
+        # order_system тянет arcade: на уровне модуля импорт сломал бы save.py --bench
+        # без дисплея (headless должен успеть выключить теневое окно pyglet).
+        from order_system import Order
+
+        orders = game.order_system
+        orders.reset_orders()
+        orders.next_ticket = self.next_ticket
+        orders.orders_succeeded = self.orders_succeeded
+        orders.orders_failed = self.orders_failed
+        orders.orders_expired = self.orders_expired
+        if not self.cooldown_ready:
+            orders.start_cooldown(self.cooldown_left)
+        for ticket, slot, customer_type, max_time, time_left, (x, target_x, waiting), keys in self.orders:
+            recipe = recipes.recipe([recipes.item(category, variant) for category, variant in keys])
+            order = Order(game, customer_type, ticket=ticket, recipe=recipe)
+            order.max_time = max_time
+            order.slot = slot
+            customer = game.customer_manager.place_customer(target_x, x, "waiting" if waiting else "entering")
+            orders.place_order(order, customer.id, time_left)
+
+    def to_bytes(self):
+        w = SaveWriter()
+        w.pack(GAME, self.level, self.money, self.score, self.sim_tick, self.level_elapsed)
+        w.pack(
+            ORDERS, self.cooldown_ready, self.cooldown_left, self.next_ticket,
+            self.orders_succeeded, self.orders_failed, self.orders_expired, len(self.orders),
+        )
+        for ticket, slot, customer_type, max_time, time_left, (x, target_x, waiting), keys in self.orders:
+            w.pack(ORDER, ticket, slot, max_time, time_left, x, target_x, waiting)
+            w.string(customer_type)
+            w.pack(U8, len(keys))
+            for category, variant in keys:
+                w.string(category)
+                # Вариант бургера — список слоёв, остальных позиций — одна строка.
+                if isinstance(variant, tuple):
+                    w.strings(variant)
+                else:
+                    w.pack(U8, 0)
+                    w.string(variant)
+        w.strings(self.burger_assembly)
+        w.pack(U8, self.tray_burger is not None)
+        if self.tray_burger is not None:
+            w.strings(self.tray_burger)
+        w.pack(FRIES, *self.fries)
+        w.string(self.icecream)
+        w.string(self.drink)
+        body = bytes(w.buffer)
+        return HEADER.pack(SAVE_MAGIC, SAVE_VERSION, zlib.crc32(body)) + body
+
+    @classmethod
+    def from_bytes(cls, data, source=SAVE_PATH):
+        if len(data) < HEADER.size:
+            raise ValueError(f"{source}: truncated save")
+        magic, version, crc = HEADER.unpack_from(data, 0)
+        if magic != SAVE_MAGIC:
+            raise ValueError(f"{source}: not a save file")
+        if version != SAVE_VERSION:
+            raise ValueError(f"{source}: save version {version} is not supported (expected {SAVE_VERSION})")
+        body = memoryview(data)[HEADER.size:]
+        if zlib.crc32(body) != crc:
+            raise ValueError(f"{source}: checksum mismatch")
+        r = SaveReader(body)
+        snap = cls()
+        try:
+            snap.level, snap.money, snap.score, snap.sim_tick, snap.level_elapsed = r.unpack(GAME)
+            (
+                snap.cooldown_ready, snap.cooldown_left, snap.next_ticket,
+                snap.orders_succeeded, snap.orders_failed, snap.orders_expired, count,
+            ) = r.unpack(ORDERS)
+            for _ in range(count):
+                ticket, slot, max_time, time_left, x, target_x, waiting = r.unpack(ORDER)
+                customer_type = r.string()
+                (n_items,) = r.unpack(U8)
+                keys = []
+                for _ in range(n_items):
+                    category = r.string()
+                    layers = r.strings()
+                    keys.append((category, tuple(layers) if layers else r.string()))
+                snap.orders.append((ticket, slot, customer_type, max_time, time_left, (x, target_x, waiting), keys))
+            snap.burger_assembly = r.strings()
+            (has_burger,) = r.unpack(U8)
+            snap.tray_burger = r.strings() if has_burger else None
+            snap.fries = r.unpack(FRIES)
+            snap.icecream = r.string()
+            snap.drink = r.string()
+        except (struct.error, UnicodeDecodeError) as e:
+            raise ValueError(f"{source}: corrupt save ({e})") from None
+        if r.pos != len(body):
+            raise ValueError(f"{source}: corrupt save ({len(body) - r.pos} trailing bytes)")
+        return snap
+
+
+def write_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path=SAVE_PATH):
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    return Snapshot.from_bytes(data, path)
+
+
+# Автосохранение: снимок кодируется в главном потоке (доли миллисекунды),
+# запись на диск — в фоновом потоке через временный файл и os.replace, так
+# что кадр никогда не ждёт диска, а файл на диске всегда целый. Если поток
+# не успевает, из очереди пишется только самый свежий снимок.
+class AutoSaver:
+    def __init__(self, path=SAVE_PATH):
+        self.path = path
+        self._jobs = queue.Queue()
+        self._thread = None
+        self.closed = False
+        self.writes = 0
+        self.errors = 0
+        self.last_encode_ms = 0.0
+        self.last_write_ms = 0.0
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+            self._thread.start()
+
+    def save(self, game):
+        if self.closed:
+            return
+        start = time.perf_counter()
+        data = Snapshot.capture(game).to_bytes()
+        self.last_encode_ms = (time.perf_counter() - start) * 1000
+        self._ensure_thread()
+        self._jobs.put(data)
+
+    def discard(self):
+        # Кампания закончилась — продолжать нечего. Идёт через ту же очередь,
+        # чтобы отложенная запись не вернула файл после удаления.
+        if self.closed:
+            return
+        self._ensure_thread()
+        self._jobs.put(b"")
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _run(self):
+        running = True
+        while running:
+            jobs = [self._jobs.get()]
+            try:
+                while True:
+                    jobs.append(self._jobs.get_nowait())
+            except queue.Empty:
+                pass
+            # None — сигнал остановки; перед выходом всё равно пишем последний снимок.
+            running = None not in jobs
+            data = [job for job in jobs if job is not None]
+            try:
+                if data:
+                    self._write(data[-1])
+            finally:
+                for _ in jobs:
+                    self._jobs.task_done()
+
+    def _write(self, data):
+        start = time.perf_counter()
+        try:
+            if data:
+                write_atomic(self.path, data)
+                self.writes += 1
+            elif os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError as e:
+            self.errors += 1
+            print(f"autosave failed: {e}")
+        self.last_write_ms = (time.perf_counter() - start) * 1000
+
+    def flush(self):
+        if self._thread is not None:
+            self._jobs.join()
+
+    def close(self):
+        # Окно зовёт close() ещё раз из __del__ при выходе — тогда уже ничего не пишем.
+        self.closed = True
+        if self._thread is not None:
+            self._jobs.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+def benchmark(runs, play_seconds):
+    # Снимок в разгаре уровня: скриптовый игрок из balance_sim набирает заказы и поднос.
+    import random
+
+    from balance_sim import Policy
+    from headless import HeadlessGame
+
+    with HeadlessGame(seed=1) as game, HeadlessGame() as restored:
+        game.start_campaign()
+        policy = Policy("scripted", random.Random(1))
+        for _ in range(int(play_seconds / game.delta_time)):
+            policy(game)
+            game.simulate(game.delta_time)
+        _time_snapshot(game, restored, runs)
+
+
+def _time_snapshot(game, restored, runs):
+    snap = Snapshot.capture(game)
+    data = snap.to_bytes()
+    timings = {}
+    for name, step in (
+        ("capture", lambda: Snapshot.capture(game)),
+        ("encode", snap.to_bytes),
+        ("capture+encode", lambda: Snapshot.capture(game).to_bytes()),
+        ("decode", lambda: Snapshot.from_bytes(data)),
+    ):
+        start = time.perf_counter()
+        for _ in range(runs):
+            step()
+        timings[name] = (time.perf_counter() - start) / runs * 1000
+
+    Snapshot.from_bytes(data).restore(restored)
+    assert Snapshot.capture(restored).to_bytes() == data, "restore round trip differs"
+
+    print(f"snapshot: level {snap.level}, {len(snap.orders)} orders, {len(data)} bytes")
+    for name, ms in timings.items():
+        print(f"  {name:<15} {ms * 1000:8.1f} us")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or benchmark binary save snapshots")
+    parser.add_argument("--bench", action="store_true", help="time snapshot capture and (de)serialisation")
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--play", type=float, default=40.0, help="seconds of scripted play before the snapshot")
+    parser.add_argument("path", nargs="?", default=SAVE_PATH)
+    args = parser.parse_args(argv)
+    if args.bench:
+        benchmark(args.runs, args.play)
+        return
+    snap = load_snapshot(args.path)
+    if snap is None:
+        print(f"{args.path}: no save")
+        return
+    print(
+        f"{args.path}: level {snap.level}, money {snap.money}, score {snap.score}, "
+        f"{snap.level_elapsed:.1f} s into the level, {len(snap.orders)} orders"
+    )
+
+
+if __name__ == "__main__":
+    main()
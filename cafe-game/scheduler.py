@@ -0,0 +1,137 @@
+import heapq
+
+
+class Timer:
+    def __init__(self, deadline, seq, callback, name, group):
+        self.deadline = deadline
+        self.seq = seq
+        self.callback = callback
+        self.name = name
+        self.group = group
+        self.cancelled = False
+        self.fired = False
+        # Остаток времени, пока группа таймера приостановлена (suspend).
+        self.held = None
+
+    def __lt__(self, other):
+        return (self.deadline, self.seq) < (other.deadline, other.seq)
+
+
+# Планировщик игровых таймеров на min-куче дедлайнов: каждый тик снимаются
+# только наступившие события, остальные таймеры не трогаются. Время — время
+# симуляции (advance(dt)), pause() замораживает его целиком, suspend(group)
+# откладывает одну группу (например, геймплей на заставке между уровнями).
+# Отмена ленивая: запись остаётся в куче и выбрасывается при извлечении.
+class Scheduler:
+    COMPACT_MIN = 32
+
+    def __init__(self):
+        self.now = 0.0
+        self.paused = False
+        self._heap = []
+        self._held = {}
+        self._seq = 0
+        self._cancelled = 0
+        self.fired = 0
+
+    def call_later(self, delay, callback, name="", group="gameplay"):
+        timer = Timer(self.now + max(0.0, delay), self._seq, callback, name, group)
+        self._seq += 1
+        if group in self._held:
+            timer.held = max(0.0, delay)
+            self._held[group].append(timer)
+        else:
+            heapq.heappush(self._heap, timer)
+        return timer
+
+    def cancel(self, timer):
+        if timer is None or timer.cancelled or timer.fired:
+            return
+        timer.cancelled = True
+        if timer.held is not None:
+            self._held[timer.group].remove(timer)
+            return
+        self._cancelled += 1
+        if self._cancelled > self.COMPACT_MIN and self._cancelled * 2 > len(self._heap):
+            self._heap = [t for t in self._heap if not t.cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def remaining(self, timer):
+        if timer is None or timer.cancelled or timer.fired:
+            return 0.0
+        if timer.held is not None:
+            return timer.held
+        return max(0.0, timer.deadline - self.now)
+
+    def advance(self, delta_time):
+        if self.paused:
+            return 0
+        self.now += delta_time
+        fired = 0
+        heap = self._heap
+        while heap and heap[0].deadline <= self.now:
+            timer = heapq.heappop(heap)
+            if timer.cancelled:
+                self._cancelled -= 1
+                continue
+            timer.fired = True
+            fired += 1
+            timer.callback()
+        self.fired += fired
+        return fired
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def suspend(self, group):
+        if group in self._held:
+            return
+        held = self._held[group] = []
+        keep = []
+        for timer in self._heap:
+            if timer.cancelled:
+                continue
+            if timer.group == group:
+                timer.held = max(0.0, timer.deadline - self.now)
+                held.append(timer)
+            else:
+                keep.append(timer)
+        heapq.heapify(keep)
+        self._heap = keep
+        self._cancelled = 0
+
+    def unsuspend(self, group):
+        for timer in self._held.pop(group, []):
+            timer.deadline = self.now + timer.held
+            timer.held = None
+            heapq.heappush(self._heap, timer)
+
+    def clear(self):
+        # Выброшенные таймеры помечаются отменёнными, чтобы поздний cancel() их владельцев
+        # не сбил счётчик отмен.
+        for timer in self.pending():
+            timer.cancelled = True
+        self._heap = []
+        self._held = {}
+        self._cancelled = 0
+        self.paused = False
+
+    def pending(self):
+        timers = [t for t in self._heap if not t.cancelled]
+        for held in self._held.values():
+            timers.extend(held)
+        return sorted(timers, key=lambda t: (self.remaining(t), t.seq))
+
+    def dump(self):
+        lines = [f"t={self.now:.2f}s paused={self.paused} pending={len(self)} fired={self.fired}"]
+        for timer in self.pending():
+            state = " (suspended)" if timer.held is not None else ""
+            lines.append(f"  {self.remaining(timer):8.2f}s  {timer.group:<9} {timer.name}{state}")
+        return "\n".join(lines)
+
+    def __len__(self):
+        return len(self._heap) - self._cancelled + sum(len(h) for h in self._held.values())
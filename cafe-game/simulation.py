@@ -0,0 +1,205 @@
+import random
+
+import arcade
+from content import content
+from levels import LevelManager
+from customer import CustomerManager
+from food import FoodManager
+from hit_test import HitGrid
+from scheduler import Scheduler
+from startup_trace import startup_trace
+from order_system import OrderSystem
+
+LAST_LEVEL = content.last_level
+
+
+# Именованные потоки случайных чисел от одного сида кампании: заказы, клиенты
+# и фоновая толпа не сбивают последовательности друг друга, и весь прогон
+# (вместе с записью ввода, replay.py) воспроизводится по сиду.
+class RandomStreams:
+    NAMES = ("orders", "customers")
+
+    def __init__(self, seed=None):
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(63)
+        for name in self.NAMES:
+            setattr(self, name, random.Random(self.seed_for(name)))
+        self._numpy = {}
+
+    def seed_for(self, name):
+        # Строковый сид random.Random хешируется SHA-512 — не зависит от PYTHONHASHSEED.
+        return random.Random(f"{self.seed}:{name}").getrandbits(63)
+
+    def numpy(self, name):
+        generator = self._numpy.get(name)
+        if generator is None:
+            # NumPy нужен только стресс-уровню, импортируем по первому запросу.
+            import numpy as np
+            generator = self._numpy[name] = np.random.default_rng(self.seed_for(name))
+        return generator
+
+    def states(self):
+        # Текущие состояния всех потоков (для сверки прогонов), NumPy — только созданные.
+        states = [(name, getattr(self, name).getstate()) for name in self.NAMES]
+        states += [(name, self._numpy[name].bit_generator.state) for name in sorted(self._numpy)]
+        return states
+
+
+# Правила игры без отрисовки: общий код для окна (FastFoodGame) и для
+# безоконного прогона (headless.HeadlessGame). Хозяин миксина должен иметь
+# width/height и поля состояния, заведённые в init_simulation_state.
+class SimulationRules:
+    # Симуляция идёт фиксированным шагом независимо от частоты кадров.
+    SIM_DT = 1 / 60
+    MAX_SIM_STEPS = 5
+    LEVEL_COMPLETE_DELAY = 3.0
+
+    # False — нет окна и GL: спрайты, подписи и звук не создаются.
+    rendering = True
+    # >0 — стресс-уровень: клиенты в массивах NumPy (crowd.py) и столько же
+    # фоновых посетителей вокруг обычного потока заказов.
+    stress_crowd = 0
+    # None — у каждой кампании свой случайный сид; число — все кампании с этим сидом.
+    seed = None
+
+    # Кнопка КУХНЯ в HUD: рисует её ui.RetainedHud, а клик нужен и без окна (replay.py).
+    HUD_KITCHEN_BUTTON = (1150, 680, 100, 50)
+    HIT_Z_HUD = 100
+
+    def init_simulation_state(self):
+        self.game_state = "MENU"
+        self.show_cooking_frame = False
+        self.level_complete_timer = None
+        self.sim_tick = 0
+        self.scheduler = Scheduler()
+        self.hit_grid = HitGrid()
+        self.rng = RandomStreams(self.seed)
+        x, y, w, h = self.HUD_KITCHEN_BUTTON
+        self.hit_grid.add("hud.kitchen", "hud", x, y, w, h, self.toggle_kitchen, z=self.HIT_Z_HUD)
+        self.current_level = 1
+        self.money = 500
+        self.score = 0
+        self.level_manager = None
+        self.customer_manager = None
+        self.food_manager = None
+        self.order_system = None
+
+    def manager_factories(self):
+        # Порядок важен: следующие менеджеры обращаются к уже созданным.
+        return [
+            ("level_manager", lambda: LevelManager(self)),
+            ("customer_manager", self.create_customer_manager),
+            ("food_manager", lambda: FoodManager(self)),
+            ("order_system", lambda: OrderSystem(self)),
+        ]
+
+    def create_customer_manager(self):
+        if self.stress_crowd:
+            # crowd.py тянет NumPy — импортируем только для стресс-уровня.
+            from crowd import CrowdCustomerManager, CROWD_AVAILABLE
+            if CROWD_AVAILABLE:
+                return CrowdCustomerManager(self, self.stress_crowd)
+        return CustomerManager(self)
+
+    def setup_simulation_managers(self):
+        for name, factory in self.manager_factories():
+            with startup_trace.span(name):
+                setattr(self, name, factory())
+
+    def hit_layers(self):
+        # Какие слои хит-теста принимают мышь в текущем состоянии.
+        if self.game_state == "MENU":
+            return ("menu",)
+        if self.game_state == "GAME_OVER":
+            return ("game_over",)
+        if self.game_state == "PLAYING":
+            return ("hud", "kitchen") if self.show_cooking_frame else ("hud", "customers")
+        return ()
+
+    def start_campaign(self):
+        self.scheduler.clear()
+        self.rng.reset(self.seed)
+        self.game_state = "PLAYING"
+        self.current_level = 1
+        self.money = 500
+        self.score = 0
+        self.level_manager.load_level(self.current_level)
+        self.customer_manager.setup_customers()
+        self.food_manager.reset_inventory()
+        self.order_system.reset_orders()
+
+    def next_level(self):
+        self.current_level += 1
+        if self.current_level > LAST_LEVEL:
+            self.game_state = "GAME_OVER"
+            return
+        self.level_manager.load_level(self.current_level)
+        self.customer_manager.setup_customers()
+        # Клиенты прошлого уровня ушли — их тикеты закрываются без штрафа.
+        self.order_system.clear_tickets()
+
+    def toggle_kitchen(self):
+        self.show_cooking_frame = not self.show_cooking_frame
+
+    def handle_key(self, key):
+        # Игровые клавиши: общие для окна и воспроизведения записи.
+        if key == arcade.key.ESCAPE:
+            if self.game_state == "PLAYING" and self.show_cooking_frame:
+                self.show_cooking_frame = False
+            elif self.game_state == "PLAYING":
+                self.set_paused(True)
+            elif self.game_state == "PAUSED":
+                self.set_paused(False)
+        elif self.game_state == "PLAYING":
+            if key == arcade.key.K:
+                self.toggle_kitchen()
+            elif self.show_cooking_frame:
+                if key == arcade.key.NUM_1:
+                    self.food_manager.select_ingredient("burger")
+                elif key == arcade.key.NUM_2:
+                    self.food_manager.select_ingredient("fries")
+                elif key == arcade.key.NUM_3:
+                    self.food_manager.select_ingredient("icecream")
+                elif key == arcade.key.NUM_4:
+                    self.food_manager.select_ingredient("drink")
+
+    def handle_click(self, x, y):
+        if self.game_state == "PLAYING":
+            # HUD, кухня и клиенты — один запрос к сетке, верхняя по z область забирает клик.
+            self.hit_grid.dispatch(x, y, self.hit_layers())
+
+    def set_paused(self, paused):
+        if paused:
+            self.game_state = "PAUSED"
+            self.scheduler.pause()
+        else:
+            self.game_state = "PLAYING"
+            self.scheduler.resume()
+
+    def simulate(self, delta_time):
+        self.sim_tick += 1
+        if self.game_state == "PLAYING":
+            self.customer_manager.update(delta_time)
+            self.scheduler.advance(delta_time)
+            self.order_system.update(delta_time)
+            if self.level_manager.is_level_complete():
+                self.complete_level()
+        elif self.game_state == "LEVEL_COMPLETE":
+            self.scheduler.advance(delta_time)
+
+    def complete_level(self):
+        self.game_state = "LEVEL_COMPLETE"
+        # На заставке заказы, готовка и кулдаун замирают до следующего уровня.
+        self.scheduler.suspend("gameplay")
+        self.level_complete_timer = self.scheduler.call_later(
+            self.LEVEL_COMPLETE_DELAY, self._leave_level_complete, "level.complete", group="level"
+        )
+
+    def _leave_level_complete(self):
+        self.level_complete_timer = None
+        self.next_level()
+        if self.game_state != "GAME_OVER":
+            self.game_state = "PLAYING"
+            self.scheduler.unsuspend("gameplay")
@@ -0,0 +1,78 @@
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+
+
+# Трассировка запуска (python main.py --trace-startup): сколько заняли импорт
+# каждого модуля (вместе с вложенными), конструкторы и шаги, обёрнутые в
+# span(), и когда наступили вехи mark(). Выключенная трассировка стоит одну
+# проверку на span; импорты перехватываются только после enable().
+class StartupTrace:
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.events = []
+        self._depth = 0
+        self._original_import = None
+
+    def enable(self, origin=None):
+        if self.enabled:
+            return
+        self.enabled = True
+        if origin is not None:
+            self.origin = origin
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def disable(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+        self.enabled = False
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Засекаем только первый импорт модуля; повторные — поиск в sys.modules.
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        with self.span(name, "import"):
+            return self._original_import(name, globals, locals, fromlist, level)
+
+    def _ms(self, t):
+        return (t - self.origin) * 1000
+
+    @contextmanager
+    def span(self, name, kind="init"):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        depth = self._depth
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.events.append((kind, name, self._ms(start), (time.perf_counter() - start) * 1000, depth))
+
+    def mark(self, name):
+        if self.enabled:
+            self.events.append(("mark", name, self._ms(time.perf_counter()), 0.0, 0))
+
+    def report(self, top_imports=15):
+        imports = sorted((e for e in self.events if e[0] == "import"), key=lambda e: -e[3])
+        lines = [f"startup trace: {len(imports)} imports"]
+        for _, name, start, duration, depth in imports[:top_imports]:
+            lines.append(f"  import {name:<40} {duration:8.1f} ms  (at {start:7.1f} ms, depth {depth})")
+        lines.append("constructors and steps:")
+        for kind, name, start, duration, depth in sorted(
+            (e for e in self.events if e[0] != "import"), key=lambda e: e[2]
+        ):
+            if kind == "mark":
+                lines.append(f"  {start:8.1f} ms  * {name}")
+            else:
+                lines.append(f"  {start:8.1f} ms  {'  ' * depth}{name:<32} {duration:8.1f} ms")
+        return "\n".join(lines)
+
+
+startup_trace = StartupTrace()
@@ -0,0 +1,27 @@
+import os
+import sys
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+# Модули игры ищут content/, images/ и sounds/ относительно рабочего каталога.
+os.chdir(GAME_DIR)
+
+# Без окна: headless отключает теневое GL-окно до первого импорта arcade.
+import headless  # noqa: E402
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def make_game():
+    # Безоконные игры закрываются после теста — текстуры и звук процесса возвращаются.
+    games = []
+
+    def make(**kwargs):
+        game = headless.HeadlessGame(**kwargs)
+        games.append(game)
+        return game
+
+    yield make
+    for game in games:
+        game.close()
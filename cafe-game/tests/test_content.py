@@ -0,0 +1,71 @@
+import copy
+import json
+import os
+import re
+import shutil
+
+import pytest
+
+from content import CONTENT_DIR, compile_kitchen, compile_levels, compile_menu, load_content
+
+
+def _load(name):
+    with open(os.path.join(CONTENT_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_shipped_tables_compile():
+    assert compile_levels(_load("levels.json"))["levels"]
+    assert compile_kitchen(_load("kitchen.json"))["equipment_positions"]
+    assert compile_menu(_load("menu.json"))["menu"]
+
+
+@pytest.mark.parametrize("edit, message", [
+    (lambda d: d["levels"][0].pop("time_limit"), "levels[0]: missing 'time_limit'"),
+    (lambda d: d["levels"][1].update(number=5), "levels[1].number must be 2"),
+    (lambda d: d["levels"][0].update(max_orders=0), "max_orders must be at least 1"),
+    (lambda d: d["levels"][0].update(starting_money="lots"), "levels[0].starting_money: bad value 'lots'"),
+    (lambda d: d.update(levels=[]), "'levels' must be a non-empty list"),
+])
+def test_level_errors_name_the_bad_field(edit, message):
+    data = copy.deepcopy(_load("levels.json"))
+    edit(data)
+    with pytest.raises(ValueError, match=re.escape(message)):
+        compile_levels(data)
+
+
+def test_kitchen_rejects_duplicate_ids():
+    data = copy.deepcopy(_load("kitchen.json"))
+    data["equipment"].append(copy.deepcopy(data["equipment"][0]))
+    with pytest.raises(ValueError, match="duplicate id"):
+        compile_kitchen(data)
+
+
+def test_menu_rejects_unknown_burger_layers_and_ambiguous_entries():
+    data = copy.deepcopy(_load("menu.json"))
+    data["menu"][0]["layers"]["optional"].append("bacon")
+    with pytest.raises(ValueError, match="no label for"):
+        compile_menu(data)
+
+    data = copy.deepcopy(_load("menu.json"))
+    data["menu"][1]["layers"] = data["menu"][0]["layers"]
+    with pytest.raises(ValueError, match="exactly one of 'variants' or 'layers'"):
+        compile_menu(data)
+
+
+def test_cache_is_keyed_by_file_contents(tmp_path):
+    directory = tmp_path / "content"
+    shutil.copytree(CONTENT_DIR, directory, ignore=shutil.ignore_patterns("__pycache__"))
+    first = load_content(str(directory))
+    assert not first.from_cache
+    second = load_content(str(directory))
+    assert second.from_cache and second.digest == first.digest
+    assert second.levels == first.levels
+
+    levels = json.loads((directory / "levels.json").read_text(encoding="utf-8"))
+    levels["levels"][0]["starting_money"] += 1
+    (directory / "levels.json").write_text(json.dumps(levels), encoding="utf-8")
+    third = load_content(str(directory))
+    assert not third.from_cache
+    assert third.level(1)["starting_money"] == first.level(1)["starting_money"] + 1
+    assert len(list((directory / "__pycache__").glob("content.*.pickle"))) == 1
@@ -0,0 +1,54 @@
+import numpy as np
+
+from crowd import CrowdState, ENTERING, GONE, LEAVING_ANGRY, WAITING
+
+
+def test_spawn_grows_columns_past_capacity():
+    crowd = CrowdState(capacity=2)
+    crowd.spawn(np.arange(5) * 10.0, 40.0, 0)
+    assert crowd.count == 5
+    assert crowd.capacity >= 5
+    assert list(crowd.ids[:5]) == [0, 1, 2, 3, 4]
+    assert list(crowd.target_x[:5]) == [0, 10, 20, 30, 40]
+
+
+def test_compact_keeps_row_order_and_counts():
+    crowd = CrowdState()
+    crowd.spawn(np.array([100.0, 110.0, 120.0]), 40.0, 1)
+    crowd.spawn(np.array([200.0, 210.0]), 40.0, 2, ambient=True)
+    crowd.state[[1, 3]] = GONE
+
+    assert crowd.compact() == 2
+    assert crowd.count == 3
+    assert crowd.regular == 2
+    assert crowd.compactions == 1
+    assert list(crowd.ids[:3]) == [0, 2, 4]
+    assert list(crowd.target_x[:3]) == [100, 120, 210]
+    assert list(crowd.palette[:3]) == [1, 1, 2]
+    assert crowd.compact() == 0
+    assert crowd.compactions == 1
+
+
+def test_row_of_follows_customers_through_compaction():
+    crowd = CrowdState()
+    crowd.spawn(np.arange(6) * 1.0, 40.0, 0)
+    crowd.state[[0, 2]] = GONE
+    crowd.compact()
+    assert crowd.row_of(3, hint=3) == 1
+    assert crowd.row_of(5) == 3
+    assert crowd.row_of(2) == -1
+
+
+def test_step_moves_arrives_and_removes_leavers():
+    crowd = CrowdState()
+    crowd.spawn(np.array([-90.0, 500.0]), 60.0, 0)
+    crowd.spawn(0.0, 60.0, 0)
+    crowd.center_x[2] = -99.0
+    crowd.state[2] = LEAVING_ANGRY
+
+    removed = crowd.step(0.5, np.random.default_rng(0))
+    assert removed == 1
+    assert crowd.count == 2
+    assert list(crowd.state[:2]) == [WAITING, ENTERING]
+    assert crowd.center_x[0] == -90.0
+    assert crowd.center_x[1] == -70.0
@@ -0,0 +1,28 @@
+from assets import texture_registry
+from audio import sound_bank
+from headless import HeadlessGame
+
+
+def test_offline_switches_last_only_while_a_headless_game_is_open():
+    assert not texture_registry.offline and sound_bank.enabled
+    first = HeadlessGame(seed=1)
+    with HeadlessGame(seed=2):
+        assert texture_registry.offline and not sound_bank.enabled
+    assert texture_registry.offline and not sound_bank.enabled
+    first.close()
+    first.close()
+    assert not texture_registry.offline and sound_bank.enabled
+
+
+def test_offline_placeholders_are_not_cached_under_real_paths():
+    with HeadlessGame(seed=1):
+        placeholder = texture_registry.get("images/chef.png")
+    assert texture_registry.placeholder() is placeholder
+    assert "images/chef.png" not in texture_registry._entries
+
+
+def test_campaign_runs_to_the_end():
+    with HeadlessGame(seed=5) as game:
+        result = game.run_campaign()
+    assert result["finished"]
+    assert result["seed"] == 5
@@ -0,0 +1,49 @@
+from hit_test import HitGrid
+
+
+def test_hits_are_ordered_by_z_then_latest_registration():
+    grid = HitGrid()
+    grid.add("floor", "kitchen", 100, 100, 200, 200, lambda: None)
+    grid.add("table", "kitchen", 100, 100, 50, 50, lambda: None)
+    grid.add("button", "hud", 100, 100, 20, 20, lambda: None, z=100)
+    assert [r.key for r in grid.hits(100, 100)] == ["button", "table", "floor"]
+    assert [r.key for r in grid.hits(100, 100, ("kitchen",))] == ["table", "floor"]
+    assert grid.top(190, 190).key == "floor"
+    assert grid.top(500, 500) is None
+
+
+def test_dispatch_passes_through_callbacks_returning_false():
+    calls = []
+    grid = HitGrid()
+    grid.add("below", "customers", 50, 50, 40, 40, lambda: calls.append("below"))
+    grid.add("above", "customers", 50, 50, 40, 40, lambda: calls.append("above") or False)
+    assert grid.dispatch(50, 50).key == "below"
+    assert calls == ["above", "below"]
+
+
+def test_dispatch_stops_at_first_handled_click():
+    calls = []
+    grid = HitGrid()
+    grid.add("below", "customers", 50, 50, 40, 40, lambda: calls.append("below"))
+    grid.add("above", "customers", 50, 50, 40, 40, lambda: calls.append("above") or True)
+    assert grid.dispatch(50, 50).key == "above"
+    assert calls == ["above"]
+
+
+def test_move_and_remove_update_cells():
+    grid = HitGrid(cell_size=64)
+    grid.add("customer", "customers", 10, 10, 20, 20, lambda: None)
+    grid.move("customer", 300, 10)
+    assert grid.top(10, 10) is None
+    assert grid.top(300, 10).key == "customer"
+    grid.remove("customer")
+    assert grid.top(300, 10) is None
+    assert len(grid) == 0
+
+
+def test_clear_only_drops_one_layer():
+    grid = HitGrid()
+    grid.add("start", "menu", 0, 0, 10, 10, lambda: None)
+    grid.add("kitchen", "hud", 0, 0, 10, 10, lambda: None)
+    grid.clear("menu")
+    assert [r.key for r in grid.hits(0, 0)] == ["kitchen"]
@@ -0,0 +1,52 @@
+from hit_test import HitGrid
+from ui import UIManager
+
+
+class MenuGame:
+    def __init__(self, width=1280, height=720, save_available=False):
+        self.width = width
+        self.height = height
+        self.save_available = save_available
+        self.hit_grid = HitGrid()
+        self.clicked = []
+
+    def can_continue(self):
+        return self.save_available
+
+    def start_game(self):
+        self.clicked.append("start")
+
+    def close(self):
+        self.clicked.append("exit")
+
+    def continue_game(self):
+        self.clicked.append("continue")
+
+
+def test_continue_button_is_only_hit_while_a_save_exists():
+    game = MenuGame()
+    ui = UIManager(game)
+    ui.update_menu_hover(640, 360 + UIManager.BUTTON_SPACING)
+    assert not ui.continue_button.hovered
+    assert not ui.check_menu_click(640, 360 + UIManager.BUTTON_SPACING)
+
+    game.save_available = True
+    ui.update_menu_hover(640, 360 + UIManager.BUTTON_SPACING)
+    assert ui.continue_button.hovered
+    assert ui.check_menu_click(640, 360 + UIManager.BUTTON_SPACING)
+
+    game.save_available = False
+    ui.update_menu_hover(640, 360 + UIManager.BUTTON_SPACING)
+    assert not ui.continue_button.hovered
+    assert ui.hovered is None
+    assert game.clicked == ["continue"]
+
+
+def test_buttons_follow_the_window_size():
+    game = MenuGame()
+    ui = UIManager(game)
+    game.width, game.height = 1000, 600
+    assert ui.check_menu_click(500, 300)
+    assert not ui.check_menu_click(640, 360)
+    assert ui.check_menu_click(500, 300 - 80, game_over=True)
+    assert game.clicked == ["start", "start"]
@@ -0,0 +1,55 @@
+import pytest
+
+from order_system import OrderBoard
+
+
+def test_by_deadline_and_most_urgent_skip_closed_tickets():
+    board = OrderBoard()
+    board.add(1, "late", 30.0)
+    board.add(2, "soon", 10.0)
+    board.add(3, "middle", 20.0)
+    assert board.by_deadline() == ["soon", "middle", "late"]
+    assert board.most_urgent() == "soon"
+
+    assert board.pop(2) == "soon"
+    assert board.pop(2) is None
+    assert board.most_urgent() == "middle"
+    assert board.by_deadline() == ["middle", "late"]
+    assert len(board) == 2 and 3 in board and 2 not in board
+
+
+def test_by_deadline_is_rebuilt_only_when_the_board_changes():
+    board = OrderBoard()
+    board.add(1, "a", 5.0)
+    board.add(2, "b", 1.0)
+    view = board.by_deadline()
+    assert board.by_deadline() is view
+    board.pop(99)
+    assert board.by_deadline() is view
+
+    board.add(3, "c", 3.0)
+    assert board.by_deadline() == ["b", "c", "a"]
+    board.pop(2)
+    assert board.by_deadline() == ["c", "a"]
+    board.clear()
+    assert board.by_deadline() == []
+    assert board.most_urgent() is None
+
+
+def test_second_ticket_for_a_customer_is_rejected():
+    board = OrderBoard()
+    board.add(1, "first", 5.0)
+    with pytest.raises(ValueError, match="already has an order"):
+        board.add(1, "second", 1.0)
+    assert board.by_deadline() == ["first"]
+    assert board.most_urgent() == "first"
+
+
+def test_stale_deadlines_are_compacted():
+    board = OrderBoard()
+    for customer_id in range(200):
+        board.add(customer_id, customer_id, float(customer_id))
+        board.pop(customer_id)
+    board.add(500, "last", 1000.0)
+    assert len(board._deadlines) <= 2 * len(board) + 16
+    assert board.most_urgent() == "last"
@@ -0,0 +1,43 @@
+import random
+from collections import Counter
+
+from recipes import RecipeRegistry
+
+
+def test_burger_items_are_interned_by_layer_stack():
+    registry = RecipeRegistry()
+    item = registry.item("burger", ["base", "patty", "top"])
+    assert registry.item("burger", ("base", "patty", "top")) is item
+    assert item.key == ("burger", ("base", "patty", "top"))
+    assert item.layered
+    assert registry.item("burger", ("base", "top")) is not item
+
+
+def test_score_matches_the_tray_signature_regardless_of_order():
+    registry = RecipeRegistry()
+    burger = registry.item("burger", ("base", "cheese", "top"))
+    cola = registry.item("drink", "cola")
+    recipe = registry.recipe([burger, cola])
+    assert recipe.time_bonus == 15
+    tray = registry.tray({"drink": cola, "burger": burger})
+    assert recipe.score(tray) == (75, 0)
+
+
+def test_wrong_and_missing_items_are_penalised():
+    registry = RecipeRegistry()
+    burger = registry.item("burger", ("base", "patty", "top"))
+    fries = registry.item("fries", "fries")
+    recipe = registry.recipe([burger, fries])
+    wrong_burger = registry.item("burger", ("base", "cheese", "top"))
+    assert recipe.score(registry.tray({"burger": wrong_burger, "fries": fries})) == (30, 30)
+    assert recipe.score(Counter()) == (0, 50)
+
+
+def test_generate_is_deterministic_for_a_seeded_stream():
+    registry = RecipeRegistry()
+    rng_a, rng_b = random.Random(7), random.Random(7)
+    for _ in range(20):
+        assert registry.generate(5, rng_a).signature == registry.generate(5, rng_b).signature
+    for seed in range(50):
+        recipe = registry.generate(1, random.Random(seed))
+        assert all(item.category != "icecream" for item in recipe.items)
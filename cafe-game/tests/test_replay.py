@@ -0,0 +1,99 @@
+import random
+
+import arcade
+import pytest
+
+from balance_sim import Policy
+from customer import Customer
+from replay import CLICK, KEY, InputLog, InputRecorder, replay_headless, state_digest
+
+
+def record_session(game, ticks, at_tick=None, action=None):
+    # Скриптовый игрок, чей ввод идёт через handle_key/handle_click и пишется, как в окне.
+    recorder = InputRecorder(game)
+
+    def key(k):
+        recorder.key(k)
+        game.handle_key(k)
+
+    def click(x, y):
+        # Как on_mouse_press: координаты усекаются один раз до записи и до игры.
+        x, y = int(x), int(y)
+        recorder.click(x, y)
+        game.handle_click(x, y)
+
+    def kitchen_click(x, y):
+        if not game.show_cooking_frame:
+            key(arcade.key.K)
+        click(x, y)
+
+    def customer_click(x, y):
+        if game.show_cooking_frame:
+            key(arcade.key.K)
+        click(x, y)
+
+    game.food_manager.check_equipment_click = kitchen_click
+    game.customer_manager.check_customer_click = customer_click
+    policy = Policy("scripted", random.Random(1), error_rate=0.2)
+    for tick in range(ticks):
+        if tick == at_tick:
+            action(game)
+        policy(game)
+        game.simulate(game.delta_time)
+    return recorder.finish()
+
+
+def test_input_log_round_trip(tmp_path):
+    log = InputLog(seed=2 ** 62 + 5, width=1280, height=720, stress_crowd=300)
+    log.events = [(0, KEY, arcade.key.K, 0, 0, 0), (17, CLICK, 640, -3, 1, 4)]
+    log.end_tick, log.money, log.score, log.digest = 1200, -15, 4200, bytes(range(16))
+    decoded = InputLog.from_bytes(log.to_bytes())
+    assert vars(decoded) == vars(log)
+
+    path = str(tmp_path / "run.rec")
+    log.save(path)
+    assert vars(InputLog.load(path)) == vars(log)
+
+
+def test_input_log_rejects_bad_files():
+    data = InputLog(1, 1280, 720).to_bytes()
+    with pytest.raises(ValueError, match="truncated"):
+        InputLog.from_bytes(data[:-1])
+    with pytest.raises(ValueError, match="not an input recording"):
+        InputLog.from_bytes(b"X" * len(data))
+    with pytest.raises(ValueError, match="version 1 is not supported"):
+        InputLog.from_bytes(data[:8] + b"\x01\x00" + data[10:])
+
+
+def test_template_customers_do_not_consume_gameplay_randomness(make_game):
+    game = make_game(seed=3)
+    game.start_campaign()
+    before = game.rng.states()
+    Customer.template(game)
+    assert game.rng.states() == before
+
+
+@pytest.mark.parametrize("stress_crowd", [0, 200])
+def test_recorded_session_replays_exactly(make_game, stress_crowd):
+    game = make_game(stress_crowd=stress_crowd, seed=11)
+    game.start_campaign()
+    # Так окно запекает варианты клиентов при первой отрисовке толпы.
+    log = record_session(game, 3000, 500, Customer.template)
+    assert log.events
+
+    replayer, _ = replay_headless(InputLog.from_bytes(log.to_bytes()))
+    assert replayer.tick == log.end_tick
+    assert state_digest(replayer.game, replayer.tick) == log.digest
+    assert replayer.matches(), replayer.report()
+
+
+def test_replay_detects_randomness_consumed_only_while_recording(make_game):
+    # Лишнее обращение к игровому потоку, которого нет при воспроизведении, —
+    # деньги и счёт при этом могут и совпасть.
+    game = make_game(stress_crowd=200, seed=11)
+    game.start_campaign()
+    log = record_session(game, 1500, 300, lambda g: g.rng.customers.random())
+
+    replayer, _ = replay_headless(log)
+    assert not replayer.matches()
+    assert "DIVERGED" in replayer.report()
@@ -0,0 +1,95 @@
+import random
+import zlib
+
+import pytest
+
+from balance_sim import Policy
+from headless import HeadlessGame
+from save import HEADER, SAVE_MAGIC, SAVE_VERSION, AutoSaver, Snapshot, load_snapshot, write_atomic
+
+
+@pytest.fixture(scope="module")
+def busy_game():
+    # Разгар уровня: заказ с клиентом у стойки, поднос и картошка во фритюре.
+    game = HeadlessGame(seed=1)
+    game.start_campaign()
+    policy = Policy("scripted", random.Random(1))
+    for _ in range(int(40 / game.delta_time)):
+        policy(game)
+        game.simulate(game.delta_time)
+    yield game
+    game.close()
+
+
+def test_restore_round_trip_is_byte_identical(make_game, busy_game):
+    data = Snapshot.capture(busy_game).to_bytes()
+    snap = Snapshot.from_bytes(data)
+    assert snap.orders
+
+    restored = make_game(seed=2)
+    snap.restore(restored)
+    assert Snapshot.capture(restored).to_bytes() == data
+    assert restored.money == busy_game.money
+    assert restored.current_level == busy_game.current_level
+    assert len(restored.order_system.board) == len(busy_game.order_system.board)
+
+
+def test_restored_game_keeps_playing(make_game, busy_game):
+    restored = make_game(seed=2)
+    Snapshot.from_bytes(Snapshot.capture(busy_game).to_bytes()).restore(restored)
+    restored.step(600)
+    assert restored.game_state in ("PLAYING", "LEVEL_COMPLETE", "GAME_OVER")
+
+
+def test_corrupt_saves_raise_value_error(busy_game):
+    data = Snapshot.capture(busy_game).to_bytes()
+    flipped = bytearray(data)
+    flipped[-1] ^= 0xFF
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        Snapshot.from_bytes(bytes(flipped))
+    with pytest.raises(ValueError, match="truncated"):
+        Snapshot.from_bytes(data[:HEADER.size - 1])
+    with pytest.raises(ValueError, match="not a save file"):
+        Snapshot.from_bytes(b"NOTASAVE" + data[8:])
+
+    body = data[HEADER.size:]
+    future = HEADER.pack(SAVE_MAGIC, SAVE_VERSION + 1, zlib.crc32(body)) + body
+    with pytest.raises(ValueError, match="not supported"):
+        Snapshot.from_bytes(future)
+
+    short = data[HEADER.size:-5]
+    with pytest.raises(ValueError, match="corrupt save"):
+        Snapshot.from_bytes(HEADER.pack(SAVE_MAGIC, SAVE_VERSION, zlib.crc32(short)) + short)
+
+    padded = body + b"\0"
+    with pytest.raises(ValueError, match="trailing bytes"):
+        Snapshot.from_bytes(HEADER.pack(SAVE_MAGIC, SAVE_VERSION, zlib.crc32(padded)) + padded)
+
+
+def test_load_snapshot_reads_atomic_writes(tmp_path, busy_game):
+    path = str(tmp_path / "save.bin")
+    assert load_snapshot(path) is None
+    data = Snapshot.capture(busy_game).to_bytes()
+    write_atomic(path, data)
+    assert load_snapshot(path).to_bytes() == data
+    assert [p.name for p in tmp_path.iterdir()] == ["save.bin"]
+
+
+def test_autosaver_writes_latest_snapshot_and_discards(tmp_path, busy_game):
+    path = str(tmp_path / "save.bin")
+    saver = AutoSaver(path)
+    saver.save(busy_game)
+    saver.flush()
+    assert load_snapshot(path).to_bytes() == Snapshot.capture(busy_game).to_bytes()
+
+    saver.discard()
+    saver.flush()
+    assert not saver.exists()
+
+    saver.save(busy_game)
+    saver.close()
+    assert saver.exists()
+    saver.close()
+    saver.discard()
+    assert saver.exists()
+    assert saver.errors == 0
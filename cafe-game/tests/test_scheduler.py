@@ -0,0 +1,67 @@
+from scheduler import Scheduler
+
+
+def test_timers_fire_in_deadline_order():
+    scheduler = Scheduler()
+    fired = []
+    for name, delay in (("c", 3.0), ("a", 1.0), ("b", 2.0), ("a2", 1.0)):
+        scheduler.call_later(delay, lambda name=name: fired.append(name), name)
+    assert scheduler.advance(1.5) == 2
+    assert fired == ["a", "a2"]
+    scheduler.advance(5.0)
+    assert fired == ["a", "a2", "b", "c"]
+    assert len(scheduler) == 0
+
+
+def test_cancelled_timers_never_fire():
+    scheduler = Scheduler()
+    fired = []
+    timers = [scheduler.call_later(1.0 + i, lambda i=i: fired.append(i)) for i in range(100)]
+    for timer in timers[::2]:
+        scheduler.cancel(timer)
+    scheduler.cancel(timers[0])
+    assert len(scheduler) == 50
+    scheduler.advance(200.0)
+    assert fired == list(range(1, 100, 2))
+    assert scheduler.remaining(timers[1]) == 0.0
+
+
+def test_pause_freezes_time():
+    scheduler = Scheduler()
+    fired = []
+    timer = scheduler.call_later(1.0, lambda: fired.append(1))
+    scheduler.pause()
+    assert scheduler.advance(5.0) == 0
+    assert scheduler.remaining(timer) == 1.0
+    scheduler.resume()
+    scheduler.advance(1.0)
+    assert fired == [1]
+
+
+def test_suspended_group_keeps_its_remaining_time():
+    scheduler = Scheduler()
+    fired = []
+    gameplay = scheduler.call_later(2.0, lambda: fired.append("order"), group="gameplay")
+    scheduler.call_later(1.5, lambda: fired.append("banner"), group="ui")
+    scheduler.advance(0.5)
+    scheduler.suspend("gameplay")
+    late = scheduler.call_later(1.0, lambda: fired.append("late"), group="gameplay")
+    scheduler.advance(3.0)
+    assert fired == ["banner"]
+    assert scheduler.remaining(gameplay) == 1.5
+    scheduler.cancel(late)
+    scheduler.unsuspend("gameplay")
+    scheduler.advance(1.0)
+    assert fired == ["banner"]
+    scheduler.advance(0.5)
+    assert fired == ["banner", "order"]
+
+
+def test_clear_drops_pending_timers():
+    scheduler = Scheduler()
+    timer = scheduler.call_later(1.0, lambda: None)
+    scheduler.suspend("gameplay")
+    scheduler.clear()
+    scheduler.cancel(timer)
+    assert len(scheduler) == 0
+    assert scheduler.advance(2.0) == 0
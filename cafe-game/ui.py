@@ -1,4 +1,10 @@
+import time
+from collections import deque
+
 import arcade
+from labels import draw_text, draw_dynamic_text
+from render_cache import render_to_texture, redraw_texture
+from simulation import SimulationRules
 from utils import load_texture
 
 
@@ -20,30 +26,104 @@ class Button:
         arcade.draw_rect_filled(rect, color)
         arcade.draw_rect_outline(rect, arcade.color.BLACK)
         if self.text:
-            arcade.draw_text(
+            draw_text(
                 self.text,
                 self.x, self.y,
                 self.text_color, 24, anchor_x="center", anchor_y="center"
             )
 
-    def check_click(self, x, y):
-        if (self.x - self.width / 2 < x < self.x + self.width / 2 and
-                self.y - self.height / 2 < y < self.y + self.height / 2):
-            self.callback()
-            return True
-        return False
 
-    def check_hover(self, x, y):
-        self.hovered = (self.x - self.width / 2 < x < self.x + self.width / 2 and
-                        self.y - self.height / 2 < y < self.y + self.height / 2)
-        return self.hovered
+# HUD рисуется в маленькие текстуры: панель со счётом пересобирается только
+# при изменении денег, счёта или оставшихся секунд, кнопка КУХНЯ — один раз.
+class RetainedHud:
+    PANEL = (150, 680, 280, 80)
+    KITCHEN_BUTTON = SimulationRules.HUD_KITCHEN_BUTTON
+    PADDING = 4
+
+    def __init__(self, game):
+        self.game = game
+        self._panel_texture = None
+        self._button_texture = None
+        self._inputs = None
+        self.rebuilds = 0
+        self._rebuild_times = deque()
+
+    def current_inputs(self):
+        return (self.game.money, self.game.score, self.game.level_manager.get_time_remaining())
+
+    def _projection(self, area):
+        x, y, w, h = area
+        p = self.PADDING
+        return (x - w / 2 - p, x + w / 2 + p, y - h / 2 - p, y + h / 2 + p)
+
+    def _rect(self, area):
+        x, y, w, h = area
+        return arcade.types.XYWH(x, y, w + self.PADDING * 2, h + self.PADDING * 2)
+
+    def draw(self):
+        inputs = self.current_inputs()
+        if self._panel_texture is None or inputs != self._inputs:
+            self._inputs = inputs
+            self._rebuild_panel()
+        if self._button_texture is None:
+            _, _, w, h = self.KITCHEN_BUTTON
+            self._button_texture = render_to_texture(
+                "hud:kitchen_button", w + self.PADDING * 2, h + self.PADDING * 2,
+                self._draw_kitchen_button, projection=self._projection(self.KITCHEN_BUTTON)
+            )
+
+        arcade.draw_texture_rect(self._panel_texture, self._rect(self.PANEL))
+        arcade.draw_texture_rect(self._button_texture, self._rect(self.KITCHEN_BUTTON))
+
+    def _rebuild_panel(self):
+        projection = self._projection(self.PANEL)
+        if self._panel_texture is None:
+            _, _, w, h = self.PANEL
+            self._panel_texture = render_to_texture(
+                "hud:panel", w + self.PADDING * 2, h + self.PADDING * 2,
+                self._draw_panel, projection=projection
+            )
+        else:
+            redraw_texture(self._panel_texture, self._draw_panel, projection=projection)
+        self.rebuilds += 1
+        self._rebuild_times.append(time.perf_counter())
+
+    def rebuilds_per_second(self):
+        cutoff = time.perf_counter() - 1.0
+        while self._rebuild_times and self._rebuild_times[0] < cutoff:
+            self._rebuild_times.popleft()
+        return len(self._rebuild_times)
+
+    def _draw_panel(self):
+        money, score, time_left = self._inputs
+        panel_rect = arcade.types.XYWH(*self.PANEL)
+        arcade.draw_rect_filled(panel_rect, arcade.color.DARK_GRAY)
+        arcade.draw_rect_outline(panel_rect, arcade.color.BLACK)
+
+        draw_dynamic_text("hud.money", f"ДЕНЬГИ: ${money}", 150, 700, arcade.color.GOLD, 20, anchor_x="center")
+        draw_dynamic_text("hud.score", f"СЧЁТ: {score}", 150, 680, arcade.color.WHITE, 20, anchor_x="center")
+        draw_dynamic_text("hud.time", f"ВРЕМЯ: {time_left}с", 150, 660, arcade.color.RED, 20, anchor_x="center")
+
+    def _draw_kitchen_button(self):
+        kitchen_bg = arcade.types.XYWH(*self.KITCHEN_BUTTON)
+        arcade.draw_rect_filled(kitchen_bg, arcade.color.DARK_GREEN)
+        arcade.draw_rect_outline(kitchen_bg, arcade.color.BLACK, 2)
+        draw_text(
+            "КУХНЯ",
+            1150, 680,
+            arcade.color.WHITE, 16, anchor_x="center", anchor_y="center", bold=True
+        )
 
 
 class UIManager:
     def __init__(self, game):
         self.game = game
         self.buttons = []
+        self.hud = RetainedHud(game)
+        self.hovered = None
+        self._regions_for = None
         self.setup_menu_buttons()
+        self.register_hit_regions()
 
     BUTTON_SPACING = 140
 
@@ -64,10 +144,20 @@ class UIManager:
             "ВЫХОД"
         )
         self.buttons = [start_btn, exit_btn]
+        # Над «Начать игру»; показывается, только когда есть сохранение.
+        self.continue_button = Button(
+            center_x, center_y + self.BUTTON_SPACING,
+            200, 60, arcade.color.DARK_BLUE,
+            self.game.continue_game,
+            "ПРОДОЛЖИТЬ"
+        )
 
     def _apply_menu_button_positions(self, game_over=False):
         cx = self.game.width // 2
         cy = self.game.height // 2
+        for button in self.buttons + [self.continue_button]:
+            button.x = cx
+        self.continue_button.y = cy + self.BUTTON_SPACING
         if game_over:
             self.buttons[0].y = cy - 80
             self.buttons[1].y = cy - 80 - self.BUTTON_SPACING
@@ -79,57 +169,70 @@ class UIManager:
         self._apply_menu_button_positions(game_over)
         for button in self.buttons:
             button.draw()
+        if not game_over and self.game.can_continue():
+            self.continue_button.draw()
 
         if game_over:
-            arcade.draw_text(
+            draw_text(
                 "ИГРА ЗАВЕРШЕНА",
                 self.game.width // 2, self.game.height // 2 + 150,
                 arcade.color.GOLD, 48, anchor_x="center"
             )
-            arcade.draw_text(
-                f"СЧЁТ: {self.game.score}",
+            draw_dynamic_text(
+                "menu.score", f"СЧЁТ: {self.game.score}",
                 self.game.width // 2, self.game.height // 2 + 80,
                 arcade.color.WHITE, 36, anchor_x="center"
             )
-            arcade.draw_text(
-                f"ДЕНЬГИ: ${self.game.money}",
+            draw_dynamic_text(
+                "menu.money", f"ДЕНЬГИ: ${self.game.money}",
                 self.game.width // 2, self.game.height // 2 + 30,
                 arcade.color.GREEN, 36, anchor_x="center"
             )
 
+    def _region_inputs(self):
+        return (self.game.width, self.game.height, self.game.can_continue())
+
+    def register_hit_regions(self):
+        # Кнопки меню и экрана Game Over стоят по-разному — у каждого экрана свой слой.
+        grid = self.game.hit_grid
+        grid.clear("menu")
+        grid.clear("game_over")
+        for layer, game_over in (("menu", False), ("game_over", True)):
+            self._apply_menu_button_positions(game_over)
+            for button in self.buttons:
+                grid.add((layer, button), layer, button.x, button.y, button.width, button.height, button.callback)
+        self._apply_menu_button_positions()
+        self._regions_for = self._region_inputs()
+        if self._regions_for[2]:
+            button = self.continue_button
+            grid.add(("menu", button), "menu", button.x, button.y, button.width, button.height, button.callback)
+
+    def refresh_hit_regions(self):
+        # Окно сменило размер или появилось/пропало сохранение — кнопки встают заново.
+        if self._region_inputs() == self._regions_for:
+            return
+        if self.hovered is not None:
+            self.hovered.hovered = False
+            self.hovered = None
+        self.register_hit_regions()
+
     def update_menu_hover(self, x, y, game_over=False):
-        self._apply_menu_button_positions(game_over)
-        for button in self.buttons:
-            button.check_hover(x, y)
+        self.refresh_hit_regions()
+        region = self.game.hit_grid.top(x, y, ("game_over",) if game_over else ("menu",))
+        button = region.key[1] if region is not None else None
+        if button is not self.hovered:
+            if self.hovered is not None:
+                self.hovered.hovered = False
+            if button is not None:
+                button.hovered = True
+            self.hovered = button
 
     def check_menu_click(self, x, y, game_over=False):
-        self._apply_menu_button_positions(game_over)
-        for button in self.buttons:
-            if button.check_click(x, y):
-                return True
-        return False
+        self.refresh_hit_regions()
+        return self.game.hit_grid.dispatch(x, y, ("game_over",) if game_over else ("menu",)) is not None
 
     def draw_hud(self):
-        panel_rect = arcade.types.XYWH(150, 680, 280, 80)
-        arcade.draw_rect_filled(panel_rect, arcade.color.DARK_GRAY)
-        arcade.draw_rect_outline(panel_rect, arcade.color.BLACK)
-
-        arcade.draw_text(f"ДЕНЬГИ: ${self.game.money}", 150, 700, arcade.color.GOLD, 20, anchor_x="center")
-        arcade.draw_text(f"СЧЁТ: {self.game.score}", 150, 680, arcade.color.WHITE, 20, anchor_x="center")
-        time_left = self.game.level_manager.get_time_remaining()
-        arcade.draw_text(f"ВРЕМЯ: {time_left}с", 150, 660, arcade.color.RED, 20, anchor_x="center")
-
-        kitchen_bg = arcade.types.XYWH(1150, 680, 100, 50)
-        arcade.draw_rect_filled(kitchen_bg, arcade.color.DARK_GREEN)
-        arcade.draw_rect_outline(kitchen_bg, arcade.color.BLACK, 2)
-        arcade.draw_text(
-            "КУХНЯ",
-            1150, 680,
-            arcade.color.WHITE, 16, anchor_x="center", anchor_y="center", bold=True
-        )
+        self.hud.draw()
 
     def check_hud_click(self, x, y):
-        if (1100 <= x <= 1200) and (655 <= y <= 705):
-            self.game.show_cooking_frame = not self.game.show_cooking_frame
-            return True
-        return False
\ No newline at end of file
+        return self.game.hit_grid.dispatch(x, y, ("hud",)) is not None
\ No newline at end of file
@@ -1,14 +1,12 @@
-import arcade
-import os
+from assets import texture_registry
+from content import content
 
 def load_texture(path):
-    if os.path.exists(path):
-        return arcade.load_texture(path)
+    return texture_registry.get(path)
 
-    try:
-        return arcade.make_soft_square_texture(64, arcade.color.MAGENTA, 255, 255)
-    except Exception:
-        return arcade.load_texture(":resources:images/tiles/boxCrate_double.png")
+
+def texture_exists(path):
+    return texture_registry.exists(path)
 
 
 def get_texture_display_size(texture, target_width, target_height=None, fit_inside=True):
@@ -32,10 +30,4 @@ def format_time(seconds):
     return f"{minutes:02d}:{secs:02d}"
 
 def get_equipment_position(equipment_name):
-    positions = {
-        "grill": (450, 320),
-        "fryer": (550, 320),
-        "ice_cream_machine": (650, 320),
-        "soda_tap": (750, 320)
-    }
-    return positions.get(equipment_name, (0, 0))
\ No newline at end of file
+    return content.equipment_positions.get(equipment_name, (0, 0))
\ No newline at end of file